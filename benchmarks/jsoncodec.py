@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark del codec JSON (orjson frente a la librería estándar)
+
+Decodifica un listado sintético de slices y lo vuelve a emitir como lo
+hacen `--format json` y `--format ndjson`, con json y con
+pucp_cli.utils.jsoncodec, y comprueba que los bytes de salida coinciden:
+
+    python benchmarks/jsoncodec.py --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pucp_cli.utils import jsoncodec  # noqa: E402
+
+STATUSES = ['active', 'error', 'stopped', 'draft', 'deploying']
+
+
+def make_body(n: int) -> bytes:
+    """Cuerpo de GET /slices con nodos y redes"""
+    slices = [
+        {
+            'id': f'00000000-0000-4000-8000-{i:012d}',
+            'name': f'lab-{i}',
+            'description': f'Laboratorio {i} — redes',
+            'status': STATUSES[i % len(STATUSES)],
+            'infrastructure': 'linux' if i % 2 else 'openstack',
+            'nodes': [{'name': f'vm{j}', 'image': 'ubuntu-22.04', 'flavor': 'small',
+                       'cpu_usage': (i * j % 1000) / 7.0} for j in range(i % 4 + 1)],
+            'networks': [{'name': 'net0', 'cidr': '10.0.0.0/24', 'vlan_id': 100 + i % 3000,
+                          'internet_access': bool(i % 2)}],
+            'created_at': '2025-09-01T10:00:00Z',
+        }
+        for i in range(n)
+    ]
+    return json.dumps({'slices': slices}).encode('utf-8')
+
+
+def stdlib_roundtrip(body: bytes):
+    records = json.loads(body)['slices']
+    pretty = json.dumps(records, indent=2, ensure_ascii=False)
+    lines = '\n'.join(json.dumps(r, separators=(',', ':'), ensure_ascii=False) for r in records)
+    return pretty, lines
+
+
+def codec_roundtrip(body: bytes):
+    records = jsoncodec.loads(body)['slices']
+    pretty = jsoncodec.dumps(records, indent=True)
+    lines = '\n'.join(jsoncodec.dumps(r) for r in records)
+    return pretty, lines
+
+
+def best_of(fn, body: bytes, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for n in args.sizes:
+        body = make_body(n)
+        stdlib, expected = best_of(stdlib_roundtrip, body, args.repeat)
+        codec, actual = best_of(codec_roundtrip, body, args.repeat)
+        results[n] = {'stdlib_ms': round(stdlib * 1000, 2), 'codec_ms': round(codec * 1000, 2),
+                      'speedup': round(stdlib / codec, 2), 'identical': actual == expected}
+
+    if args.json:
+        print(json.dumps({'backend': jsoncodec.BACKEND, 'results': results}, indent=2))
+        return
+
+    print(f"backend: {jsoncodec.BACKEND}")
+    print(f"{'slices':>8} {'json ms':>10} {'codec ms':>10} {'speedup':>8} {'identical':>10}")
+    for n, row in results.items():
+        print(f"{n:>8} {row['stdlib_ms']:>10.2f} {row['codec_ms']:>10.2f} "
+              f"{row['speedup']:>7.2f}x {str(row['identical']):>10}")
+
+
+if __name__ == '__main__':
+    main()
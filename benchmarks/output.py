@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de formatos de salida de `slice list`
+
+Compara la tabla de rich con los formatos de máquina (json, ndjson, csv,
+tsv) sobre listas sintéticas de slices, escribiendo a un sumidero en
+memoria para medir solo el coste de formateo:
+
+    python benchmarks/output.py --sizes 100 1000 10000
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console  # noqa: E402
+
+from pucp_cli.commands import slice as slice_cmd  # noqa: E402
+from pucp_cli.ui.output import write_records  # noqa: E402
+
+STATUSES = ['active', 'error', 'stopped', 'draft', 'deploying']
+
+
+def make_slices(n: int) -> list:
+    """Slices sintéticos con la forma de GET /slices"""
+    return [
+        {
+            'id': f'00000000-0000-4000-8000-{i:012d}',
+            'name': f'lab-{i}',
+            'status': STATUSES[i % len(STATUSES)],
+            'infrastructure': 'linux' if i % 2 else 'openstack',
+            'node_count': i % 7,
+            'network_count': i % 3,
+            'created_at': '2025-09-01T10:00:00Z',
+        }
+        for i in range(n)
+    ]
+
+
+def time_table(slices) -> float:
+    slice_cmd.console = Console(file=io.StringIO(), width=120, force_terminal=True)
+    start = time.perf_counter()
+    slice_cmd._print_slices_table(slices)
+    return time.perf_counter() - start
+
+
+def time_format(slices, fmt: str) -> float:
+    start = time.perf_counter()
+    write_records(iter(slices), fmt, slice_cmd.SLICE_FIELDS, stream=io.StringIO())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for n in args.sizes:
+        slices = make_slices(n)
+        row = {'table': time_table(slices)}
+        for fmt in ('json', 'ndjson', 'csv', 'tsv'):
+            row[fmt] = time_format(slices, fmt)
+        results[n] = {k: round(v * 1000, 2) for k, v in row.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    formats = ['table', 'json', 'ndjson', 'csv', 'tsv']
+    print(f"{'rows':>8} " + " ".join(f"{f + ' ms':>11}" for f in formats))
+    for n, row in results.items():
+        print(f"{n:>8} " + " ".join(f"{row[f]:>11.2f}" for f in formats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark de comandos contra un orquestador stub local
+
+Levanta benchmarks/stub_server.py con inventarios de distinto tamaño y mide
+los comandos principales de extremo a extremo (subproceso `pucp ...`) y por
+fase (import, http, parse, render). Guarda los resultados en JSON para
+comparar entre versiones:
+
+    python benchmarks/run.py --sizes 10 1000 10000 --output bench-1.0.0.json
+    python benchmarks/run.py --compare bench-1.0.0.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+# Invocaciones medidas de extremo a extremo
+E2E_COMMANDS = [
+    ('slice', 'list'),
+    ('--format', 'ndjson', 'slice', 'list'),
+    ('slice', 'show', 'lab-00001'),
+    ('resource', 'servers'),
+    ('--format', 'csv', 'resource', 'servers'),
+    ('status', '--samples', '1'),
+]
+
+SERVICES = ('auth_service', 'slice_service', 'template_service',
+            'network_service', 'image_service')
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+# === FASES (se ejecutan en un subproceso limpio) ===
+
+def _fetch_slices(client, page_size: int = 500):
+    """GET /slices página a página (sin parsear); devuelve (páginas, segundos)"""
+    pages, page = [], 1
+    start = time.perf_counter()
+    while True:
+        response = client._send('GET', client.config.slice_service, '/slices',
+                                params={'page': page, 'page_size': page_size})
+        pages.append(response.content)
+        if page * page_size >= int(response.headers.get('X-Total-Count', 0)):
+            break
+        page += 1
+    return pages, time.perf_counter() - start
+
+
+def _phase_worker(args):
+    """Mide import, http, parse y render de cada caso y escribe JSON en stdout"""
+    os.environ.setdefault('COLUMNS', '120')
+    sys.path.insert(0, REPO_ROOT)
+
+    start = time.perf_counter()
+    from pucp_cli.main import cli
+    from pucp_cli.commands import resource as resource_cmd  # noqa: F401
+    from pucp_cli.commands import slice as slice_cmd  # noqa: F401
+    from pucp_cli.api_client import PUCPAPIClient
+    from pucp_cli.config import Config
+    import_time = time.perf_counter() - start
+
+    client = PUCPAPIClient(Config(), use_agent=False)
+    results = {}
+
+    def run_cli(argv):
+        sink = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            try:
+                cli.main(list(argv), prog_name='pucp', standalone_mode=False)
+            except SystemExit:
+                pass
+        return time.perf_counter() - start
+
+    # slice list: HTTP paginado, parseo de cada página y tabla
+    pages, http = _fetch_slices(client)
+    start = time.perf_counter()
+    slices = []
+    for page in pages:
+        data = json.loads(page)
+        slices.extend(data['items'] if isinstance(data, dict) else data)
+    parse = time.perf_counter() - start
+    original = PUCPAPIClient.iter_slices
+    PUCPAPIClient.iter_slices = lambda self, *a, **k: iter(slices)
+    try:
+        render = run_cli(['slice', 'list'])
+    finally:
+        PUCPAPIClient.iter_slices = original
+    results['slice list'] = {'items': len(slices), 'bytes': sum(map(len, pages)),
+                             'http_ms': _ms(http), 'parse_ms': _ms(parse),
+                             'render_ms': _ms(render)}
+
+    # resource servers: un único GET /resources
+    start = time.perf_counter()
+    raw = client._send('GET', client.config.slice_service, '/resources').content
+    http = time.perf_counter() - start
+    start = time.perf_counter()
+    data = json.loads(raw)
+    parse = time.perf_counter() - start
+    original = PUCPAPIClient.resource_servers
+    PUCPAPIClient.resource_servers = lambda self, *a, **k: data
+    try:
+        render = run_cli(['resource', 'servers'])
+    finally:
+        PUCPAPIClient.resource_servers = original
+    results['resource servers'] = {'items': len(data.get('servers', [])), 'bytes': len(raw),
+                                   'http_ms': _ms(http), 'parse_ms': _ms(parse),
+                                   'render_ms': _ms(render)}
+
+    json.dump({'import_ms': _ms(import_time), 'commands': results}, sys.stdout)
+
+
+# === ORQUESTACIÓN ===
+
+def start_stub(slices: int, servers: int, nodes: int, latency: float):
+    """Lanza el stub en un subproceso y devuelve (proceso, url)"""
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, 'stub_server.py'), '--port', '0',
+         '--slices', str(slices), '--servers', str(servers), '--nodes', str(nodes),
+         '--latency', str(latency)],
+        stdout=subprocess.PIPE, text=True)
+    url = proc.stdout.readline().strip()
+    if not url:
+        proc.kill()
+        raise RuntimeError("stub server did not start")
+    return proc, url
+
+
+def make_env(url: str) -> dict:
+    """HOME temporal con config.json apuntando al stub"""
+    home = tempfile.mkdtemp(prefix='pucp-bench-')
+    config_dir = os.path.join(home, '.pucp-cli')
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, 'config.json'), 'w') as f:
+        json.dump({service: url for service in SERVICES}, f)
+    with open(os.path.join(config_dir, 'token'), 'w') as f:
+        f.write('stub.token.value')
+    return dict(os.environ, HOME=home, PYTHONPATH=REPO_ROOT, PUCP_AGENT='0',
+                COLUMNS='120', PUCP_FORMAT='')
+
+
+def time_command(args, env, runs: int) -> dict:
+    """Mediana y mínimo del tiempo de pared de `pucp <args>`"""
+    cmd = [sys.executable, '-m', 'pucp_cli.main'] + list(args)
+    subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # Calentar
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        samples.append(time.perf_counter() - start)
+    return {'median_ms': _ms(statistics.median(samples)), 'min_ms': _ms(min(samples)),
+            'exit_code': result.returncode}
+
+
+def run_size(size: int, args) -> dict:
+    """Todas las mediciones para un tamaño de inventario"""
+    servers = max(1, size // args.slices_per_server)
+    proc, url = start_stub(size, servers, args.nodes, args.latency)
+    try:
+        env = make_env(url)
+        report = {'slices': size, 'servers': servers, 'nodes_per_slice': args.nodes,
+                  'e2e': {}}
+        for cmd in E2E_COMMANDS:
+            report['e2e'][' '.join(cmd)] = time_command(cmd, env, args.runs)
+
+        phases = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--phase-worker'],
+            env=env, capture_output=True, text=True)
+        if phases.returncode != 0:
+            raise RuntimeError(f"phase worker failed:\n{phases.stderr}")
+        report['phases'] = json.loads(phases.stdout)
+        return report
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def print_report(report: dict, baseline: dict = None):
+    """Resumen legible; con baseline añade la variación relativa"""
+    def delta(size, section, name, key):
+        if not baseline:
+            return ''
+        try:
+            old = baseline['sizes'][size][section][name][key]
+        except (KeyError, TypeError):
+            return ''
+        new = report['sizes'][size][section][name][key]
+        return f"  ({(new - old) / old * 100:+.0f}%)" if old else ''
+
+    for size, data in report['sizes'].items():
+        print(f"\n== {data['slices']} slices / {data['servers']} servers ==")
+        for name, timing in data['e2e'].items():
+            flag = '' if timing['exit_code'] == 0 else f"  [exit {timing['exit_code']}]"
+            print(f"  pucp {name:<32} {timing['median_ms']:>9.1f} ms"
+                  f"{delta(size, 'e2e', name, 'median_ms')}{flag}")
+        phases = data['phases']
+        print(f"  {'import':<37} {phases['import_ms']:>9.1f} ms")
+        for name, timing in phases['commands'].items():
+            parts = '  '.join(f"{key[:-3]} {timing[key]:.1f}"
+                              for key in ('http_ms', 'parse_ms', 'render_ms'))
+            print(f"  {name:<37} {parts}  ({timing['bytes'] / 1024:.0f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000],
+                        help='Número de slices por escenario')
+    parser.add_argument('--slices-per-server', type=int, default=10,
+                        help='Proporción slices/servidores del inventario')
+    parser.add_argument('--nodes', type=int, default=3, help='Nodos por slice')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Latencia artificial del stub por request (s)')
+    parser.add_argument('--runs', type=int, default=5, help='Repeticiones por comando')
+    parser.add_argument('--output', help='Archivo JSON de resultados')
+    parser.add_argument('--compare', help='Resultados previos con los que comparar')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    parser.add_argument('--phase-worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase_worker:
+        _phase_worker(args)
+        return
+
+    sys.path.insert(0, REPO_ROOT)
+    from pucp_cli import __version__
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'runs': args.runs,
+        'sizes': {str(size): run_size(size, args) for size in args.sizes},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, baseline)
+        if args.output:
+            print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque del CLI
+
+Comprueba que los comandos ligeros no importen módulos pesados (rich,
+requests, ...) que no necesitan y que `pucp --version` se mantenga dentro
+de un presupuesto de tiempo. También mide el completado de shell con
+índices grandes (10k slices, 5k hosts): debe responder sin importar click
+y dentro de --completion-budget-ms. Sale con código 1 si algún chequeo
+falla, para usarlo en CI:
+
+    python benchmarks/startup.py --budget-ms 100 --completion-budget-ms 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ('rich', 'requests', 'urllib3', 'pydantic', 'yaml')
+
+# Invocación → módulos pesados que no debe cargar
+LIGHT_COMMANDS = {
+    ('--version',): HEAVY_MODULES,
+    ('auth', 'logout'): ('requests', 'urllib3', 'pydantic', 'yaml'),
+}
+
+# Invocaciones sujetas al presupuesto de tiempo
+BUDGETED_COMMANDS = {('--version',)}
+
+# Peticiones de completado (COMP_WORDS, COMP_CWORD) que no deben pasar por click
+COMPLETION_CASES = {
+    'slice show <TAB>': ('pucp slice show lab-1', 3),
+    '--infrastructure <TAB>': ('pucp resource servers --infrastructure ', 4),
+    '--host <TAB>': ('pucp resource history --host server-01', 4),
+}
+
+_PROBE = """
+import json, sys
+from pucp_cli.main import cli
+try:
+    cli(sys.argv[1:], prog_name='pucp', standalone_mode=False)
+except BaseException:
+    pass
+heavy = json.loads({heavy!r})
+print(json.dumps(sorted(m for m in heavy if m in sys.modules)), file=sys.stderr)
+"""
+
+
+def _run(args, env):
+    return subprocess.run([sys.executable] + args, env=env, capture_output=True, text=True)
+
+
+def import_time_us(env) -> int:
+    """Tiempo acumulado de `import pucp_cli.main` según -X importtime"""
+    result = _run(['-X', 'importtime', '-c', 'import pucp_cli.main'], env)
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'pucp_cli.main':
+            return int(parts[1])
+    raise RuntimeError(f"pucp_cli.main not found in importtime output:\n{result.stderr}")
+
+
+def loaded_heavy_modules(args, env) -> list:
+    """Módulos pesados cargados al ejecutar `pucp <args>`"""
+    code = _PROBE.format(heavy=json.dumps(HEAVY_MODULES))
+    result = _run(['-c', code] + args, env)
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def wall_time_ms(args, env, runs: int, module: str = 'pucp_cli.main') -> float:
+    """Mediana del tiempo de pared de `pucp <args>` menos el arranque del intérprete"""
+    def median_of(cmd):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            _run(cmd, env)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    baseline = median_of(['-c', 'pass'])
+    return median_of(['-m', module] + args) - baseline
+
+
+def seed_indexes(home: str, slices: int = 10000, hosts: int = 5000):
+    """Índices de completado grandes en el HOME temporal"""
+    config_dir = os.path.join(home, '.pucp-cli')
+    os.makedirs(config_dir, exist_ok=True)
+    names = {f'lab-{i}': f'00000000-0000-4000-8000-{i:012d}' for i in range(slices)}
+    with open(os.path.join(config_dir, 'slice_index.json'), 'w') as f:
+        json.dump({'names': names, 'validators': {}}, f)
+    with open(os.path.join(config_dir, 'hosts_index'), 'w') as f:
+        for i in range(hosts):
+            f.write(f"server-{i:05d}\t{'linux' if i % 2 else 'openstack'}\tzone-{i % 8}\n")
+
+
+def completion_env(env, words: str, cword: int):
+    return dict(env, _PUCP_COMPLETE='bash_complete', COMP_WORDS=words, COMP_CWORD=str(cword))
+
+
+def completion_imports_click(env) -> bool:
+    """El camino rápido no debe importar click"""
+    result = _run(['-X', 'importtime', '-m', 'pucp_cli'], env)
+    return any(line.rsplit('|', 1)[-1].strip() == 'click' for line in result.stderr.splitlines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help='Presupuesto de arranque sobre el intérprete (ms)')
+    parser.add_argument('--completion-budget-ms', type=float, default=50.0,
+                        help='Presupuesto del completado de shell sobre el intérprete (ms)')
+    parser.add_argument('--runs', type=int, default=10, help='Repeticiones por medición')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    home = tempfile.mkdtemp(prefix='pucp-bench-')
+    env = dict(os.environ, HOME=home, PYTHONPATH=repo_root, PYTHONDONTWRITEBYTECODE='')
+
+    _run(['-c', 'import pucp_cli.main'], env)  # Calentar caché de bytecode
+
+    report = {
+        'import_ms': import_time_us(env) / 1000,
+        'budget_ms': args.budget_ms,
+        'commands': {},
+    }
+    failures = []
+
+    for cmd, forbidden in LIGHT_COMMANDS.items():
+        name = ' '.join(cmd)
+        heavy = loaded_heavy_modules(list(cmd), env)
+        wall = wall_time_ms(list(cmd), env, args.runs)
+        report['commands'][name] = {'wall_ms': round(wall, 1), 'heavy_modules': heavy}
+        unexpected = [m for m in heavy if m in forbidden]
+        if unexpected:
+            failures.append(f"'pucp {name}' imports {', '.join(unexpected)}")
+        if cmd in BUDGETED_COMMANDS and wall > args.budget_ms:
+            failures.append(f"'pucp {name}' took {wall:.1f} ms (budget {args.budget_ms:g} ms)")
+
+    seed_indexes(home)
+    report['completion'] = {}
+    for name, (words, cword) in COMPLETION_CASES.items():
+        case_env = completion_env(env, words, cword)
+        wall = wall_time_ms([], case_env, args.runs, module='pucp_cli')
+        click_loaded = completion_imports_click(case_env)
+        report['completion'][name] = {'wall_ms': round(wall, 1), 'imports_click': click_loaded}
+        if click_loaded:
+            failures.append(f"completion of '{name}' imports click")
+        if wall > args.completion_budget_ms:
+            failures.append(f"completion of '{name}' took {wall:.1f} ms "
+                            f"(budget {args.completion_budget_ms:g} ms)")
+
+    report['ok'] = not failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import pucp_cli.main: {report['import_ms']:.1f} ms")
+        for name, data in report['commands'].items():
+            heavy = ', '.join(data['heavy_modules']) or '-'
+            print(f"pucp {name:<14} {data['wall_ms']:>7.1f} ms   heavy imports: {heavy}")
+        for name, data in report['completion'].items():
+            via = 'click' if data['imports_click'] else 'index'
+            print(f"complete {name:<24} {data['wall_ms']:>7.1f} ms   via {via}")
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Orquestador stub para benchmarks
+
+Sirve en un único puerto los endpoints de auth, slice, resource y network
+que usa PUCPAPIClient, con datos sintéticos deterministas:
+
+    python benchmarks/stub_server.py --slices 10000 --servers 1000 --port 8765
+
+Soporta ETag/If-None-Match en /slices y /resources, proyección ?fields= en
+/resources y paginación con filtros (page, page_size, status,
+infrastructure) en /slices, con el total también en la cabecera
+X-Total-Count. Los tokens son JWT sin firma con `exp` (--token-ttl) y se
+renuevan con POST /refresh.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+STATUSES = ['active', 'active', 'active', 'stopped', 'error', 'draft', 'deploying']
+INFRASTRUCTURES = ['linux', 'openstack']
+FLAVORS = {
+    'tiny': {'vcpus': 1, 'ram': 512, 'disk': 5},
+    'small': {'vcpus': 1, 'ram': 1024, 'disk': 10},
+    'medium': {'vcpus': 2, 'ram': 2048, 'disk': 20},
+    'large': {'vcpus': 4, 'ram': 4096, 'disk': 40},
+}
+
+
+def make_dataset(n_slices: int, n_servers: int, nodes_per_slice: int = 3, seed: int = 42):
+    """Genera slices, servidores y VLANs sintéticos"""
+    rng = random.Random(seed)
+
+    servers = []
+    for i in range(n_servers):
+        total_vcpus = rng.choice([16, 32, 64])
+        total_ram = rng.choice([32768, 65536, 131072])
+        servers.append({
+            'hostname': f'server-{i:05d}',
+            'infrastructure': INFRASTRUCTURES[i % 2],
+            'zone_name': f'zone-{i % 8}',
+            'total_vcpus': total_vcpus,
+            'used_vcpus': rng.randint(0, total_vcpus),
+            'total_ram': total_ram,
+            'used_ram': rng.randint(0, total_ram),
+            'active_vms': rng.randint(0, 40),
+            'status': 'active' if rng.random() > 0.05 else 'inactive',
+        })
+
+    slices = []
+    vlans = []
+    for i in range(n_slices):
+        slice_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        infra = INFRASTRUCTURES[i % 2]
+        vlan_id = 100 + (i % 3900)
+        nodes = [{
+            'name': f'node-{j + 1}',
+            'image': 'ubuntu-20.04',
+            'flavor': rng.choice(list(FLAVORS)),
+            'status': 'running',
+            'ip_address': f'10.{i % 250}.{j}.10',
+            'assigned_host': servers[rng.randrange(n_servers)]['hostname'] if n_servers else None,
+        } for j in range(nodes_per_slice)]
+        slices.append({
+            'id': slice_id,
+            'name': f'lab-{i:05d}',
+            'description': f'Synthetic slice {i}',
+            'status': STATUSES[i % len(STATUSES)],
+            'infrastructure': infra,
+            'node_count': nodes_per_slice,
+            'network_count': 1,
+            'created_at': f'2025-09-{1 + i % 28:02d}T10:{i % 60:02d}:00Z',
+            'nodes': nodes,
+            'networks': [{'name': 'data-net', 'cidr': f'10.{i % 250}.0.0/24',
+                          'vlan_id': vlan_id, 'network_type': 'data',
+                          'internet_access': False}],
+        })
+        vlans.append({'vlan_id': vlan_id, 'infrastructure': infra, 'slice_id': slice_id,
+                      'slice_name': f'lab-{i:05d}'})
+
+    return slices, servers, vlans
+
+
+def make_token(username: str, ttl: float) -> str:
+    """JWT sin firma con los claims que lee el CLI"""
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    claims = {'sub': username, 'username': username, 'role': 'admin', 'exp': int(time.time() + ttl)}
+    return f"{part({'alg': 'none', 'typ': 'JWT'})}.{part(claims)}.stub"
+
+
+class StubState:
+    """Datos del stub y sus versiones (para ETag)"""
+
+    def __init__(self, slices, servers, vlans, latency: float = 0.0, token_ttl: float = 3600):
+        self.lock = threading.Lock()
+        self.token_ttl = token_ttl
+        self.slices = {s['id']: s for s in slices}
+        self.servers = servers
+        self.vlans = vlans
+        self.latency = latency
+        self.version = 1
+        self.hits = {}
+
+    def statistics(self):
+        stats = {}
+        for server in self.servers:
+            stat = stats.setdefault(server['infrastructure'], {
+                'total_vcpus': 0, 'used_vcpus': 0, 'total_ram': 0, 'used_ram': 0,
+                'active_servers': 0, 'total_servers': 0})
+            for key in ('total_vcpus', 'used_vcpus', 'total_ram', 'used_ram'):
+                stat[key] += server[key]
+            stat['total_servers'] += 1
+            stat['active_servers'] += server['status'] == 'active'
+        for stat in stats.values():
+            stat['cpu_utilization'] = stat['used_vcpus'] / stat['total_vcpus'] * 100 if stat['total_vcpus'] else 0
+            stat['ram_utilization'] = stat['used_ram'] / stat['total_ram'] * 100 if stat['total_ram'] else 0
+        return stats
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Endpoints del orquestador"""
+
+    protocol_version = 'HTTP/1.1'
+    wbufsize = 1 << 16  # Cabeceras y cuerpo en un solo write (evita esperas de Nagle)
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, payload=None, etag: str = None, total: int = None):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if total is not None:
+            self.send_header('X-Total-Count', str(total))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}') if length else {}
+
+    def _conditional(self, tag: str, build):
+        etag = '"' + hashlib.md5(f'{tag}-{self.state.version}'.encode()).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, None, etag)
+        return self._send(200, build(), etag)
+
+    def _route(self, method: str):
+        url = urlparse(self.path)
+        path = url.path.rstrip('/') or '/'
+        query = dict(parse_qsl(url.query))
+        state = self.state
+        state.hits[path] = state.hits.get(path, 0) + 1
+        if state.latency:
+            time.sleep(state.latency)
+
+        if path == '/health':
+            return self._send(200, {'status': 'ok'})
+        if path == '/login' and method == 'POST':
+            body = self._body()
+            return self._send(200, {'token': make_token(body.get('username'), state.token_ttl),
+                                    'user': {'username': body.get('username'), 'role': 'admin',
+                                             'email': 'stub@pucp.edu.pe'}})
+        if path == '/refresh' and method == 'POST':
+            return self._send(200, {'token': make_token('stub', state.token_ttl)})
+        if path == '/validate':
+            return self._send(200, {'valid': True, 'user': {'username': 'stub', 'role': 'admin'}})
+        if path == '/_stats':
+            return self._send(200, state.hits)
+
+        if path == '/slices' and method == 'GET':
+            if 'page' not in query:
+                return self._conditional('slices', lambda: list(state.slices.values()))
+            items = [s for s in state.slices.values()
+                     if all(s.get(k) == query[k] for k in ('status', 'infrastructure') if k in query)]
+            page, size = int(query['page']), int(query.get('page_size', 500))
+            return self._send(200, {'items': items[(page - 1) * size:page * size], 'total': len(items)},
+                              total=len(items))
+        if path == '/slices' and method == 'POST':
+            body = self._body()
+            with state.lock:
+                body.update(id=str(uuid.uuid4()), status='draft')
+                state.slices[body['id']] = body
+                state.version += 1
+            return self._send(201, body)
+        if path.startswith('/slices/'):
+            parts = path.split('/')
+            slice_id = parts[2]
+            with state.lock:
+                slice_data = state.slices.get(slice_id)
+                if slice_data is None:
+                    return self._send(404, {'error': 'Slice not found'})
+                if method == 'DELETE':
+                    del state.slices[slice_id]
+                    state.version += 1
+                    return self._send(200, {'message': 'Slice deleted'})
+                if method == 'POST' and parts[-1] == 'deploy':
+                    slice_data['status'] = 'active'
+                    state.version += 1
+                    return self._send(200, {'message': 'Deployment started'})
+                if method == 'PUT':
+                    slice_data.update(self._body())
+                    state.version += 1
+                    return self._send(200, slice_data)
+            return self._send(200, slice_data)
+
+        if path == '/resources':
+            infra = query.get('infrastructure')
+
+            fields = [f for f in query.get('fields', '').split(',') if f]
+
+            def build():
+                servers = [s for s in state.servers if not infra or s['infrastructure'] == infra]
+                data = {'servers': servers, 'vm_flavors': FLAVORS, 'statistics': state.statistics()}
+                return {k: v for k, v in data.items() if k in fields} if fields else data
+            return self._conditional(f"resources-{infra}-{','.join(fields)}", build)
+
+        if path == '/api/vlans':
+            infra = query.get('infrastructure')
+            return self._send(200, {'vlans': [v for v in state.vlans
+                                              if not infra or v['infrastructure'] == infra]})
+
+        return self._send(404, {'error': f'Unknown endpoint {path}'})
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_PUT(self):
+        self._route('PUT')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+
+def make_server(n_slices: int, n_servers: int, port: int = 0, latency: float = 0.0,
+                nodes_per_slice: int = 3, token_ttl: float = 3600) -> ThreadingHTTPServer:
+    """Crea el servidor stub (port=0 elige un puerto libre)"""
+    handler = type('Handler', (StubHandler,), {
+        'state': StubState(*make_dataset(n_slices, n_servers, nodes_per_slice), latency=latency,
+                           token_ttl=token_ttl)
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PUCP orchestrator stub")
+    parser.add_argument('--slices', type=int, default=1000)
+    parser.add_argument('--servers', type=int, default=100)
+    parser.add_argument('--nodes', type=int, default=3, help='Nodos por slice')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Latencia artificial (s)')
+    parser.add_argument('--token-ttl', type=float, default=3600, help='Vida de los tokens (s)')
+    args = parser.parse_args()
+
+    server = make_server(args.slices, args.servers, args.port, args.latency, args.nodes,
+                         args.token_ttl)
+    # La primera línea permite a otros procesos conocer el puerto elegido
+    print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""
+Punto de entrada de `pucp` y `python -m pucp_cli`
+
+Las peticiones de completado de shell más frecuentes se responden aquí,
+antes de importar click y los comandos (ver utils/completion.py).
+"""
+import os
+
+
+def main():
+    if os.environ.get('_PUCP_COMPLETE'):
+        from .utils.completion import fast_complete
+        if fast_complete('pucp'):
+            return
+    from .main import cli
+    cli(prog_name='pucp')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Agente residente del CLI
+
+Proceso opcional que escucha en un socket Unix (~/.pucp-cli/agent.sock)
+y mantiene abiertas las sesiones HTTP de PUCPAPIClient junto con una caché
+corta de respuestas GET. Los comandos `pucp` envían sus llamadas a través
+del agente cuando está en ejecución y trabajan en modo directo si no lo está.
+
+Protocolo: una línea JSON por petición y otra por respuesta.
+"""
+import argparse
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import Config
+from .utils import jsoncodec
+
+# Argumentos de request que pueden viajar por el socket
+AGENT_KWARGS = frozenset(['params', 'json', 'headers'])
+
+# Respuestas GET que guarda como máximo el agente
+CACHE_MAX_ENTRIES = 512
+
+
+class AgentUnavailable(Exception):
+    """No se pudo hablar con el agente (usar modo directo)
+
+    `sent` indica que la petición llegó a escribirse en el socket: el agente
+    pudo haberla reenviado al servidor aunque no haya respuesta.
+    """
+
+    def __init__(self, message: str, sent: bool = False):
+        super().__init__(message)
+        self.sent = sent
+
+
+def socket_path(config: Config) -> Path:
+    """Ruta del socket del agente"""
+    return config.config_dir / "agent.sock"
+
+
+def agent_timeout(config: Config) -> float:
+    """Plazo para una respuesta del agente: lo que tardaría la request directa"""
+    return config.connect_timeout + config.read_timeout
+
+
+def agent_supported() -> bool:
+    """Los sockets Unix no existen en todas las plataformas"""
+    return hasattr(socket, 'AF_UNIX')
+
+
+# === LADO CLIENTE ===
+
+class AgentConnection:
+    """Conexión del CLI con el agente (una por hilo)"""
+
+    def __init__(self, path: Path, timeout: Optional[float] = None):
+        self.path = path
+        self.timeout = timeout  # Plazo de conexión y de espera de cada respuesta
+        self._local = threading.local()
+
+    @classmethod
+    def discover(cls, config: Config) -> Optional['AgentConnection']:
+        """Devuelve una conexión si hay un agente escuchando"""
+        if not agent_supported() or os.environ.get('PUCP_AGENT', '1').lower() in ('0', 'false', 'no', 'off'):
+            return None
+        path = socket_path(config)
+        return cls(path, agent_timeout(config)) if path.exists() else None
+
+    def _stream(self):
+        stream = getattr(self._local, 'stream', None)
+        if stream is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)  # Un agente detenido o colgado no bloquea el CLI
+            try:
+                sock.connect(str(self.path))
+            except OSError as e:
+                sock.close()
+                raise AgentUnavailable(str(e))
+            stream = self._local.stream = sock.makefile('rwb')
+        return stream
+
+    def call(self, payload: Dict) -> Dict:
+        """Envía una petición y espera la respuesta
+
+        Si el agente se detuvo, reinició o no responde a tiempo se lanza
+        AgentUnavailable, igual que al conectar; con `sent` si la petición ya
+        se había escrito.
+        """
+        stream = self._stream()
+        try:
+            stream.write(jsoncodec.dumpb(payload) + b'\n')
+            stream.flush()
+        except OSError as e:  # socket.timeout incluido
+            self._drop(stream)
+            raise AgentUnavailable(f"Agent connection lost: {e}")
+
+        try:
+            line = stream.readline()
+        except OSError as e:
+            self._drop(stream)
+            raise AgentUnavailable(f"No reply from agent: {e or 'timed out'}", sent=True)
+        if not line:
+            self._drop(stream)
+            raise AgentUnavailable("Agent connection closed", sent=True)
+        return jsoncodec.loads(line)
+
+    def _drop(self, stream):
+        self._local.stream = None
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+    def request(self, method: str, service_url: str, endpoint: str, auth: Optional[str],
+                **kwargs) -> Dict:
+        """Ejecuta una request de API a través del agente"""
+        from .api_client import APIException
+
+        reply = self.call({'op': 'request', 'method': method, 'service_url': service_url,
+                           'endpoint': endpoint, 'auth': auth, 'kwargs': kwargs})
+        if not reply.get('ok'):
+            raise APIException(reply.get('error', 'Agent error'), reply.get('status_code'))
+        return reply.get('data')
+
+
+# === LADO SERVIDOR ===
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    """Atiende las peticiones de una conexión hasta que el cliente cierra"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.dispatch(jsoncodec.loads(line))
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self.wfile.write(jsoncodec.dumpb(reply) + b'\n')
+            self.wfile.flush()
+
+
+# En plataformas sin AF_UNIX el módulo se puede importar, pero no arrancar
+_UnixStreamServer = getattr(socketserver, 'UnixStreamServer', object)
+
+
+class AgentServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """Servidor del agente: sesiones HTTP persistentes y caché de GETs"""
+
+    daemon_threads = True
+
+    def __init__(self, config: Config, cache_ttl: float = 2.0, idle_timeout: float = 0,
+                 cache_max_entries: int = CACHE_MAX_ENTRIES):
+        from .api_client import PUCPAPIClient
+
+        self.config = config
+        self.cache_ttl = cache_ttl
+        self.idle_timeout = idle_timeout
+        self.client = PUCPAPIClient(config, use_agent=False)
+        self.client.set_token(None)  # El token lo aporta (y lo renueva) cada cliente
+        self.client.tokens.set(None)
+        # clave → (expira, datos), en orden de inserción, que con TTL fijo es el de expiración
+        self.cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self.cache_max_entries = cache_max_entries
+        self.cache_lock = threading.Lock()
+        self.started_at = time.time()
+        self.last_activity = time.time()
+        self.stats = {'requests': 0, 'cache_hits': 0}
+        self.stats_lock = threading.Lock()
+
+        path = socket_path(config)
+        config.config_dir.mkdir(exist_ok=True)
+        if path.exists():
+            path.unlink()
+
+        old_umask = os.umask(0o177)  # Socket accesible solo por el usuario
+        try:
+            super().__init__(str(path), _AgentHandler)
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(self, message: Dict) -> Dict:
+        """Ejecuta una operación del protocolo"""
+        from .api_client import APIException
+
+        self.last_activity = time.time()
+        op = message.get('op')
+
+        if op == 'ping':
+            with self.stats_lock:
+                stats = dict(self.stats)
+            return {'ok': True, 'pid': os.getpid(), 'uptime': time.time() - self.started_at,
+                    'cache_entries': len(self.cache), **stats}
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True}
+        if op != 'request':
+            return {'ok': False, 'error': f"Unknown operation: {op}"}
+
+        self._count('requests')
+        method = message['method']
+        kwargs = {k: v for k, v in (message.get('kwargs') or {}).items() if k in AGENT_KWARGS}
+        key = (method, message['service_url'], message['endpoint'], message.get('auth'),
+               jsoncodec.dumps(kwargs, sort_keys=True))
+
+        if method == 'GET' and self.cache_ttl > 0:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return {'ok': True, 'data': cached}
+        elif method != 'GET':
+            with self.cache_lock:
+                self.cache.clear()  # Una mutación invalida lo cacheado
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if message.get('auth'):
+            headers['Authorization'] = message['auth']
+
+        try:
+            response = self.client._send(method, message['service_url'], message['endpoint'],
+                                         headers=headers, **kwargs)
+            data = jsoncodec.loads(response.content)
+        except APIException as e:
+            return {'ok': False, 'error': str(e), 'status_code': e.status_code}
+
+        if method == 'GET' and self.cache_ttl > 0:
+            self._cache_put(key, data)
+        return {'ok': True, 'data': data}
+
+    def _count(self, name: str):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _cache_get(self, key: tuple):
+        """Datos cacheados vigentes o None (una entrada expirada se descarta)"""
+        with self.cache_lock:
+            cached = self.cache.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.time():
+                del self.cache[key]
+                return None
+            return cached[1]
+
+    def _cache_put(self, key: tuple, data):
+        """Guarda una respuesta, purgando las expiradas y las más antiguas sobre el límite"""
+        now = time.time()
+        with self.cache_lock:
+            self.cache.pop(key, None)
+            self.cache[key] = (now + self.cache_ttl, data)
+            # Las primeras son las que antes expiran
+            while self.cache:
+                oldest_key, (expires, _) = next(iter(self.cache.items()))
+                if expires > now and len(self.cache) <= self.cache_max_entries:
+                    break
+                del self.cache[oldest_key]
+
+    def service_actions(self):
+        """Apagado automático tras `idle_timeout` segundos sin actividad"""
+        if self.idle_timeout and time.time() - self.last_activity > self.idle_timeout:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            socket_path(self.config).unlink()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PUCP CLI agent")
+    parser.add_argument('--cache-ttl', type=float, default=2.0,
+                        help='Segundos que se reutiliza una respuesta GET')
+    parser.add_argument('--idle-timeout', type=float, default=0,
+                        help='Apagar tras N segundos sin peticiones (0 = nunca)')
+    args = parser.parse_args()
+
+    if not agent_supported():
+        parser.exit(1, "The agent needs Unix domain sockets\n")
+
+    server = AgentServer(Config(), cache_ttl=args.cache_ttl, idle_timeout=args.idle_timeout)
+    try:
+        server.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,60 +3,299 @@
 Cliente unificado para APIs del PUCP Cloud Orchestrator
 """
 
-import requests
-from typing import Optional, Dict, List
-from rich.console import Console
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Iterator, List, Tuple
 from .config import Config
+from .agent import AGENT_KWARGS, AgentConnection, AgentUnavailable
+from .utils import trace
+from .utils import jsoncodec
+from .utils.http_cache import open_cache
+from .utils.jsonstream import CHUNK_SIZE, project, select_fields
+from .utils.tokens import AUTH_ENDPOINTS, TokenManager, env_credentials
 
-console = Console()
+# requests/urllib3 se importan al crear el cliente: comandos que no hablan
+# con la API (--version, auth logout, completado) no pagan su carga
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
 
 class APIException(Exception):
     """Excepción para errores de API"""
-    pass
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def raise_for_response(response):
+    """Traduce una respuesta HTTP de error a APIException
+    
+    Sirve para respuestas de requests y de httpx (misma interfaz).
+    """
+    code = response.status_code
+    if code == 401:
+        raise APIException("Authentication required. Run 'pucp auth login'", code)
+    elif code == 403:
+        raise APIException("Insufficient permissions", code)
+    elif code >= 400:
+        try:
+            error_data = response.json()
+            message = error_data.get('error', f'HTTP {code}')
+        except Exception:
+            message = f'HTTP {code}: {response.text}'
+        raise APIException(message, code)
+
+# Solo se reintentan lecturas/estados en métodos idempotentes; los errores de
+# conexión (request nunca enviada) se reintentan para cualquier método
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUSES = (502, 503, 504)
+
+def build_retry(config: Config) -> 'Retry':
+    """Política de reintentos con backoff exponencial y jitter"""
+    from urllib3.util.retry import Retry
+    
+    options = dict(
+        total=config.max_retries,
+        connect=config.max_retries,
+        read=config.max_retries,
+        status=config.max_retries,
+        backoff_factor=config.retry_backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=config.retry_backoff, **options)
+    except TypeError:  # urllib3 < 2 no soporta jitter
+        return Retry(**options)
+
+# Slices por página al listar /slices
+SLICE_PAGE_SIZE = 500
+
+def _page_items(data, page: int, page_size: int) -> Tuple[List, bool]:
+    """(elementos, hay más páginas) de una respuesta de GET /slices paginado
+    
+    Acepta {items|slices, next|has_more|total} o la lista plana del endpoint
+    clásico, que ya es el listado completo. Lo usan los dos clientes.
+    """
+    if isinstance(data, list):
+        return data, False
+    items = data.get('items', data.get('slices', []))
+    if 'next' in data:
+        more = bool(data['next'])
+    elif 'has_more' in data:
+        more = bool(data['has_more'])
+    elif 'total' in data:
+        more = page * page_size < data['total']
+    else:
+        more = len(items) >= page_size
+    return items, more
 
 class PUCPAPIClient:
     """Cliente principal para todas las APIs"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, use_agent: bool = True):
         self.config = config
-        self.session = requests.Session()
+        self.timeout = (config.connect_timeout, config.read_timeout)
+        self._session = None
+        self._session_lock = threading.Lock()  # Hilos de --parallel y de revalidación
         
         # Headers comunes
-        self.session.headers.update({
+        self.headers = {
             'Content-Type': 'application/json',
-            'User-Agent': 'PUCP-CLI/1.0.0'
-        })
+            'User-Agent': 'PUCP-CLI/1.0.0',
+            'Accept-Encoding': 'gzip, deflate' if config.compression else 'identity',
+        }
         
         # Agregar token si existe
-        token = config.get_token()
-        if token:
-            self.session.headers['Authorization'] = f'Bearer {token}'
+        self.tokens = TokenManager(config)
+        self._token_lock = threading.Lock()
+        if self.tokens.token:
+            self.headers['Authorization'] = f'Bearer {self.tokens.token}'
             #self.session.headers['Authorization'] = f'Bearer {config.token}'
+        
+        # Caché de GETs en disco (None si está desactivada)
+        self.cache = open_cache(config)
+        
+        # Agente residente (pucp agent start) si está en ejecución
+        self.agent = None
+        if use_agent:
+            self.agent = AgentConnection.discover(config)
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """Sesión HTTP (se crea al primer uso; con agente puede no crearse nunca)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:  # Otro hilo pudo crearla mientras se esperaba
+                    self._session = self._new_session()
+        return self._session
+    
+    def _new_session(self) -> 'requests.Session':
+        """Sesión con un pool por servicio y la política de reintentos"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        
+        # Un pool de conexiones por servicio, dimensionado para trabajo en paralelo
+        retry = build_retry(self.config)
+        for service_url in set(self.service_urls(include_template=True).values()):
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.pool_maxsize,
+                                  max_retries=retry)
+            session.mount(service_url.rstrip('/') + '/', adapter)
+        
+        session.headers.update(self.headers)
+        return session
     
-    def _request(self, method: str, service_url: str, endpoint: str, **kwargs) -> Dict:
-        """Método base para hacer requests"""
+    def _send(self, method: str, service_url: str, endpoint: str, **kwargs) -> 'requests.Response':
+        """Envía la request y traduce errores HTTP a APIException"""
+        import requests
+        
         url = f"{service_url}{endpoint}"
+        self._ensure_token(endpoint)
         
-        try:
-            response = self.session.request(method, url, timeout=30, **kwargs)
-            
-            if response.status_code == 401:
-                raise APIException("Authentication required. Run 'pucp auth login'")
-            elif response.status_code == 403:
-                raise APIException("Insufficient permissions")
-            elif response.status_code >= 400:
-                try:
-                    error_data = response.json()
-                    raise APIException(error_data.get('error', f'HTTP {response.status_code}'))
-                except:
-                    raise APIException(f'HTTP {response.status_code}: {response.text}')
+        kwargs.setdefault('timeout', self.timeout)
+        if kwargs.get('json') is not None:
+            kwargs['data'] = jsoncodec.dumpb(kwargs.pop('json'))  # Content-Type ya va en la sesión
+        with trace.http_span(method, url) as span:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.Timeout:
+                raise APIException(f"Request timeout to {service_url}")
+            except requests.exceptions.ConnectionError:
+                raise APIException(f"Cannot connect to {service_url}")
             
-            return response.json()
+            if span:
+                # Con stream=True el cuerpo no se descarga aquí
+                size = (response.headers.get('Content-Length', '') if kwargs.get('stream')
+                        else len(response.content))
+                span.set(status=response.status_code, bytes=size,
+                         connect=trace.take_connect_time() or 0.0,
+                         ttfb=response.elapsed.total_seconds())
             
-        except requests.exceptions.ConnectionError:
-            raise APIException(f"Cannot connect to {service_url}")
-        except requests.exceptions.Timeout:
-            raise APIException(f"Request timeout to {service_url}")
+            raise_for_response(response)
+            return response
+    
+    def _request(self, method: str, service_url: str, endpoint: str,
+                 fields: Optional[List[str]] = None, **kwargs) -> Dict:
+        """Método base para hacer requests
+        
+        Con `fields` se pide al servidor solo esos campos de primer nivel
+        (?fields=a,b) y, por si no lo soporta, se extraen del cuerpo en
+        streaming sin decodificar el resto.
+        """
+        if fields:
+            kwargs['params'] = dict(kwargs.get('params') or {}, fields=','.join(fields))
+        if method == 'GET' and self.cache is not None:
+            policy = self.cache.policy(endpoint)
+            if policy is not None:
+                return self._cached_get(service_url, endpoint, policy, fields=fields, **kwargs)
+        if self.agent is not None and set(kwargs) <= AGENT_KWARGS:
+            self._ensure_token(endpoint)
+            try:
+                with trace.span('agent', 'http', method=method, url=f"{service_url}{endpoint}"):
+                    return project(self.agent.request(method, service_url, endpoint,
+                                                      self.headers.get('Authorization'), **kwargs),
+                                   fields)
+            except AgentUnavailable as e:
+                self.agent = None  # Socket huérfano: seguir en modo directo
+                # Una mutación que el agente pudo reenviar no se repite: se duplicaría
+                if e.sent and method not in IDEMPOTENT_METHODS:
+                    raise APIException(f"Agent stopped responding after {method} {endpoint} was sent; "
+                                       f"the outcome is unknown, check before retrying")
+        response = self._send(method, service_url, endpoint, stream=bool(fields), **kwargs)
+        return self._decode(response, fields)
+    
+    def _decode(self, response: 'requests.Response', fields: Optional[List[str]] = None):
+        """Cuerpo JSON de la respuesta (solo `fields` si se piden)"""
+        with trace.span('json', 'parse'):
+            if not fields:
+                return jsoncodec.loads(response.content)
+            try:
+                return select_fields(response.iter_content(CHUNK_SIZE), fields)
+            finally:
+                response.close()  # Puede quedar cuerpo sin leer
+    
+    def conditional_get(self, service_url: str, endpoint: str, validators: Optional[Dict] = None,
+                        fields: Optional[List[str]] = None, **kwargs) -> Tuple[Optional[Dict], Dict]:
+        """GET condicional (If-None-Match / If-Modified-Since)
+        
+        Devuelve (None, validators) si el servidor responde 304 Not Modified.
+        """
+        validators = validators or {}
+        headers = dict(kwargs.pop('headers', {}) or {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        if fields:
+            kwargs['params'] = dict(kwargs.get('params') or {}, fields=','.join(fields))
+        response = self._send('GET', service_url, endpoint, headers=headers, stream=bool(fields),
+                              **kwargs)
+        if response.status_code == 304:
+            response.close()
+            return None, validators
+        
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        data = self._decode(response, fields)
+        
+        # Las descargas completas de endpoints cacheables también alimentan la caché
+        if self.cache is not None and self.cache.policy(endpoint) is not None:
+            self.cache.put(self._cache_key(service_url, endpoint, kwargs.get('params')),
+                           f"{service_url}{endpoint}", data, new_validators)
+        return data, new_validators
+    
+    # === CACHÉ ===
+    def _cache_key(self, service_url: str, endpoint: str, params: Optional[Dict]) -> str:
+        identity = self.tokens.username or self.headers.get('Authorization') or 'anonymous'
+        return self.cache.key(f"{service_url}{endpoint}", params, identity)
+    
+    def _cached_get(self, service_url: str, endpoint: str, policy, **kwargs) -> Dict:
+        """GET desde la caché: fresco, stale (revalidando en segundo plano) o descargado"""
+        key = self._cache_key(service_url, endpoint, kwargs.get('params'))
+        entry = self.cache.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age < policy.ttl + policy.stale:
+                with trace.span('cache', 'http', url=f"{service_url}{endpoint}",
+                                detail='fresh' if age < policy.ttl else 'stale'):
+                    pass
+                if age >= policy.ttl:
+                    # Hilo no daemon: el proceso espera a que termine antes de salir
+                    threading.Thread(target=self._revalidate, name='cache-revalidate',
+                                     args=(service_url, endpoint, key, entry, kwargs, True)).start()
+                return entry.data
+        return self._revalidate(service_url, endpoint, key, entry, kwargs)
+    
+    def _revalidate(self, service_url: str, endpoint: str, key: str, entry, kwargs: Dict,
+                    background: bool = False):
+        """GET condicional contra la copia guardada; devuelve los datos vigentes"""
+        try:
+            data, _ = self.conditional_get(service_url, endpoint, entry.validators if entry else None,
+                                           **kwargs)
+        except APIException:
+            if background:
+                return None  # Se reintentará en la próxima invocación
+            raise
+        if data is None:  # 304: la copia sigue valiendo
+            self.cache.touch(key, entry)
+            return entry.data
+        return data
+    
+    def cached_response(self, service_url: str, endpoint: str,
+                        params: Optional[Dict] = None) -> Tuple[Optional[Dict], Dict]:
+        """Última copia en caché (aunque esté vencida) y sus validadores, o (None, {})"""
+        if self.cache is None:
+            return None, {}
+        entry = self.cache.peek(self._cache_key(service_url, endpoint, params))
+        return (entry.data, entry.validators) if entry else (None, {})
     
      # === AUTH METHODS ===
     def login(self, username: str, password: str) -> Dict:
@@ -68,14 +307,95 @@ class PUCPAPIClient:
         """Valida token actual"""
         return self._request('POST', self.config.auth_service, '/validate')
     
-    def set_token(self, token: str):
-        """Establece token para requests"""
-        self.session.headers['Authorization'] = f'Bearer {token}'
+    def refresh_token(self, force: bool = False) -> bool:
+        """Renueva el token con POST /refresh o, si falla, con PUCP_USERNAME/PUCP_PASSWORD"""
+        with self._token_lock:
+            if not force and not self.tokens.needs_refresh():
+                return True  # Otro hilo ya lo renovó
+            
+            token = None
+            with trace.span('token-refresh', 'http'):
+                try:
+                    token = self._request('POST', self.config.auth_service, '/refresh').get('token')
+                except APIException:
+                    credentials = env_credentials()
+                    if credentials:
+                        try:
+                            token = self.login(*credentials).get('token')
+                        except APIException:
+                            pass
+            
+            if not token:
+                self.tokens.failed()
+                return False
+            self.tokens.accept(token)
+            self.set_token(token)
+            return True
+    
+    def _ensure_token(self, endpoint: str):
+        """Renueva el token antes de una request si está por expirar"""
+        if self.tokens.expires_at is not None and endpoint not in AUTH_ENDPOINTS \
+                and self.tokens.needs_refresh():
+            self.refresh_token()
+    
+    def set_token(self, token: Optional[str]):
+        """Establece (o elimina, con None) el token para requests"""
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+        else:
+            self.headers.pop('Authorization', None)
+        if self._session is not None:
+            self._session.headers.pop('Authorization', None)
+            self._session.headers.update(self.headers)
     
     # === SLICE METHODS ===
     def list_slices(self) -> list:
-        """Lista todos los slices"""
-        return self._request('GET', self.config.slice_service, '/slices')
+        """Lista todos los slices (todas las páginas)"""
+        return list(self.iter_slices())
+    
+    def iter_slices(self, status: str = None, infrastructure: str = None,
+                    page_size: int = SLICE_PAGE_SIZE, start_page: int = 1) -> Iterator[Dict]:
+        """Itera slices página a página enviando los filtros al servidor
+        
+        Acepta respuestas paginadas ({items|slices, next|has_more|total}) o
+        la lista plana del endpoint clásico; en ese caso (o si el servidor
+        ignora los filtros) se filtra en el cliente.
+        """
+        filters = {k: v for k, v in (('status', status), ('infrastructure', infrastructure)) if v}
+        page = start_page
+        
+        while True:
+            params = dict(filters, page=page, page_size=page_size)
+            data = self._request('GET', self.config.slice_service, '/slices', params=params)
+            items, more = _page_items(data, page, page_size)
+            
+            for item in items:
+                # Solo descarta algo si el servidor ignoró los filtros
+                if all(item.get(k) == v for k, v in filters.items()):
+                    yield item
+            
+            if not more or not items:
+                break
+            page += 1
+    
+    def list_slices_if_changed(self, validators: Optional[Dict] = None,
+                               page_size: int = SLICE_PAGE_SIZE) -> Tuple[Optional[list], Dict]:
+        """Lista todos los slices solo si cambiaron desde `validators`
+        
+        La primera página es un GET condicional. Si el servidor pagina y hay
+        más, el resto se descarga y no se guardan validadores: el ETag de la
+        primera página no dice nada de las demás.
+        """
+        data, validators = self.conditional_get(self.config.slice_service, '/slices', validators,
+                                                params={'page': 1, 'page_size': page_size})
+        if data is None:
+            return None, validators
+        items, more = _page_items(data, 1, page_size)
+        items = list(items)
+        if more and items:
+            items.extend(self.iter_slices(page_size=page_size, start_page=2))
+            validators = {}
+        return items, validators
     
     def get_slice(self, slice_id: str) -> Dict:
         """Obtiene detalles de un slice"""
@@ -85,6 +405,10 @@ class PUCPAPIClient:
         """Crea nuevo slice"""
         return self._request('POST', self.config.slice_service, '/slices', json=slice_data)
     
+    def update_slice(self, slice_id: str, slice_data: Dict) -> Dict:
+        """Reemplaza la definición de un slice"""
+        return self._request('PUT', self.config.slice_service, f'/slices/{slice_id}', json=slice_data)
+    
     def deploy_slice(self, slice_id: str) -> Dict:
         """Despliega un slice"""
         return self._request('POST', self.config.slice_service, f'/slices/{slice_id}/deploy')
@@ -116,11 +440,26 @@ class PUCPAPIClient:
         return self._request('DELETE', self.config.slice_service, f'/slices/{slice_id}')
     
     # === RESOURCE SERVICE ===
-    def resource_servers(self, infrastructure: str = None) -> List[Dict]:
-        """Lista servidores"""
+    def resource_servers(self, infrastructure: str = None, fields: Optional[List[str]] = None) -> Dict:
+        """Obtiene /resources (servidores, flavors y estadísticas, o solo `fields`)"""
         params = {'infrastructure': infrastructure} if infrastructure else {}
         return self._request('GET', self.config.slice_service, '/resources', 
-                           params=params)
+                           params=params, fields=fields)
+    
+    def resources_if_changed(self, validators: Optional[Dict] = None, infrastructure: str = None,
+                             fields: Optional[List[str]] = None) -> Tuple[Optional[Dict], Dict]:
+        """Obtiene /resources solo si cambió desde `validators`"""
+        params = {'infrastructure': infrastructure} if infrastructure else {}
+        return self.conditional_get(self.config.slice_service, '/resources', validators,
+                                    fields=fields, params=params)
+    
+    def resources_cached(self, infrastructure: str = None,
+                         fields: Optional[List[str]] = None) -> Tuple[Optional[Dict], Dict]:
+        """Última copia de /resources en la caché en disco, o (None, {})"""
+        params = {'infrastructure': infrastructure} if infrastructure else {}
+        if fields:
+            params['fields'] = ','.join(fields)
+        return self.cached_response(self.config.slice_service, '/resources', params)
     
     # === NETWORK SERVICE ===
     def network_vlans(self, infrastructure: str = None) -> List[Dict]:
@@ -130,21 +469,74 @@ class PUCPAPIClient:
                            params=params)
     
     # === HEALTH CHECKS ===
-    def health_check_all(self) -> Dict:
-        """Verifica estado de todos los servicios"""
+    def service_urls(self, include_template: bool = False) -> Dict[str, str]:
+        """URLs base de los servicios conocidos"""
         services = {
             'auth': self.config.auth_service,
             'slice': self.config.slice_service,
             'network': self.config.network_service,
             'image': self.config.image_service,
         }
+        if include_template:
+            services['template'] = self.config.template_service
+        return services
+    
+    def _probe(self, session: 'requests.Session', url: str, samples: int, timeout: float) -> Dict:
+        """Sondea /health de un servicio `samples` veces y mide latencias"""
+        import requests
         
-        status = {}
-        for name, url in services.items():
+        result = {'url': url, 'state': 'online', 'code': None, 'detail': 'OK',
+                  'latencies': [], 'failures': 0}
+        
+        for _ in range(samples):
+            start = time.perf_counter()
             try:
-                self._request('GET', url, '/health')
-                status[name] = '🟢 Online'
-            except:
-                status[name] = '🔴 Offline'
+                response = session.get(f"{url}/health", timeout=timeout)
+                elapsed = (time.perf_counter() - start) * 1000
+                result['code'] = response.status_code
+                if response.status_code == 200:
+                    result['latencies'].append(elapsed)
+                    continue
+                result['state'] = 'http_error'
+                result['detail'] = f"Error {response.status_code}"
+            except requests.exceptions.Timeout:
+                # Antes que ConnectionError: ConnectTimeout hereda de las dos
+                result['state'] = 'timeout'
+                result['detail'] = f"Timeout ({timeout:g}s)"
+            except requests.exceptions.ConnectionError:
+                result['state'] = 'offline'
+                result['detail'] = "Connection refused"
+            except Exception as e:
+                result['state'] = 'error'
+                result['detail'] = str(e)[:20]
+            result['failures'] += 1
+        
+        # Un servicio con alguna respuesta correcta se considera online
+        if result['latencies']:
+            result['state'] = 'online'
+        
+        return result
+    
+    def probe_health(self, services: Dict[str, str], samples: int = 1, timeout: float = 5) -> Dict[str, Dict]:
+        """Sondea todos los servicios en paralelo (tarda lo que el más lento)"""
+        import requests
+        
+        if not services:
+            return {}
+        
+        # Sesión propia sin reintentos: cada sondeo mide un único intento
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=len(services)) as pool:
+            session.headers['User-Agent'] = self.headers['User-Agent']
+            futures = {name: pool.submit(self._probe, session, url, samples, timeout)
+                       for name, url in services.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
+    def health_check_all(self) -> Dict:
+        """Verifica estado de todos los servicios"""
+        results = self.probe_health(self.service_urls())
+        
+        status = {}
+        for name, result in results.items():
+            status[name] = '🟢 Online' if result['state'] == 'online' else '🔴 Offline'
         
         return status
\ No newline at end of file
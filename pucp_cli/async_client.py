@@ -0,0 +1,259 @@
+"""
+Cliente asíncrono para APIs del PUCP Cloud Orchestrator
+
+Misma interfaz que PUCPAPIClient pero con corutinas sobre httpx, un pool
+de conexiones compartido y un semáforo que acota la concurrencia. Los
+errores se traducen a la misma APIException.
+
+httpx es una dependencia opcional:  pip install "pucp-cli[async]"
+"""
+import asyncio
+import random
+from typing import AsyncIterator, Dict, List, Optional
+
+from .api_client import (APIException, IDEMPOTENT_METHODS, RETRY_STATUSES, SLICE_PAGE_SIZE, _page_items,
+                         raise_for_response)
+from .config import Config
+from .utils import jsoncodec
+from .utils.jsonstream import project
+from .utils.tokens import AUTH_ENDPOINTS, TokenManager, env_credentials
+
+
+def async_available() -> bool:
+    """Indica si httpx está instalado"""
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncPUCPAPIClient:
+    """Cliente asíncrono para todas las APIs
+
+    Uso:
+        async with AsyncPUCPAPIClient(config) as client:
+            slices = await asyncio.gather(*(client.get_slice(i) for i in ids))
+    """
+
+    def __init__(self, config: Config, max_concurrency: Optional[int] = None):
+        try:
+            import httpx
+        except ImportError:
+            raise APIException("Async client requires httpx: pip install 'pucp-cli[async]'")
+
+        self.config = config
+        self._semaphore = asyncio.Semaphore(max_concurrency or config.pool_maxsize)
+
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': 'PUCP-CLI/1.0.0',
+            'Accept-Encoding': 'gzip, deflate' if config.compression else 'identity',
+        }
+        self.tokens = TokenManager(config)
+        self._token_lock = None  # asyncio.Lock, creado dentro del bucle
+        if self.tokens.token:
+            headers['Authorization'] = f'Bearer {self.tokens.token}'
+
+        # Un único pool compartido por todas las corutinas
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(max_connections=config.pool_maxsize,
+                                max_keepalive_connections=config.pool_maxsize),
+        )
+
+    async def __aenter__(self) -> 'AsyncPUCPAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Cierra el pool de conexiones"""
+        await self.client.aclose()
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Backoff exponencial con jitter (misma política que el cliente síncrono)"""
+        backoff = self.config.retry_backoff
+        return backoff * (2 ** attempt) + random.uniform(0, backoff)
+
+    async def _send(self, method: str, service_url: str, endpoint: str, **kwargs):
+        """Envía la request (con reintentos) y traduce errores a APIException"""
+        import httpx
+
+        url = f"{service_url}{endpoint}"
+        if self.tokens.expires_at is not None and endpoint not in AUTH_ENDPOINTS \
+                and self.tokens.needs_refresh():
+            await self.refresh_token()
+        if kwargs.get('json') is not None:
+            kwargs['content'] = jsoncodec.dumpb(kwargs.pop('json'))
+        retries = self.config.max_retries
+        attempt = 0
+
+        async with self._semaphore:
+            while True:
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                except httpx.TimeoutException:
+                    if method in IDEMPOTENT_METHODS and attempt < retries:
+                        await asyncio.sleep(self._retry_delay(attempt))
+                        attempt += 1
+                        continue
+                    raise APIException(f"Request timeout to {service_url}")
+                except httpx.ConnectError:
+                    # La request no llegó a enviarse: se puede reintentar con cualquier método
+                    if attempt < retries:
+                        await asyncio.sleep(self._retry_delay(attempt))
+                        attempt += 1
+                        continue
+                    raise APIException(f"Cannot connect to {service_url}")
+                except httpx.TransportError:
+                    raise APIException(f"Cannot connect to {service_url}")
+
+                if (response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+                        and attempt < retries):
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    attempt += 1
+                    continue
+
+                raise_for_response(response)
+                return response
+
+    async def _request(self, method: str, service_url: str, endpoint: str, **kwargs) -> Dict:
+        """Método base para hacer requests"""
+        response = await self._send(method, service_url, endpoint, **kwargs)
+        return jsoncodec.loads(response.content)
+
+    # === AUTH METHODS ===
+    async def login(self, username: str, password: str) -> Dict:
+        """Login usuario"""
+        return await self._request('POST', self.config.auth_service, '/login',
+                                   json={'username': username, 'password': password})
+
+    async def validate_token(self) -> Dict:
+        """Valida token actual"""
+        return await self._request('POST', self.config.auth_service, '/validate')
+
+    async def refresh_token(self) -> bool:
+        """Renueva el token con POST /refresh o, si falla, con PUCP_USERNAME/PUCP_PASSWORD"""
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if not self.tokens.needs_refresh():
+                return True  # Otra corutina ya lo renovó
+
+            token = None
+            try:
+                token = (await self._request('POST', self.config.auth_service, '/refresh')).get('token')
+            except APIException:
+                credentials = env_credentials()
+                if credentials:
+                    try:
+                        token = (await self.login(*credentials)).get('token')
+                    except APIException:
+                        pass
+
+            if not token:
+                self.tokens.failed()
+                return False
+            self.tokens.accept(token)
+            self.set_token(token)
+            return True
+
+    def set_token(self, token: Optional[str]):
+        """Establece (o elimina, con None) el token para requests"""
+        if token:
+            self.client.headers['Authorization'] = f'Bearer {token}'
+        else:
+            self.client.headers.pop('Authorization', None)
+
+    # === SLICE METHODS ===
+    async def list_slices(self) -> list:
+        """Lista todos los slices"""
+        return await self._request('GET', self.config.slice_service, '/slices')
+
+    async def iter_slices(self, status: str = None, infrastructure: str = None,
+                          page_size: int = SLICE_PAGE_SIZE) -> AsyncIterator[Dict]:
+        """Itera slices página a página (ver PUCPAPIClient.iter_slices)"""
+        filters = {k: v for k, v in (('status', status), ('infrastructure', infrastructure)) if v}
+        page = 1
+
+        while True:
+            params = dict(filters, page=page, page_size=page_size)
+            data = await self._request('GET', self.config.slice_service, '/slices', params=params)
+            items, more = _page_items(data, page, page_size)
+
+            for item in items:
+                if all(item.get(k) == v for k, v in filters.items()):
+                    yield item
+
+            if not more or not items:
+                break
+            page += 1
+
+    async def get_slice(self, slice_id: str) -> Dict:
+        """Obtiene detalles de un slice"""
+        return await self._request('GET', self.config.slice_service, f'/slices/{slice_id}')
+
+    async def get_slices(self, slice_ids: List[str]) -> List[Dict]:
+        """Obtiene los detalles de varios slices en paralelo"""
+        return await asyncio.gather(*(self.get_slice(slice_id) for slice_id in slice_ids))
+
+    async def create_slice(self, slice_data: Dict) -> Dict:
+        """Crea nuevo slice"""
+        return await self._request('POST', self.config.slice_service, '/slices', json=slice_data)
+
+    async def update_slice(self, slice_id: str, slice_data: Dict) -> Dict:
+        """Reemplaza la definición de un slice"""
+        return await self._request('PUT', self.config.slice_service, f'/slices/{slice_id}',
+                                   json=slice_data)
+
+    async def deploy_slice(self, slice_id: str) -> Dict:
+        """Despliega un slice"""
+        return await self._request('POST', self.config.slice_service, f'/slices/{slice_id}/deploy')
+
+    async def delete_slice(self, slice_id: str) -> Dict:
+        """Elimina un slice"""
+        return await self._request('DELETE', self.config.slice_service, f'/slices/{slice_id}')
+
+    # === RESOURCE SERVICE ===
+    async def resource_servers(self, infrastructure: str = None, fields: Optional[List[str]] = None) -> Dict:
+        """Obtiene /resources (servidores, flavors y estadísticas, o solo `fields`)"""
+        params = {'infrastructure': infrastructure} if infrastructure else {}
+        if fields:
+            params['fields'] = ','.join(fields)
+        return project(await self._request('GET', self.config.slice_service, '/resources', params=params),
+                       fields)
+
+    # === NETWORK SERVICE ===
+    async def network_vlans(self, infrastructure: str = None) -> List[Dict]:
+        """Lista VLANs"""
+        params = {'infrastructure': infrastructure} if infrastructure else {}
+        return await self._request('GET', self.config.network_service, '/api/vlans', params=params)
+
+    # === HEALTH CHECKS ===
+    def service_urls(self, include_template: bool = False) -> Dict[str, str]:
+        """URLs base de los servicios conocidos"""
+        services = {
+            'auth': self.config.auth_service,
+            'slice': self.config.slice_service,
+            'network': self.config.network_service,
+            'image': self.config.image_service,
+        }
+        if include_template:
+            services['template'] = self.config.template_service
+        return services
+
+    async def health_check_all(self) -> Dict:
+        """Verifica estado de todos los servicios en paralelo"""
+        async def check(url: str) -> str:
+            try:
+                await self._request('GET', url, '/health')
+                return '🟢 Online'
+            except Exception:
+                return '🔴 Offline'
+
+        services = self.service_urls()
+        results = await asyncio.gather(*(check(url) for url in services.values()))
+        return dict(zip(services, results))
@@ -0,0 +1,112 @@
+"""
+Comandos del agente residente
+"""
+import click
+import subprocess
+import sys
+import time
+from rich.console import Console
+from rich.table import Table
+from ..config import Config
+from ..agent import AgentConnection, AgentUnavailable, agent_supported, agent_timeout, socket_path
+from ..api_client import APIException
+
+console = Console()
+
+def _ping(config: Config):
+    """Estado del agente, o None si no responde"""
+    connection = AgentConnection(socket_path(config), agent_timeout(config))
+    try:
+        return connection.call({'op': 'ping'})
+    except (AgentUnavailable, APIException):
+        return None
+
+@click.group()
+def agent():
+    """⚡ Agente residente (sesiones y cachés persistentes)"""
+    pass
+
+@agent.command("start")
+@click.option('--foreground', is_flag=True, help='Ejecutar en primer plano')
+@click.option('--cache-ttl', default=2.0, type=float, help='Segundos que se reutiliza una respuesta GET')
+@click.option('--idle-timeout', default=0.0, type=float, help='Apagar tras N segundos sin uso (0 = nunca)')
+def start(foreground, cache_ttl, idle_timeout):
+    """Inicia el agente en un socket Unix local"""
+
+    if not agent_supported():
+        console.print("❌ [red]The agent needs Unix domain sockets (not available on this platform)[/red]")
+        return
+
+    config = Config()
+
+    info = _ping(config)
+    if info:
+        console.print(f"ℹ️  [yellow]Agent already running (pid {info.get('pid')})[/yellow]")
+        return
+
+    args = [sys.executable, '-m', 'pucp_cli.agent', '--cache-ttl', str(cache_ttl),
+            '--idle-timeout', str(idle_timeout)]
+
+    if foreground:
+        console.print(f"⚡ Agent listening on [dim]{socket_path(config)}[/dim] (Ctrl+C to stop)")
+        subprocess.call(args)
+        return
+
+    config.config_dir.mkdir(exist_ok=True)
+    log_file = config.config_dir / "agent.log"
+    with open(log_file, 'ab') as log:
+        subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                         start_new_session=True)
+
+    # Esperar a que el socket acepte conexiones
+    for _ in range(50):
+        time.sleep(0.1)
+        info = _ping(config)
+        if info:
+            console.print(f"✅ [green]Agent started (pid {info.get('pid')})[/green]")
+            console.print(f"🔌 Socket: [dim]{socket_path(config)}[/dim]")
+            return
+
+    console.print(f"❌ [red]Agent did not start. See {log_file}[/red]")
+
+@agent.command("stop")
+def stop():
+    """Detiene el agente"""
+
+    config = Config()
+
+    if not _ping(config):
+        console.print("ℹ️  [yellow]Agent is not running[/yellow]")
+        return
+
+    AgentConnection(socket_path(config), agent_timeout(config)).call({'op': 'shutdown'})
+    console.print("✅ [green]Agent stopped[/green]")
+
+@agent.command("status")
+def status():
+    """Muestra el estado del agente"""
+
+    config = Config()
+    info = _ping(config)
+
+    if not info:
+        console.print("❌ [red]Agent is not running[/red] (commands use direct mode)")
+        console.print("💡 Run 'pucp agent start' to start it")
+        return
+
+    requests_served = info.get('requests', 0)
+    hits = info.get('cache_hits', 0)
+
+    table = Table(show_header=False, box=None)
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="white")
+
+    table.add_row("🆔 PID:", str(info.get('pid')))
+    table.add_row("⏱️  Uptime:", f"{info.get('uptime', 0):.0f}s")
+    table.add_row("📨 Requests:", str(requests_served))
+    table.add_row("🎯 Cache hits:", f"{hits} ({hits / requests_served * 100:.0f}%)" if requests_served else "0")
+    table.add_row("🗂️  Cached:", str(info.get('cache_entries', 0)))
+    table.add_row("🔌 Socket:", str(socket_path(config)))
+
+    console.print("✅ [green]Agent running[/green]")
+    console.print(table)
@@ -1,12 +1,14 @@
 """
 Comandos de autenticación
 """
+import time
 import click
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.table import Table
 from ..config import Config
 from ..api_client import PUCPAPIClient, APIException
+from ..utils.tokens import TokenManager, ValidationCache
 
 console = Console()
 
@@ -43,8 +45,10 @@ def login(username, password):
             console.print("❌ [red]Login failed: No token received[/red]")
             return
         
-        # Guardar token
+        # Guardar token (la respuesta de login sirve como validación hasta que expire)
         config.save_token(token)
+        ValidationCache(config).put(token, {'valid': True, 'user': user_info},
+                                    TokenManager(config).expires_at)
         
         # Mostrar éxito
         console.print("✅ [green]Login successful![/green]")
@@ -68,7 +72,8 @@ def login(username, password):
         console.print(f"❌ [red]Unexpected error: {e}[/red]")
 
 @auth.command()
-def status():
+@click.option('--verify', is_flag=True, help='Validar siempre contra el servidor (sin caché)')
+def status(verify):
     """Verificar estado de autenticación"""
     
     config = Config()
@@ -81,19 +86,41 @@ def status():
     
     try:
         client = PUCPAPIClient(config)
-        response = client.validate_token()
+        tokens = client.tokens
+        
+        # Token por expirar o expirado: renovarlo antes de validar
+        if tokens.needs_refresh() and client.refresh_token():
+            console.print("🔄 [dim]Token refreshed[/dim]")
+        remaining = tokens.expires_in()
+        if remaining is not None and remaining <= 0:
+            console.print("❌ [red]Token expired[/red]")
+            console.print("💡 Run 'pucp auth login' to re-authenticate "
+                          "(or set PUCP_USERNAME/PUCP_PASSWORD for automatic renewal)")
+            return
+        
+        cache = ValidationCache(config)
+        response = None if verify else cache.get(tokens.token)
+        source = "cached"
+        if response is None:
+            response = client.validate_token()
+            cache.put(tokens.token, response, tokens.expires_at)
+            source = "server"
         
         user_info = response.get('user', {})
+        token = tokens.token
         
-        console.print("✅ [green]Authenticated[/green]")
+        console.print(f"✅ [green]Authenticated[/green] [dim]({source})[/dim]")
         
         table = Table(show_header=False, box=None)
         table.add_column("Field", style="cyan")
         table.add_column("Value", style="white")
         
-        table.add_row("👤 User:", user_info.get('username', 'unknown'))
-        table.add_row("🎭 Role:", user_info.get('role', 'unknown'))
+        table.add_row("👤 User:", user_info.get('username') or tokens.username or 'unknown')
+        table.add_row("🎭 Role:", user_info.get('role') or tokens.role or 'unknown')
         table.add_row("🎫 Token:", f"{token[:20]}..." if len(token) > 20 else token)
+        if remaining is not None:
+            expires = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(tokens.expires_at))
+            table.add_row("⏳ Expires:", f"{expires} (in {_format_remaining(remaining)})")
         table.add_row("📂 Config:", str(config.config_dir))
         
         console.print(table)
@@ -104,6 +131,38 @@ def status():
     except Exception as e:
         console.print(f"❌ [red]Error checking status: {e}[/red]")
 
+def _format_remaining(seconds: float) -> str:
+    """Duración legible (2h 05m, 4m 10s)"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+@auth.command()
+def refresh():
+    """Renovar el token de sesión"""
+    
+    config = Config()
+    
+    if not config.get_token():
+        console.print("❌ [red]Not authenticated[/red]")
+        console.print("💡 Run 'pucp auth login' to authenticate")
+        return
+    
+    client = PUCPAPIClient(config)
+    if not client.refresh_token(force=True):
+        console.print("❌ [red]Token refresh failed[/red]")
+        console.print("💡 Run 'pucp auth login' to re-authenticate")
+        return
+    
+    ValidationCache(config).clear()
+    console.print("✅ [green]Token refreshed[/green]")
+    remaining = client.tokens.expires_in()
+    if remaining is not None:
+        console.print(f"⏳ Expires in {_format_remaining(remaining)}")
+
 @auth.command()
 def logout():
     """Cerrar sesión"""
@@ -116,6 +175,7 @@ def logout():
     
     try:
         config.remove_token()
+        ValidationCache(config).clear()
         console.print("✅ [green]Logged out successfully[/green]")
         console.print("🔒 Token removed from local storage")
         
@@ -0,0 +1,86 @@
+"""
+Comandos de completado de shell
+"""
+import click
+import time
+from rich.console import Console
+from rich.table import Table
+from ..config import Config
+from ..api_client import PUCPAPIClient, APIException
+from ..utils.completion import HOSTS_INDEX, SLICE_INDEX, HostIndex, load_slice_names
+from ..utils.slice_index import SliceIndex
+
+console = Console()
+
+SHELLS = ('bash', 'zsh', 'fish')
+
+@click.group()
+def completion():
+    """⌨️  Completado de shell (bash, zsh, fish)"""
+    pass
+
+@completion.command("script")
+@click.argument('shell', type=click.Choice(SHELLS))
+@click.pass_context
+def script(ctx, shell):
+    """Imprime el script de activación para SHELL
+
+    \b
+    bash:  eval "$(pucp completion script bash)"    (en ~/.bashrc)
+    zsh:   eval "$(pucp completion script zsh)"     (en ~/.zshrc)
+    fish:  pucp completion script fish > ~/.config/fish/completions/pucp.fish
+    """
+    from click.shell_completion import get_completion_class
+
+    root = ctx.find_root()
+    cls = get_completion_class(shell)
+    click.echo(cls(root.command, {}, 'pucp', '_PUCP_COMPLETE').source())
+
+@completion.command("refresh")
+@click.option('--quiet', is_flag=True, help='Sin salida (lo usa el refresco en segundo plano)')
+def refresh(quiet):
+    """Reconstruye los índices de slices y hosts que usa el completado"""
+
+    config = Config()
+    client = PUCPAPIClient(config)
+
+    try:
+        index = SliceIndex(config)
+        index.refresh(client, force=True)
+
+        data = client.resource_servers(fields=['servers'])
+        hosts = HostIndex(config)
+        hosts.update(data.get('servers', []))
+
+        if not quiet:
+            console.print(f"✅ [green]Completion index updated: {len(index.names)} slices, "
+                          f"{len(hosts.hosts)} hosts[/green]")
+
+    except APIException as e:
+        if not quiet:
+            console.print(f"❌ [red]API Error: {e}[/red]")
+
+@completion.command("status")
+def status():
+    """Muestra el contenido y la antigüedad de los índices"""
+
+    config = Config()
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Index", style="cyan")
+    table.add_column("Entries", justify="right")
+    table.add_column("Updated", style="dim")
+    table.add_column("Path", style="dim")
+
+    entries = {SLICE_INDEX: len(load_slice_names(config)), HOSTS_INDEX: len(HostIndex(config).hosts)}
+    for name, label in ((SLICE_INDEX, "Slices"), (HOSTS_INDEX, "Hosts")):
+        path = config.config_dir / name
+        if path.exists():
+            updated = f"{time.time() - path.stat().st_mtime:.0f}s ago"
+        else:
+            updated = "never"
+        table.add_row(label, str(entries[name]), updated, str(path))
+
+    console.print(table)
+    console.print("💡 [dim]Indexes are refreshed by 'slice list' and 'resource servers'; "
+                  "'pucp completion refresh' rebuilds them[/dim]")
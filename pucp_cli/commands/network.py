@@ -0,0 +1,228 @@
+"""
+Comandos de gestión de redes
+"""
+import click
+from rich.console import Console
+from rich.table import Table
+from ..config import Config
+from ..api_client import PUCPAPIClient, APIException
+from ..utils import trace
+from ..utils.completion import complete_infrastructures
+from ..utils.vlans import VLAN_MAX, VLAN_MIN, VLAN_SPACE, VlanMap, VlanRange, build_maps, parse_range
+from ..ui.output import get_format, write_records
+
+console = Console()
+
+@click.group()
+def network():
+    """🌐 Gestión de redes"""
+    pass
+
+def _parse_range(ctx, param, value):
+    try:
+        return parse_range(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+def _compress(vlan_ids) -> list:
+    """IDs ordenados → tramos consecutivos"""
+    ranges = []
+    for vlan_id in vlan_ids:
+        if ranges and ranges[-1].end == vlan_id - 1:
+            ranges[-1] = VlanRange(ranges[-1].start, vlan_id)
+        else:
+            ranges.append(VlanRange(vlan_id, vlan_id))
+    return ranges
+
+def _load_maps(client: PUCPAPIClient, infrastructure, window: VlanRange) -> dict:
+    """VlanMap por infraestructura (vacío si se pidió una sin VLANs)"""
+    data = client.network_vlans(infrastructure)
+    records = data.get('vlans', []) if isinstance(data, dict) else data or []
+    with trace.span('vlans', 'compute', detail=f"{len(records)} vlans"):
+        maps = build_maps(records, window)
+        if infrastructure:
+            maps = {infrastructure: maps.get(infrastructure) or VlanMap(infrastructure, window)}
+    return dict(sorted(maps.items()))
+
+@network.command("vlans")
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Solo esta infraestructura')
+@click.option('--range', 'window', default=f"{VLAN_MIN}-{VLAN_MAX}", show_default=True, callback=_parse_range,
+              help='Rango de VLANs asignables donde buscar libres')
+@click.option('--next', 'next_count', type=click.IntRange(min=1), help='Las N siguientes VLANs libres')
+@click.option('--from', 'start', type=click.IntRange(VLAN_MIN, VLAN_MAX), help='Buscar libres a partir de esta VLAN (con --next)')
+@click.option('--largest', is_flag=True, help='Mayor rango contiguo libre')
+@click.option('--owner', 'owner_vlan', type=click.IntRange(0, VLAN_SPACE - 1), help='Slices que tienen asignada la VLAN')
+@click.option('--blocks', is_flag=True, help='Ocupación por bloques de 256 VLANs')
+def vlans(infrastructure, window, next_count, start, largest, owner_vlan, blocks):
+    """Ocupación de VLANs: resumen, libres, mayor rango libre y titulares"""
+    
+    queries = [name for name, value in (('--next', next_count), ('--largest', largest),
+                                        ('--owner', owner_vlan is not None), ('--blocks', blocks)) if value]
+    if len(queries) > 1:
+        raise click.UsageError(f"Use only one of {', '.join(queries)}")
+    if start is not None and not next_count:
+        raise click.UsageError("--from requires --next")
+    
+    config = Config()
+    client = PUCPAPIClient(config)
+    fmt = get_format()
+    
+    try:
+        maps = _load_maps(client, infrastructure, window)
+    
+        if not maps:
+            if fmt != 'table':
+                write_records([], fmt)
+            else:
+                console.print("📋 [yellow]No VLANs allocated[/yellow]")
+            return
+    
+        if next_count:
+            _next_free(maps, next_count, start, fmt)
+        elif largest:
+            _largest_free(maps, fmt)
+        elif owner_vlan is not None:
+            _owner(maps, owner_vlan, fmt)
+        elif blocks:
+            _blocks(maps, fmt)
+        else:
+            _summary(maps, window, fmt)
+    
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+
+def _next_free(maps: dict, count: int, start, fmt: str):
+    """Siguientes `count` VLANs libres de cada infraestructura"""
+    found = {name: vlan_map.next_free(count, start) for name, vlan_map in maps.items()}
+    
+    if fmt != 'table':
+        write_records([{'infrastructure': name, 'vlan_id': vlan_id}
+                       for name, ids in found.items() for vlan_id in ids], fmt)
+        return
+    
+    for name, ids in found.items():
+        if not ids:
+            console.print(f"❌ [red]No free VLANs in {name}[/red]")
+            continue
+        note = f" [yellow](only {len(ids)} available)[/yellow]" if len(ids) < count else ""
+        ranges = ', '.join(str(r) for r in _compress(ids))
+        console.print(f"🆓 [bold]{name}[/bold]: {ranges}{note}")
+
+def _largest_free(maps: dict, fmt: str):
+    """Mayor tramo libre de cada infraestructura"""
+    records = []
+    for name, vlan_map in maps.items():
+        best = vlan_map.largest_free()
+        records.append({'infrastructure': name,
+                        'start': best.start if best else None,
+                        'end': best.end if best else None,
+                        'size': best.size if best else 0})
+    
+    if fmt != 'table':
+        write_records(records, fmt)
+        return
+    
+    table = Table(show_header=True, header_style="bold magenta", title="📏 Largest free VLAN range")
+    table.add_column("Infrastructure", style="cyan")
+    table.add_column("Range", style="green")
+    table.add_column("Size", justify="right")
+    for record in records:
+        span = f"{record['start']}-{record['end']}" if record['size'] else "[red]none[/red]"
+        table.add_row(record['infrastructure'], span, str(record['size']))
+    console.print(table)
+
+def _owner(maps: dict, vlan_id: int, fmt: str):
+    """Slices que tienen la VLAN en cada infraestructura"""
+    records = [{'infrastructure': name, 'vlan_id': vlan_id,
+                'slice_id': holder.get('slice_id'), 'slice_name': holder.get('slice_name')}
+               for name, vlan_map in maps.items() for holder in vlan_map.holders(vlan_id)]
+    
+    if fmt != 'table':
+        write_records(records, fmt)
+        return
+    
+    if not records:
+        console.print(f"🆓 [green]VLAN {vlan_id} is free[/green]")
+        return
+    
+    table = Table(show_header=True, header_style="bold magenta", title=f"🔎 VLAN {vlan_id}")
+    table.add_column("Infrastructure", style="cyan")
+    table.add_column("Slice", style="green")
+    table.add_column("Slice ID", style="dim")
+    for record in records:
+        table.add_row(record['infrastructure'], str(record['slice_name'] or '-'), str(record['slice_id'] or '-'))
+    console.print(table)
+    
+    shared = [name for name, vlan_map in maps.items() if len(vlan_map.holders(vlan_id)) > 1]
+    if shared:
+        console.print(f"⚠️  [yellow]VLAN {vlan_id} is assigned to several slices in {', '.join(shared)}[/yellow]")
+
+def _blocks(maps: dict, fmt: str):
+    """Ocupación por bloques de VLANs"""
+    records = []
+    for name, vlan_map in maps.items():
+        for block, allocated in vlan_map.blocks():
+            records.append({'infrastructure': name, 'start': block.start, 'end': block.end,
+                            'allocated': allocated,
+                            'occupancy_pct': round(allocated * 100 / block.size, 1)})
+    
+    if fmt != 'table':
+        write_records(records, fmt)
+        return
+    
+    table = Table(show_header=True, header_style="bold magenta", title="🧱 VLAN occupancy by block")
+    table.add_column("Infrastructure", style="cyan")
+    table.add_column("Block")
+    table.add_column("Allocated", justify="right")
+    table.add_column("Occupancy", justify="right")
+    for record in records:
+        pct = record['occupancy_pct']
+        color = "red" if pct >= 90 else "yellow" if pct >= 70 else "green"
+        table.add_row(record['infrastructure'], f"{record['start']}-{record['end']}",
+                      str(record['allocated']), f"[{color}]{pct:.1f}%[/{color}]")
+    console.print(table)
+
+def _summary(maps: dict, window: VlanRange, fmt: str):
+    """Resumen de ocupación por infraestructura"""
+    records = []
+    for name, vlan_map in maps.items():
+        best = vlan_map.largest_free()
+        free = vlan_map.free
+        records.append({
+            'infrastructure': name,
+            'allocated': vlan_map.allocated,
+            'free': free,
+            'occupancy_pct': round((window.size - free) * 100 / window.size, 1),
+            'free_ranges': len(vlan_map.free_ranges()),
+            'largest_free': str(best) if best else None,
+            'largest_free_size': best.size if best else 0,
+            'conflicts': len(vlan_map.conflicts()),
+        })
+    
+    if fmt != 'table':
+        write_records(records, fmt)
+        return
+    
+    table = Table(show_header=True, header_style="bold magenta", title=f"🌐 VLAN occupancy ({window})")
+    table.add_column("Infrastructure", style="cyan", no_wrap=True)
+    table.add_column("Used", justify="right")
+    table.add_column("Free", justify="right", style="green")
+    table.add_column("Used %", justify="right")
+    table.add_column("Gaps", justify="right")
+    table.add_column("Largest free", style="green", no_wrap=True)
+    table.add_column("Conflicts", justify="right")
+    for record in records:
+        pct = record['occupancy_pct']
+        color = "red" if pct >= 90 else "yellow" if pct >= 70 else "green"
+        conflicts = record['conflicts']
+        table.add_row(record['infrastructure'], str(record['allocated']), str(record['free']),
+                      f"[{color}]{pct:.1f}%[/{color}]", str(record['free_ranges']),
+                      f"{record['largest_free'] or '-'} ({record['largest_free_size']})",
+                      f"[red]{conflicts}[/red]" if conflicts else "0")
+    console.print(table)
+    
+    if any(record['conflicts'] for record in records):
+        examples = {name: vlan_map.conflicts()[:5] for name, vlan_map in maps.items() if vlan_map.conflicts()}
+        listed = '; '.join(f"{name}: {', '.join(map(str, ids))}" for name, ids in examples.items())
+        console.print(f"⚠️  [yellow]VLANs assigned to several slices ({listed}...). "
+                      f"Use --owner VLAN to see who holds them[/yellow]")
@@ -8,9 +8,24 @@ from rich.progress import track
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.bar import Bar
+from rich.console import Group
+from rich.live import Live
+from rich.markup import escape
+from rich.text import Text
+import threading
 import time
+from pathlib import Path
 from ..config import Config
 from ..api_client import PUCPAPIClient, APIException
+from ..utils import trace
+from ..utils.columnar import ServerFrame, parse_where
+from ..utils.completion import (HostIndex, complete_hosts, complete_infrastructures, complete_zones,
+                                in_background)
+from ..utils.timeseries import (UtilisationLog, auto_bucket, capacity_for, default_history_path, downsample,
+                                parse_duration, parse_size)
+from ..ui.keyboard import raw_keys
+from ..ui.output import get_format, write_records
+from ..ui.table import Column, StreamTable, page_summary, paginate
 
 console = Console()
 
@@ -19,190 +34,524 @@ def resource():
     """📊 Gestión de recursos"""
     pass
 
+SERVER_FIELDS = ['hostname', 'infrastructure', 'zone_name', 'used_vcpus', 'total_vcpus',
+                 'used_ram', 'total_ram', 'active_vms', 'status']
+
+SORT_FIELDS = ['hostname', 'cpu', 'ram', 'vms', 'zone', 'infrastructure', 'status']
+
+# Filas por página de --page cuando no se indica --limit
+DEFAULT_PAGE_LIMIT = 100
+
+SERVER_COLUMNS = [
+    Column("Server", style="cyan", max_width=30),
+    Column("Infrastructure", style="blue"),
+    Column("Zone", style="green", max_width=20),
+    Column("CPU Usage"),
+    Column("RAM Usage"),
+    Column("Status"),
+]
+
+# Barras y celdas precalculadas: una fila solo concatena números
+_BAR_STEPS = 20
+_CPU_BARS = [(('█' * i, "cyan"), ('░' * (_BAR_STEPS - i), '')) for i in range(_BAR_STEPS + 1)]
+_RAM_BARS = [(('█' * i, "yellow"), ('░' * (_BAR_STEPS - i), '')) for i in range(_BAR_STEPS + 1)]
+_SERVER_STATUS = {'active': (("🟢 UP", "green"),)}
+_SERVER_DOWN = (("🔴 DOWN", "red"),)
+_INFRA_LABELS = {'linux': "🐧 linux", 'openstack': "☁️ openstack"}
+
+def _bar_step(percent) -> int:
+    return min(max(int(percent / 5), 0), _BAR_STEPS)
+
+def _server_row(hostname, infra, zone, cpu_used, cpu_total, cpu_percent,
+                ram_used, ram_total, ram_percent, status) -> tuple:
+    """Celdas de un servidor para la tabla"""
+    filled, empty = _CPU_BARS[_bar_step(cpu_percent)]
+    cpu_cell = (filled, (f"{empty[0]} {cpu_used:g}/{cpu_total:g}", ''))
+    filled, empty = _RAM_BARS[_bar_step(ram_percent)]
+    ram_cell = (filled, (f"{empty[0]} {ram_used / 1024:.1f}/{ram_total / 1024:.1f}GB", ''))
+    return (
+        hostname or 'N/A',
+        _INFRA_LABELS.get(infra, infra or 'unknown'),
+        zone or 'N/A',
+        cpu_cell,
+        ram_cell,
+        _SERVER_STATUS.get(status, _SERVER_DOWN),
+    )
+
+def _parse_where(ctx, param, values):
+    """Convierte cada --where en una condición"""
+    try:
+        return [parse_where(value) for value in values]
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
 @resource.command("servers")
-@click.option('--infrastructure', help='Filtrar por infraestructura')
-def list_servers(infrastructure):
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Filtrar por infraestructura')
+@click.option('--sort', 'sort_by', type=click.Choice(SORT_FIELDS), help='Ordenar por campo (cpu/ram/vms descendente)')
+@click.option('--asc/--desc', 'ascending', default=None, help='Forzar orden ascendente o descendente')
+@click.option('--top', type=click.IntRange(min=1), help='Mostrar solo los N primeros (por defecto ordena por cpu)')
+@click.option('--where', 'conditions', multiple=True, callback=_parse_where,
+              help="Filtro FIELD OP VALUE, repetible (p. ej. 'cpu>80', 'zone=zone-1', 'hostname=gpu-*')")
+@click.option('--group-by', type=click.Choice(['infrastructure', 'zone']), default='infrastructure',
+              show_default=True, help='Agrupación de las estadísticas')
+@click.option('--stats', 'stats_only', is_flag=True, help='Mostrar solo las estadísticas agregadas')
+@click.option('--limit', type=click.IntRange(min=1), help='Mostrar como máximo N servidores en la tabla')
+@click.option('--page', default=1, type=click.IntRange(min=1), help='Página de --limit servidores a mostrar (desde 1; sin --limit, páginas de 100)')
+def list_servers(infrastructure, sort_by, ascending, top, conditions, group_by, stats_only, limit, page):
     """Lista servidores y su estado"""
     
     config = Config()
     client = PUCPAPIClient(config)
+    fmt = get_format()
     
     try:
         # Obtener recursos
-        params = {}
-        if infrastructure:
-            params['infrastructure'] = infrastructure
+        data = client.resource_servers(infrastructure, fields=['servers'])
+        servers = data.get('servers', [])
+        in_background(HostIndex(config).update, servers, complete=not infrastructure)
         
-        url = f"{config.slice_service}/resources"
-        if params:
-            url += "?" + "&".join([f"{k}={v}" for k, v in params.items()])
+        # Filtros, orden y agregados sobre columnas en lugar de dicts fila a fila
+        with trace.span('columnar', 'compute', detail=f"{len(servers)} servers"):
+            frame = ServerFrame.from_records(servers).filter(conditions)
+            if top and not sort_by:
+                sort_by = 'cpu'
+            if sort_by:
+                descending = sort_by in ('cpu', 'ram', 'vms') if ascending is None else not ascending
+                frame = frame.sort(sort_by, descending=descending)
+            # Las estadísticas cubren todos los servidores filtrados, no solo el top
+            stats = frame.aggregate(group_by)
+            if top:
+                frame = frame.head(top)
         
-        response = client.session.get(url, timeout=30)
-        if response.status_code != 200:
-            raise APIException(f"HTTP {response.status_code}")
+        if fmt != 'table':
+            with trace.span('output', 'render', detail=fmt):
+                if stats_only:
+                    write_records(stats, fmt)
+                else:
+                    write_records(frame.originals(servers), fmt, SERVER_FIELDS)
+            return
         
-        data = response.json()
-        servers = data.get('servers', [])
+        if stats_only:
+            _print_server_stats(stats, group_by)
+            return
         
-        if not servers:
+        if not len(frame):
             console.print("📋 [yellow]No servers found[/yellow]")
             return
         
-        # Crear tabla
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Server", style="cyan", width=15)
-        table.add_column("Infrastructure", style="blue", width=12)
-        table.add_column("Zone", style="green", width=15)
-        table.add_column("CPU Usage", width=20)
-        table.add_column("RAM Usage", width=20)
-        table.add_column("Status", width=10)
-        
-        for server in servers:
-            # CPU bar
-            cpu_used = server.get('used_vcpus', 0)
-            cpu_total = server.get('total_vcpus', 1)
-            cpu_percent = (cpu_used / cpu_total) * 100 if cpu_total > 0 else 0
-            cpu_bar = f"[cyan]{'█' * int(cpu_percent/5)}[/cyan]{'░' * (20-int(cpu_percent/5))} {cpu_used}/{cpu_total}"
-            
-            # RAM bar
-            ram_used = server.get('used_ram', 0)
-            ram_total = server.get('total_ram', 1)
-            ram_percent = (ram_used / ram_total) * 100 if ram_total > 0 else 0
-            ram_gb_used = ram_used / 1024
-            ram_gb_total = ram_total / 1024
-            ram_bar = f"[yellow]{'█' * int(ram_percent/5)}[/yellow]{'░' * (20-int(ram_percent/5))} {ram_gb_used:.1f}/{ram_gb_total:.1f}GB"
-            
-            # Status
-            status = server.get('status', 'unknown')
-            if status == 'active':
-                status_display = "[green]🟢 UP[/green]"
-            else:
-                status_display = "[red]🔴 DOWN[/red]"
-            
-            # Infraestructura con emoji
-            infra = server.get('infrastructure', 'unknown')
-            if infra == 'linux':
-                infra_display = "🐧 linux"
-            elif infra == 'openstack':
-                infra_display = "☁️ openstack"
-            else:
-                infra_display = infra
-            
-            table.add_row(
-                server.get('hostname', 'N/A'),
-                infra_display,
-                server.get('zone_name', 'N/A'),
-                cpu_bar,
-                ram_bar,
-                status_display
-            )
+        if page > 1 and not limit:
+            limit = DEFAULT_PAGE_LIMIT
+        rows = frame.rows(('hostname', 'infrastructure', 'zone_name', 'used_vcpus', 'total_vcpus',
+                           'cpu_pct', 'used_ram', 'total_ram', 'ram_pct', 'status'))
         
-        console.print(f"\n📊 [bold]PUCP Servers ({len(servers)} found)[/bold]\n")
-        console.print(table)
+        shown = f"{len(frame)} of {len(servers)}" if len(frame) != len(servers) else str(len(servers))
+        console.print(f"\n📊 [bold]PUCP Servers ({shown} found)[/bold]\n")
+        with trace.span('table', 'render') as span:
+            written = StreamTable(SERVER_COLUMNS, console).write(
+                _server_row(*row) for row in paginate(rows, page, limit))
+            span.set(detail=f"{written} rows")
         console.print()
+        summary = page_summary(page, limit, written, len(frame), 'servers')
+        if summary:
+            console.print(summary)
         
-        # Estadísticas globales
-        stats = data.get('statistics', {})
-        if stats:
-            console.print("🔢 [bold]Resource Statistics[/bold]")
-            for infra, stat in stats.items():
-                cpu_util = stat.get('cpu_utilization', 0)
-                ram_util = stat.get('ram_utilization', 0)
-                console.print(f"  {infra}: CPU {cpu_util:.1f}% | RAM {ram_util:.1f}% | {stat.get('active_servers', 0)}/{stat.get('total_servers', 0)} servers")
+        _print_server_stats(stats, group_by)
         
     except APIException as e:
         console.print(f"❌ [red]API Error: {e}[/red]")
     except Exception as e:
         console.print(f"❌ [red]Error: {e}[/red]")
 
+def _print_server_stats(stats, group_by: str):
+    """Tabla de agregados por infraestructura o zona"""
+    
+    if not stats:
+        return
+    
+    key = 'zone_name' if group_by == 'zone' else group_by
+    
+    table = Table(show_header=True, header_style="bold magenta", title="🔢 Resource Statistics")
+    table.add_column(group_by.capitalize(), style="cyan")
+    table.add_column("Servers", justify="right")
+    table.add_column("vCPUs", justify="right")
+    table.add_column("CPU %", justify="right")
+    table.add_column("CPU mean", justify="right")
+    table.add_column("CPU p95", justify="right")
+    table.add_column("RAM (GB)", justify="right")
+    table.add_column("RAM %", justify="right")
+    table.add_column("RAM mean", justify="right")
+    table.add_column("RAM p95", justify="right")
+    table.add_column("VMs", justify="right")
+    
+    for stat in stats:
+        table.add_row(
+            stat[key] or 'N/A',
+            f"{stat['active_servers']}/{stat['servers']}",
+            f"{stat['used_vcpus']}/{stat['total_vcpus']}",
+            f"{stat['cpu_utilization']:.1f}%",
+            f"{stat['cpu_mean']:.1f}%",
+            f"{stat['cpu_p95']:.1f}%",
+            f"{stat['used_ram'] / 1024:.0f}/{stat['total_ram'] / 1024:.0f}",
+            f"{stat['ram_utilization']:.1f}%",
+            f"{stat['ram_mean']:.1f}%",
+            f"{stat['ram_p95']:.1f}%",
+            str(stat['active_vms']),
+        )
+    
+    console.print(table)
+
+# Criterios de orden del dashboard: nombre → (clave, descendente por defecto)
+_DASHBOARD_SORTS = {
+    'hostname': (lambda s: s.get('hostname') or '', False),
+    'cpu': (lambda s: s.get('used_vcpus', 0) / s['total_vcpus'] if s.get('total_vcpus') else 0, True),
+    'ram': (lambda s: s.get('used_ram', 0) / s['total_ram'] if s.get('total_ram') else 0, True),
+    'vms': (lambda s: s.get('active_vms', 0), True),
+    'status': (lambda s: s.get('status') == 'active', False),
+}
+
+_DASHBOARD_ROW_FIELDS = ('hostname', 'infrastructure', 'used_vcpus', 'total_vcpus',
+                         'used_ram', 'total_ram', 'active_vms', 'status')
+
+# Lo único que pinta el dashboard de /resources
+_DASHBOARD_FIELDS = ['servers', 'statistics']
+
+class _DashboardState:
+    """Estado compartido entre el hilo de descarga y el bucle de render"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = None
+        self.version = 0
+        self.updated_at = None
+        self.error = None
+
+def _dashboard_fetcher(client: PUCPAPIClient, state: _DashboardState, refresh: float,
+                       stop: threading.Event, infrastructure: str = None):
+    """Descarga /resources con GET condicional cada `refresh` segundos"""
+    # Con caché, el primer frame sale de la última copia y se revalida enseguida
+    data, validators = client.resources_cached(infrastructure, _DASHBOARD_FIELDS)
+    if data is not None:
+        with state.lock:
+            state.data = data
+            state.version += 1
+    validators = validators or None
+    
+    while not stop.is_set():
+        try:
+            data, validators = client.resources_if_changed(validators, infrastructure, _DASHBOARD_FIELDS)
+            with state.lock:
+                if data is not None:
+                    state.data = data
+                    state.version += 1
+                state.updated_at = time.time()
+                state.error = None
+        except Exception as e:
+            with state.lock:
+                state.error = str(e)
+        stop.wait(refresh)
+
+def _dashboard_row(server: dict, cache: dict) -> tuple:
+    """Celdas de una fila; solo se recalculan si el servidor cambió"""
+    key = tuple(server.get(f) for f in _DASHBOARD_ROW_FIELDS)
+    cached = cache.get(key[0])
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    cpu_used = server.get('used_vcpus', 0)
+    cpu_total = server.get('total_vcpus', 1)
+    cpu_percent = (cpu_used / cpu_total) * 100 if cpu_total > 0 else 0
+    
+    ram_total_mb = server.get('total_ram', 1)
+    ram_used = server.get('used_ram', 0) / 1024
+    ram_percent = (server.get('used_ram', 0) / ram_total_mb) * 100 if ram_total_mb > 0 else 0
+    
+    row = (
+        server.get('hostname', 'N/A'),
+        "🐧" if server.get('infrastructure') == 'linux' else "☁️",
+        f"{cpu_percent:.0f}% ({cpu_used}/{cpu_total})",
+        f"{ram_percent:.0f}% ({ram_used:.1f}G)",
+        str(server.get('active_vms', 0)),
+        "🟢" if server.get('status') == 'active' else "🔴",
+    )
+    cache[key[0]] = (key, row)
+    return row
+
+def _render_dashboard(data, servers, offset, rows, sort, descending, refresh, updated_at,
+                      error, row_cache):
+    """Construye el frame completo del dashboard"""
+    parts = []
+    age = f"{time.time() - updated_at:.0f}s ago" if updated_at else "loading..."
+    parts.append(Text.from_markup(
+        "📊 [bold blue]PUCP Cloud Orchestrator - Resource Dashboard[/bold blue]\n"
+        f"🔄 Auto-refresh: {refresh}s | {time.strftime('%H:%M:%S')} | updated {age}\n"
+    ))
+    if error:
+        parts.append(Text.from_markup(f"❌ [red]Error fetching data: {escape(error)}[/red]\n"))
+    
+    # Statistics cards
+    cards = []
+    for infra, stat in (data or {}).get('statistics', {}).items():
+        cpu_util = stat.get('cpu_utilization', 0)
+        ram_util = stat.get('ram_utilization', 0)
+        active = stat.get('active_servers', 0)
+        total = stat.get('total_servers', 0)
+        
+        status_emoji = "🟢" if active == total else "🟡" if active > 0 else "🔴"
+        
+        card_content = f"""[bold]{infra.title()}[/bold]
+{status_emoji} {active}/{total} servers
+🔧 CPU: {cpu_util:.1f}%
+🧠 RAM: {ram_util:.1f}%"""
+        
+        cards.append(Panel(card_content, border_style="blue"))
+    
+    if cards:
+        parts.append(Columns(cards))
+    
+    # Server table (solo la ventana visible)
+    if servers:
+        arrow = "↓" if descending else "↑"
+        last = min(offset + rows, len(servers))
+        table = Table(show_header=True, header_style="bold magenta",
+                      title=f"Server Status ({offset + 1}-{last} of {len(servers)}, sort: {sort} {arrow})")
+        table.add_column("Server", style="cyan")
+        table.add_column("Infra", style="blue")
+        table.add_column("CPU", width=15)
+        table.add_column("RAM", width=15)
+        table.add_column("VMs", style="green")
+        table.add_column("Status")
+        
+        for server in servers[offset:last]:
+            table.add_row(*_dashboard_row(server, row_cache))
+        
+        parts.append(table)
+    
+    parts.append(Text.from_markup(
+        "\n[dim]↑/↓ j/k scroll | PgUp/PgDn | s sort | r reverse | q quit[/dim]"
+    ))
+    return Group(*parts)
+
 @resource.command("dashboard")
 @click.option('--refresh', default=5, help='Intervalo de refresco en segundos')
-def dashboard(refresh):
+@click.option('--sort', type=click.Choice(list(_DASHBOARD_SORTS)), default='hostname', help='Orden inicial de servidores')
+@click.option('--rows', type=int, help='Filas visibles (por defecto según la terminal)')
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Filtrar por infraestructura')
+def dashboard(refresh, sort, rows, infrastructure):
     """Dashboard interactivo de recursos"""
     
-    console.print("📊 [bold]PUCP Resource Dashboard[/bold]")
-    console.print("Press Ctrl+C to exit\n")
+    config = Config()
+    client = PUCPAPIClient(config)  # Una sola sesión para todo el dashboard
+    
+    state = _DashboardState()
+    stop = threading.Event()
+    fetcher = threading.Thread(target=_dashboard_fetcher, daemon=True,
+                               args=(client, state, refresh, stop, infrastructure))
+    fetcher.start()
+    
+    sort_names = list(_DASHBOARD_SORTS)
+    descending = _DASHBOARD_SORTS[sort][1]
+    offset = 0
+    row_cache = {}
+    ordered, ordered_key = [], None
     
     try:
-        while True:
-            with console.screen():
-                config = Config()
-                client = PUCPAPIClient(config)
+        with raw_keys() as read_key, Live(console=console, screen=True, auto_refresh=False) as live:
+            while True:
+                with state.lock:
+                    data, version = state.data, state.version
+                    updated_at, error = state.updated_at, state.error
                 
-                try:
-                    # Obtener datos
-                    response = client.session.get(f"{config.slice_service}/resources", timeout=10)
-                    data = response.json()
-                    
-                    servers = data.get('servers', [])
-                    stats = data.get('statistics', {})
-                    
-                    # Header
-                    console.print("📊 [bold blue]PUCP Cloud Orchestrator - Resource Dashboard[/bold blue]")
-                    console.print(f"🔄 Auto-refresh: {refresh}s | {time.strftime('%H:%M:%S')}\n")
-                    
-                    # Statistics cards
-                    cards = []
-                    for infra, stat in stats.items():
-                        cpu_util = stat.get('cpu_utilization', 0)
-                        ram_util = stat.get('ram_utilization', 0)
-                        active = stat.get('active_servers', 0)
-                        total = stat.get('total_servers', 0)
-                        
-                        status_emoji = "🟢" if active == total else "🟡" if active > 0 else "🔴"
-                        
-                        card_content = f"""[bold]{infra.title()}[/bold]
-{status_emoji} {active}/{total} servers
-🔧 CPU: {cpu_util:.1f}%
-🧠 RAM: {ram_util:.1f}%"""
-                        
-                        cards.append(Panel(card_content, border_style="blue"))
-                    
-                    if cards:
-                        console.print(Columns(cards))
-                        console.print()
-                    
-                    # Server table
-                    if servers:
-                        table = Table(show_header=True, header_style="bold magenta", title="Server Status")
-                        table.add_column("Server", style="cyan")
-                        table.add_column("Infra", style="blue")
-                        table.add_column("CPU", width=15)
-                        table.add_column("RAM", width=15)
-                        table.add_column("VMs", style="green")
-                        table.add_column("Status")
-                        
-                        for server in servers[:10]:  # Mostrar solo primeros 10
-                            cpu_used = server.get('used_vcpus', 0)
-                            cpu_total = server.get('total_vcpus', 1)
-                            cpu_percent = (cpu_used / cpu_total) * 100 if cpu_total > 0 else 0
-                            
-                            ram_used = server.get('used_ram', 0) / 1024
-                            ram_total = server.get('total_ram', 1) / 1024
-                            ram_percent = (ram_used * 1024 / server.get('total_ram', 1)) * 100 if server.get('total_ram', 1) > 0 else 0
-                            
-                            status = "🟢" if server.get('status') == 'active' else "🔴"
-                            
-                            table.add_row(
-                                server.get('hostname', 'N/A'),
-                                "🐧" if server.get('infrastructure') == 'linux' else "☁️",
-                                f"{cpu_percent:.0f}% ({cpu_used}/{cpu_total})",
-                                f"{ram_percent:.0f}% ({ram_used:.1f}G)",
-                                str(server.get('active_vms', 0)),
-                                status
-                            )
-                        
-                        console.print(table)
-                    
-                    console.print(f"\n[dim]Press Ctrl+C to exit | Refreshing every {refresh}s[/dim]")
-                    
-                except Exception as e:
-                    console.print(f"❌ [red]Error fetching data: {e}[/red]")
+                # Reordenar solo si llegaron datos nuevos o cambió el criterio
+                if (version, sort, descending) != ordered_key:
+                    key_fn = _DASHBOARD_SORTS[sort][0]
+                    ordered = sorted((data or {}).get('servers', []), key=key_fn, reverse=descending)
+                    ordered_key = (version, sort, descending)
+                    live_hosts = {s.get('hostname') for s in ordered}
+                    for host in list(row_cache):
+                        if host not in live_hosts:
+                            del row_cache[host]
                 
-                time.sleep(refresh)
+                visible = rows or max(5, console.size.height - (21 if (data or {}).get('statistics') else 13))
+                offset = max(0, min(offset, len(ordered) - visible))
+                
+                live.update(_render_dashboard(data, ordered, offset, visible, sort, descending,
+                                              refresh, updated_at, error, row_cache), refresh=True)
+                
+                key = read_key(1.0)
+                if key in ('q', 'Q'):
+                    break
+                elif key in ('down', 'j'):
+                    offset += 1
+                elif key in ('up', 'k'):
+                    offset -= 1
+                elif key in ('pgdown', ' '):
+                    offset += visible
+                elif key in ('pgup', 'b'):
+                    offset -= visible
+                elif key in ('home', 'g'):
+                    offset = 0
+                elif key in ('end', 'G'):
+                    offset = len(ordered)
+                elif key == 's':
+                    sort = sort_names[(sort_names.index(sort) + 1) % len(sort_names)]
+                    descending = _DASHBOARD_SORTS[sort][1]
+                elif key == 'r':
+                    descending = not descending
+                offset = max(0, offset)
                 
     except KeyboardInterrupt:
-        console.print("\n👋 Dashboard closed")
+        pass
+    finally:
+        stop.set()
+    
+    console.print("\n👋 Dashboard closed")
+
+def _history_file(config: Config, history_file) -> Path:
+    return Path(history_file) if history_file else default_history_path(config)
+
+@resource.command("record")
+@click.option('--interval', default=60.0, type=click.FloatRange(min=1), help='Segundos entre muestras')
+@click.option('--count', type=click.IntRange(min=1), help='Parar tras N muestras (por defecto, hasta Ctrl+C)')
+@click.option('--max-size', default='64M', show_default=True, help='Tamaño máximo del histórico en disco')
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Registrar solo una infraestructura')
+@click.option('--file', 'history_file', type=click.Path(dir_okay=False), help='Archivo de histórico')
+@click.option('--reset', is_flag=True, help='Vaciar el histórico antes de empezar')
+@click.pass_context
+def record(ctx, interval, count, max_size, infrastructure, history_file, reset):
+    """Registra la utilización de los servidores en un histórico local"""
+    
+    config = Config()
+    client = PUCPAPIClient(config)
+    path = _history_file(config, history_file)
+    
+    try:
+        max_bytes = parse_size(max_size)
+        existed = path.exists() and not reset
+        log = UtilisationLog.create(path, max_bytes) if reset else UtilisationLog.open(path, True, max_bytes)
+    except ValueError as e:
+        console.print(f"❌ [red]{e}[/red]")
+        return
+    
+    # El tamaño se fija al crear el archivo: --max-size no cambia uno existente
+    explicit = ctx.get_parameter_source('max_size') != click.core.ParameterSource.DEFAULT
+    if existed and explicit and log.capacity != capacity_for(max_bytes):
+        console.print(f"⚠️  [yellow]{path} already exists with room for {log.capacity:,} samples; "
+                      f"--max-size {max_size} is ignored. Add --reset to recreate it (discards history)[/yellow]")
+    
+    console.print(f"📼 Recording to [dim]{path}[/dim] every {interval:g}s (Ctrl+C to stop)")
+    console.print(f"   Capacity: {log.capacity:,} samples (oldest are overwritten)")
+    
+    validators = None
+    data = None
+    taken = 0
+    
+    with log:
+        try:
+            while True:
+                started = time.time()
+                try:
+                    # Con 304 se repite la última muestra: el estado no cambió
+                    fresh, validators = client.resources_if_changed(validators, infrastructure, ['servers'])
+                    if fresh is not None:
+                        data = fresh
+                    written = log.append(data.get('servers', []), ts=started) if data else 0
+                    taken += 1
+                    if taken == 1 and written:
+                        hours = log.capacity / written * interval / 3600
+                        console.print(f"   Retention: ~{hours:,.1f} h for {written} servers")
+                    console.print(f"  {time.strftime('%H:%M:%S')}  {written} servers"
+                                  f"{'' if fresh is not None else ' (unchanged)'}  "
+                                  f"[dim]{len(log):,}/{log.capacity:,} samples stored[/dim]")
+                except APIException as e:
+                    console.print(f"  {time.strftime('%H:%M:%S')}  ❌ [red]API Error: {e}[/red]")
+                
+                if count and taken >= count:
+                    break
+                time.sleep(max(0.0, interval - (time.time() - started)))
+        except KeyboardInterrupt:
+            pass
+        log.flush()
+    
+    console.print(f"✅ [green]{taken} snapshots recorded[/green]")
+
+def _parse_bucket(ctx, param, value):
+    """--bucket en segundos (debe ser positivo: es el divisor de la agregación)"""
+    if value is None:
+        return None
+    try:
+        step = parse_duration(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if step <= 0:
+        raise click.BadParameter(f"must be greater than zero, got '{value}'")
+    return step
+
+@resource.command("history")
+@click.option('--since', default='6h', show_default=True, help='Desde hace cuánto (30m, 6h, 2d)')
+@click.option('--until', help='Hasta hace cuánto (por defecto, ahora)')
+@click.option('--bucket', callback=_parse_bucket, help='Intervalo de agregación (5m, 1h); por defecto ~60 filas')
+@click.option('--zone', shell_complete=complete_zones, help='Filtrar por zona')
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Filtrar por infraestructura')
+@click.option('--host', shell_complete=complete_hosts, help='Filtrar por hostname (admite comodines)')
+@click.option('--percentiles', default='50,95', show_default=True, help='Percentiles por intervalo')
+@click.option('--file', 'history_file', type=click.Path(dir_okay=False), help='Archivo de histórico')
+def history(since, until, bucket, zone, infrastructure, host, percentiles, history_file):
+    """Consulta el histórico de utilización (rango, agregación y percentiles)"""
+    
+    config = Config()
+    path = _history_file(config, history_file)
+    fmt = get_format()
+    
+    try:
+        now = time.time()
+        start = now - parse_duration(since)
+        end = now - parse_duration(until) if until else now + 1
+        pcts = [float(p) for p in percentiles.split(',') if p.strip()]
+        
+        with UtilisationLog.open(path) as log:
+            if not len(log):
+                console.print("📋 [yellow]History is empty. Run 'pucp resource record' first[/yellow]")
+                return
+            
+            step = bucket or auto_bucket(end - start)
+            host_ids = log.select_hosts(host, zone, infrastructure)
+            # Solo se leen los registros del rango (búsqueda binaria sobre el mmap)
+            with trace.span('history', 'compute', detail=f"{len(log)} samples"):
+                rows = downsample(log.samples(start, end, host_ids), step, pcts)
+    except (ValueError, FileNotFoundError) as e:
+        console.print(f"❌ [red]{e}[/red]")
+        return
+    
+    if fmt != 'table':
+        write_records(rows, fmt)
+        return
+    
+    if not rows:
+        console.print("📋 [yellow]No samples in that range[/yellow]")
+        return
+    
+    filters = ', '.join(f"{k}={v}" for k, v in (('zone', zone), ('infrastructure', infrastructure), ('host', host)) if v)
+    table = Table(show_header=True, header_style="bold magenta",
+                  title=f"📈 Utilisation every {step:g}s{f' ({filters})' if filters else ''}")
+    table.add_column("Time", style="cyan", no_wrap=True)
+    table.add_column("Servers", justify="right")
+    for metric in ('CPU', 'RAM'):
+        table.add_column(f"{metric} %", justify="right", style="bold")
+        for pct in pcts:
+            table.add_column(f"{metric} p{pct:g}", justify="right")
+        table.add_column(f"{metric} max", justify="right")
+    
+    for row in rows:
+        # MM-DD HH:MM (con segundos si el intervalo es menor a un minuto)
+        stamp = row['time'][5:19 if step < 60 else 16].replace('T', ' ')
+        cells = [stamp, str(row['servers'])]
+        for metric in ('cpu', 'ram'):
+            cells.append(f"{row[f'{metric}_utilization']:.1f}")
+            cells.extend(f"{row[f'{metric}_p{pct:g}']:.1f}" for pct in pcts)
+            cells.append(f"{row[f'{metric}_max']:.1f}")
+        table.add_row(*cells)
+    
+    console.print(table)
 
 @resource.command("flavors")
 def list_flavors():
@@ -212,8 +561,7 @@ def list_flavors():
     client = PUCPAPIClient(config)
     
     try:
-        response = client.session.get(f"{config.slice_service}/resources", timeout=10)
-        data = response.json()
+        data = client.resource_servers(fields=['vm_flavors'])
         
         flavors = data.get('vm_flavors', {})
         
@@ -241,5 +589,7 @@ def list_flavors():
         console.print(table)
         console.print()
         
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
     except Exception as e:
         console.print(f"❌ [red]Error: {e}[/red]")
\ No newline at end of file
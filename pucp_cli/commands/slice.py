@@ -9,10 +9,21 @@ from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich.text import Text
 import time
-import json
-from typing import Dict, List
+import fnmatch
+import itertools
+from typing import Dict, Iterable, List, Optional
 from ..config import Config
 from ..api_client import PUCPAPIClient, APIException
+from ..utils.slice_index import SliceIndex, fetch_slice, resolve_slice_id
+from ..utils.bulk import run_api_calls
+from ..utils.completion import complete_infrastructures, complete_slices, in_background
+from ..utils.wait import FAILED_STATUSES, READY_STATUSES, wait_for_slices
+from ..utils.placement import PlacementSimulator
+from ..utils.reconcile import CREATE, DELETE, NOOP, UPDATE, FingerprintCache, desired_from_specs, diff, resolve
+from ..utils.specs import load_slice_specs
+from ..utils import trace
+from ..ui.output import get_format, write_json, write_records
+from ..ui.table import Column, StreamTable, page_summary, paginate
 
 console = Console()
 
@@ -21,124 +32,143 @@ def slice():
     """🔄 Gestión de slices"""
     pass
 
+# Filas por página de --page cuando no se indica --limit
+DEFAULT_PAGE_LIMIT = 100
+
+SLICE_FIELDS = ['id', 'name', 'status', 'infrastructure', 'node_count', 'network_count', 'created_at']
+
 @slice.command("list")
 @click.option('--status', help='Filtrar por estado (active, error, stopped, etc.)')
-@click.option('--infrastructure', help='Filtrar por infraestructura (linux, openstack)')
-@click.option('--json', 'output_json', is_flag=True, help='Salida en formato JSON')
-def list_slices(status, infrastructure, output_json):
+@click.option('--infrastructure', shell_complete=complete_infrastructures, help='Filtrar por infraestructura (linux, openstack)')
+@click.option('--page-size', default=500, type=click.IntRange(min=1), help='Slices por página al consultar el servidor')
+@click.option('--limit', type=click.IntRange(min=1), help='Mostrar como máximo N slices en la tabla')
+@click.option('--page', default=1, type=click.IntRange(min=1), help='Página de --limit slices a mostrar (desde 1; sin --limit, páginas de 100)')
+@click.option('--json', 'output_json', is_flag=True, help='Salida en formato JSON (igual que --format json)')
+def list_slices(status, infrastructure, page_size, limit, page, output_json):
     """Lista todos los slices"""
     
     config = Config()
     client = PUCPAPIClient(config)
+    fmt = 'json' if output_json else get_format()
     
     try:
-        slices = client.list_slices()
-        
-        # Aplicar filtros
-        if status:
-            slices = [s for s in slices if s.get('status') == status]
-        if infrastructure:
-            slices = [s for s in slices if s.get('infrastructure') == infrastructure]
-        
-        if output_json:
-            console.print(json.dumps(slices, indent=2))
-            return
-        
-        if not slices:
-            console.print("📋 [yellow]No slices found[/yellow]")
-            if status or infrastructure:
-                console.print(f"   Filters: status={status}, infrastructure={infrastructure}")
-            return
-        
-        # Crear tabla
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Name", style="cyan", width=20)
-        table.add_column("Status", width=12)
-        table.add_column("Infrastructure", style="blue", width=12)
-        table.add_column("Nodes", style="green", width=8, justify="center")
-        table.add_column("Networks", style="yellow", width=8, justify="center")
-        table.add_column("Created", style="dim", width=15)
-        table.add_column("Actions", width=20)
-        
-        for slice_data in slices:
-            # Status con color
-            status_text = slice_data.get('status', 'unknown')
-            if status_text == 'active':
-                status_display = "[green]✅ active[/green]"
-            elif status_text == 'error':
-                status_display = "[red]❌ error[/red]"
-            elif status_text == 'stopped':
-                status_display = "[yellow]⏸️ stopped[/yellow]"
-            elif status_text in ['deploying', 'validating']:
-                status_display = "[blue]🔄 deploy.[/blue]"
-            else:
-                status_display = f"[dim]{status_text}[/dim]"
-            
-            # Emoji para infraestructura
-            infra = slice_data.get('infrastructure', 'unknown')
-            if infra == 'linux':
-                infra_display = "🐧 linux"
-            elif infra == 'openstack':
-                infra_display = "☁️ openstack"
-            else:
-                infra_display = infra
-            
-            # Acciones según estado
-            actions = []
-            if status_text == 'active':
-                actions = ["[dim]view|stop|restart[/dim]"]
-            elif status_text == 'stopped':
-                actions = ["[dim]view|start|delete[/dim]"]
-            elif status_text == 'error':
-                actions = ["[dim]view|retry|delete[/dim]"]
-            elif status_text == 'draft':
-                actions = ["[dim]deploy|edit|delete[/dim]"]
-            else:
-                actions = ["[dim]view[/dim]"]
-            
-            # Obtener fecha de creación formateada
-            created = slice_data.get('created_at', '')
-            if created:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                    created_display = dt.strftime("%Y-%m-%d %H:%M")
-                except:
-                    created_display = created[:16]
+        # Filtros aplicados en el servidor; los registros llegan página a página
+        slices = client.iter_slices(status=status, infrastructure=infrastructure, page_size=page_size)
+        
+        # Un listado sin filtros sirve para reconstruir el índice nombre → ID
+        seen = [] if not (status or infrastructure) else None
+        if seen is not None:
+            slices = _collect_ids(slices, seen)
+        
+        if fmt != 'table':
+            # Los registros se descargan mientras se escriben: las requests quedan anidadas
+            with trace.span('output', 'render', detail=fmt):
+                write_records(slices, fmt, SLICE_FIELDS)
+        else:
+            # La tabla se imprime mientras llegan las páginas del servidor
+            first = next(slices, None)
+            if first is not None:
+                if page > 1 and not limit:
+                    limit = DEFAULT_PAGE_LIMIT
+                with trace.span('table', 'render') as span:
+                    total = _print_slices_table(itertools.chain([first], slices), page, limit)
+                    span.set(detail=f"{total} rows")
             else:
-                created_display = 'N/A'
-            
-            table.add_row(
-                slice_data.get('name', 'N/A'),
-                status_display,
-                infra_display,
-                str(slice_data.get('node_count', 0)),
-                str(slice_data.get('network_count', 0)),
-                created_display,
-                "".join(actions)
-            )
-        
-        console.print(f"\n📋 [bold]PUCP Slices ({len(slices)} found)[/bold]\n")
-        console.print(table)
-        console.print()
-        
-        # Stats summary
-        stats = {}
-        for slice_data in slices:
-            status = slice_data.get('status', 'unknown')
-            stats[status] = stats.get(status, 0) + 1
+                console.print("📋 [yellow]No slices found[/yellow]")
+                if status or infrastructure:
+                    console.print(f"   Filters: status={status}, infrastructure={infrastructure}")
         
-        stats_text = " | ".join([f"{k}: {v}" for k, v in stats.items()])
-        console.print(f"📊 [dim]{stats_text}[/dim]")
-        console.print(f"💡 Use 'pucp slice show <name>' for details")
+        if seen is not None:
+            # El índice (también el del completado de shell) se escribe sin retrasar la salida
+            in_background(SliceIndex(config).update, seen)
         
     except APIException as e:
         console.print(f"❌ [red]API Error: {e}[/red]")
     except Exception as e:
         console.print(f"❌ [red]Error: {e}[/red]")
 
+def _collect_ids(slices, seen: List[Dict]):
+    """Deja pasar los slices guardando nombre e ID para el índice"""
+    for s in slices:
+        seen.append({'name': s.get('name'), 'id': s.get('id')})
+        yield s
+
+# Celdas precalculadas por estado e infraestructura: ni markup ni condicionales por fila
+_STATUS_CELLS = {
+    'active': (("✅ active", "green"),),
+    'error': (("❌ error", "red"),),
+    'stopped': (("⏸️ stopped", "yellow"),),
+    'deploying': (("🔄 deploy.", "blue"),),
+    'validating': (("🔄 deploy.", "blue"),),
+}
+_INFRA_LABELS = {'linux': "🐧 linux", 'openstack': "☁️ openstack"}
+_ACTIONS = {
+    'active': "view|stop|restart",
+    'stopped': "view|start|delete",
+    'error': "view|retry|delete",
+    'draft': "deploy|edit|delete",
+}
+
+SLICE_COLUMNS = [
+    Column("Name", style="cyan", max_width=30),
+    Column("Status", min_width=10),
+    Column("Infrastructure", style="blue"),
+    Column("Nodes", style="green", justify="center"),
+    Column("Networks", style="yellow", justify="center"),
+    Column("Created", style="dim", min_width=16),
+    Column("Actions", style="dim"),
+]
+
+def _format_created(created: str) -> str:
+    """'2025-09-01T10:00:00Z' → '2025-09-01 10:00' sin parsear la fecha"""
+    if not created:
+        return 'N/A'
+    if len(created) >= 16 and created[10] in 'T ':
+        return f"{created[:10]} {created[11:16]}"
+    return created[:16]
+
+def _slice_row(slice_data: Dict, stats: Dict) -> tuple:
+    """Celdas de un slice (y cuenta su estado para el resumen)"""
+    status = slice_data.get('status', 'unknown')
+    stats[status] = stats.get(status, 0) + 1
+    infra = slice_data.get('infrastructure', 'unknown')
+    return (
+        slice_data.get('name', 'N/A'),
+        _STATUS_CELLS.get(status) or ((status, "dim"),),
+        _INFRA_LABELS.get(infra, infra),
+        str(slice_data.get('node_count', 0)),
+        str(slice_data.get('network_count', 0)),
+        _format_created(slice_data.get('created_at', '')),
+        _ACTIONS.get(status, "view"),
+    )
+
+def _print_slices_table(slices: Iterable[Dict], page: int = 1, limit: Optional[int] = None) -> int:
+    """Tabla de slices en streaming con resumen por estado; devuelve cuántos hay
+    
+    Con `limit` se muestra solo la página `page`; el resto de slices se
+    recorre igualmente para el total y el resumen.
+    """
+    stats = {}
+    rows = (_slice_row(s, stats) for s in slices)
+    
+    console.print(f"\n📋 [bold]PUCP Slices[/bold]\n")
+    shown = StreamTable(SLICE_COLUMNS, console).write(paginate(rows, page, limit))
+    for _ in rows:
+        pass  # Slices fuera de la página: solo cuentan para el resumen
+    total = sum(stats.values())
+    console.print()
+    
+    summary = page_summary(page, limit, shown, total, 'slices')
+    if summary:
+        console.print(summary)
+    
+    stats_text = " | ".join([f"{k}: {v}" for k, v in stats.items()])
+    console.print(f"📊 [dim]{total} found | {stats_text}[/dim]")
+    console.print(f"💡 Use 'pucp slice show <name>' for details")
+    return total
+
 @slice.command("show")
-@click.argument('slice_name')
+@click.argument('slice_name', shell_complete=complete_slices)
 @click.option('--json', 'output_json', is_flag=True, help='Salida en formato JSON')
 def show_slice(slice_name, output_json):
     """Muestra detalles de un slice"""
@@ -147,109 +177,194 @@ def show_slice(slice_name, output_json):
     client = PUCPAPIClient(config)
     
     try:
-        # Buscar slice por nombre o ID
-        slices = client.list_slices()
-        slice_data = None
+        # Buscar slice por nombre o ID (índice local)
+        slice_details = fetch_slice(client, SliceIndex(config), slice_name)
         
-        for s in slices:
-            if s.get('name') == slice_name or s.get('id') == slice_name:
-                slice_data = s
-                break
-        
-        if not slice_data:
+        if not slice_details:
             console.print(f"❌ [red]Slice '{slice_name}' not found[/red]")
             return
         
-        # Obtener detalles completos
-        slice_details = client.get_slice(slice_data['id'])
-        
-        if output_json:
-            console.print(json.dumps(slice_details, indent=2))
+        if output_json or get_format() in ('json', 'ndjson'):
+            write_json(slice_details)
             return
         
-        # Mostrar información detallada
-        console.print(f"\n🔍 [bold]Slice Details: {slice_details.get('name')}[/bold]\n")
+        with trace.span('details', 'render'):
+            _print_slice_details(slice_details)
         
-        # Panel de información básica
-        info_text = f"""[cyan]ID:[/cyan] {slice_details.get('id', 'N/A')}
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+    except Exception as e:
+        console.print(f"❌ [red]Error: {e}[/red]")
+
+def _print_slice_details(slice_details: Dict):
+    """Panel de información, nodos y redes de un slice"""
+    
+    console.print(f"\n🔍 [bold]Slice Details: {slice_details.get('name')}[/bold]\n")
+    
+    # Panel de información básica
+    info_text = f"""[cyan]ID:[/cyan] {slice_details.get('id', 'N/A')}
 [cyan]Name:[/cyan] {slice_details.get('name', 'N/A')}
 [cyan]Description:[/cyan] {slice_details.get('description', 'N/A')}
 [cyan]Infrastructure:[/cyan] {slice_details.get('infrastructure', 'N/A')}
 [cyan]Status:[/cyan] {slice_details.get('status', 'N/A')}
 [cyan]Created:[/cyan] {slice_details.get('created_at', 'N/A')}"""
+    
+    console.print(Panel(info_text, title="📋 Basic Info", border_style="blue"))
+    
+    # Tabla de nodos
+    nodes = slice_details.get('nodes', [])
+    if nodes:
+        nodes_table = Table(show_header=True, header_style="bold green")
+        nodes_table.add_column("Node", style="cyan")
+        nodes_table.add_column("Image", style="blue")
+        nodes_table.add_column("Flavor", style="yellow")
+        nodes_table.add_column("Status", style="green")
+        nodes_table.add_column("IP Address", style="magenta")
+        nodes_table.add_column("Server", style="dim")
+        
+        for node in nodes:
+            nodes_table.add_row(
+                node.get('name', 'N/A'),
+                node.get('image', 'N/A'),
+                node.get('flavor', 'N/A'),
+                node.get('status', 'N/A'),
+                node.get('ip_address', 'N/A'),
+                node.get('assigned_host', 'N/A')
+            )
         
-        console.print(Panel(info_text, title="📋 Basic Info", border_style="blue"))
-        
-        # Tabla de nodos
-        nodes = slice_details.get('nodes', [])
-        if nodes:
-            nodes_table = Table(show_header=True, header_style="bold green")
-            nodes_table.add_column("Node", style="cyan")
-            nodes_table.add_column("Image", style="blue")
-            nodes_table.add_column("Flavor", style="yellow")
-            nodes_table.add_column("Status", style="green")
-            nodes_table.add_column("IP Address", style="magenta")
-            nodes_table.add_column("Server", style="dim")
-            
-            for node in nodes:
-                nodes_table.add_row(
-                    node.get('name', 'N/A'),
-                    node.get('image', 'N/A'),
-                    node.get('flavor', 'N/A'),
-                    node.get('status', 'N/A'),
-                    node.get('ip_address', 'N/A'),
-                    node.get('assigned_host', 'N/A')
-                )
-            
-            console.print(nodes_table)
-        
-        # Tabla de redes
-        networks = slice_details.get('networks', [])
-        if networks:
-            console.print()
-            networks_table = Table(show_header=True, header_style="bold yellow")
-            networks_table.add_column("Network", style="cyan")
-            networks_table.add_column("CIDR", style="blue")
-            networks_table.add_column("VLAN", style="green")
-            networks_table.add_column("Type", style="magenta")
-            networks_table.add_column("Internet", style="red")
-            
-            for network in networks:
-                networks_table.add_row(
-                    network.get('name', 'N/A'),
-                    network.get('cidr', 'N/A'),
-                    str(network.get('vlan_id', 'N/A')),
-                    network.get('network_type', 'data'),
-                    "✅" if network.get('internet_access') else "❌"
-                )
-            
-            console.print(networks_table)
-        
+        console.print(nodes_table)
+    
+    # Tabla de redes
+    networks = slice_details.get('networks', [])
+    if networks:
         console.print()
+        networks_table = Table(show_header=True, header_style="bold yellow")
+        networks_table.add_column("Network", style="cyan")
+        networks_table.add_column("CIDR", style="blue")
+        networks_table.add_column("VLAN", style="green")
+        networks_table.add_column("Type", style="magenta")
+        networks_table.add_column("Internet", style="red")
+        
+        for network in networks:
+            networks_table.add_row(
+                network.get('name', 'N/A'),
+                network.get('cidr', 'N/A'),
+                str(network.get('vlan_id', 'N/A')),
+                network.get('network_type', 'data'),
+                "✅" if network.get('internet_access') else "❌"
+            )
         
-    except APIException as e:
-        console.print(f"❌ [red]API Error: {e}[/red]")
-    except Exception as e:
-        console.print(f"❌ [red]Error: {e}[/red]")
+        console.print(networks_table)
+    
+    console.print()
+
+DEPLOYABLE_STATUSES = ['draft', 'error', 'stopped']
+
+def _is_bulk(slice_names, status) -> bool:
+    """Indica si la invocación apunta a varios slices"""
+    return bool(status) or len(slice_names) != 1 or any(ch in slice_names[0] for ch in '*?[')
+
+def _select_slices(slices: List[Dict], patterns, status=None) -> List[Dict]:
+    """Selecciona slices por nombre, ID o patrón glob y opcionalmente por estado"""
+    selected = []
+    for s in slices:
+        if status and s.get('status') != status:
+            continue
+        if patterns and not any(
+            fnmatch.fnmatchcase(s.get('name', ''), p) or s.get('id') == p for p in patterns
+        ):
+            continue
+        selected.append(s)
+    return selected
+
+def _resolve_targets(config: Config, client: PUCPAPIClient, slice_names, status) -> List[Dict]:
+    """Resuelve todos los objetivos a partir de un único listado"""
+    slices = list(client.iter_slices())
+    SliceIndex(config).update(slices)
+    
+    targets = _select_slices(slices, slice_names, status)
+    
+    # Avisar de nombres literales que no coinciden con ningún slice
+    for name in slice_names:
+        if not any(ch in name for ch in '*?[') and not _select_slices(targets, [name]):
+            console.print(f"⚠️  [yellow]Slice '{name}' not found[/yellow]")
+    
+    return targets
+
+def _print_bulk_summary(action: str, results) -> int:
+    """Imprime la tabla resumen de una operación masiva; devuelve nº de fallos"""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Slice", style="cyan", width=20)
+    table.add_column("Result", width=12)
+    table.add_column("Detail", style="dim")
+    
+    failures = 0
+    for result in results:
+        if result.ok:
+            table.add_row(result.item.get('name', 'N/A'), "[green]✅ ok[/green]", "")
+        else:
+            failures += 1
+            table.add_row(result.item.get('name', 'N/A'), "[red]❌ failed[/red]", str(result.value))
+    
+    console.print(table)
+    console.print(f"📊 [dim]{action}: {len(results) - failures} ok | {failures} failed[/dim]")
+    return failures
 
 @slice.command("deploy")
-@click.argument('slice_name')
+@click.argument('slice_names', nargs=-1, shell_complete=complete_slices)
+@click.option('--status', help='Desplegar todos los slices con este estado')
+@click.option('--parallel', default=4, type=click.IntRange(min=1), help='Operaciones concurrentes (modo masivo)')
 @click.option('--watch', is_flag=True, help='Monitorear progreso del deployment')
-def deploy_slice(slice_name, watch):
-    """Despliega un slice"""
+@click.option('--timeout', default=300.0, type=float, help='Plazo máximo de --watch en segundos')
+@click.pass_context
+def deploy_slice(ctx, slice_names, status, parallel, watch, timeout):
+    """Despliega uno o varios slices (nombres, IDs o patrones glob)"""
+    
+    if not slice_names and not status:
+        raise click.UsageError("Specify at least one slice name, pattern or --status")
     
     config = Config()
+    config.pool_maxsize = max(config.pool_maxsize, parallel)
     client = PUCPAPIClient(config)
     
+    if not _is_bulk(slice_names, status):
+        _deploy_one(config, client, slice_names[0], watch, timeout)
+        return
+    
     try:
-        # Buscar slice
-        slices = client.list_slices()
-        slice_data = None
+        targets = _resolve_targets(config, client, slice_names, status)
+        deployable = [s for s in targets if s.get('status') in DEPLOYABLE_STATUSES]
+        
+        for s in targets:
+            if s not in deployable:
+                console.print(f"⏭️  [dim]Skipping '{s.get('name')}' (status: {s.get('status')})[/dim]")
+        
+        if not deployable:
+            console.print("📋 [yellow]No deployable slices matched[/yellow]")
+            return
+        
+        console.print(f"🚀 [bold]Deploying {len(deployable)} slices ({parallel} in parallel)...[/bold]")
+        results = run_api_calls(client, 'deploy_slice', deployable, lambda s: s['id'], parallel)
+        
+        failed = _print_bulk_summary("deploy", results)
         
-        for s in slices:
-            if s.get('name') == slice_name or s.get('id') == slice_name:
-                slice_data = s
-                break
+        # Los que sí arrancaron se siguen aunque otros hayan fallado
+        started = [r.item for r in results if r.ok]
+        if watch and started and not _watch_slices(client, started, timeout, since_deploy=True):
+            failed = True
+        
+        if failed:
+            ctx.exit(1)
+        
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+
+def _deploy_one(config: Config, client: PUCPAPIClient, slice_name: str, watch: bool, timeout: float):
+    """Despliega un único slice"""
+    
+    try:
+        # Buscar slice
+        slice_data = fetch_slice(client, SliceIndex(config), slice_name)
         
         if not slice_data:
             console.print(f"❌ [red]Slice '{slice_name}' not found[/red]")
@@ -258,7 +373,7 @@ def deploy_slice(slice_name, watch):
         slice_id = slice_data['id']
         
         # Verificar estado
-        if slice_data.get('status') not in ['draft', 'error', 'stopped']:
+        if slice_data.get('status') not in DEPLOYABLE_STATUSES:
             console.print(f"❌ [red]Cannot deploy slice in status: {slice_data.get('status')}[/red]")
             return
         
@@ -275,28 +390,25 @@ def deploy_slice(slice_name, watch):
                 
                 # Iniciar deployment
                 response = client._request('POST', client.config.slice_service, f'/slices/{slice_id}/deploy')
-                
                 progress.update(task, description="Deployment initiated...")
-                time.sleep(2)
                 
-                # Monitorear progreso
-                for i in range(30):  # Max 5 minutos
-                    time.sleep(10)
-                    
-                    # Obtener estado actual
-                    current_slice = client.get_slice(slice_id)
-                    status = current_slice.get('status')
-                    
-                    if status == 'active':
-                        progress.update(task, description="✅ Deployment completed!")
-                        break
-                    elif status == 'error':
-                        progress.update(task, description="❌ Deployment failed!")
-                        break
-                    elif status == 'deploying':
-                        progress.update(task, description=f"🔄 Deploying... ({i*10}s)")
+                def on_update(statuses, elapsed):
+                    status = statuses[slice_id]
+                    if status == 'deploying':
+                        progress.update(task, description=f"🔄 Deploying... ({elapsed:.0f}s)")
                     else:
                         progress.update(task, description=f"Status: {status}")
+                
+                # Monitorear progreso
+                result = wait_for_slices(client, [slice_id], timeout=timeout, on_update=on_update,
+                                         previous={slice_id: slice_data.get('status')})
+            
+            if result.ready:
+                console.print("✅ [green]Deployment completed![/green]")
+            elif result.failed:
+                console.print(f"❌ [red]Deployment failed! (status: {result.statuses[slice_id]})[/red]")
+            else:
+                console.print(f"⏱️  [yellow]Still {result.statuses[slice_id]} after {timeout:g}s[/yellow]")
         else:
             # Deployment simple
             response = client._request('POST', client.config.slice_service, f'/slices/{slice_id}/deploy')
@@ -304,7 +416,7 @@ def deploy_slice(slice_name, watch):
         # Mostrar resultado
         if 'error' in response:
             console.print(f"❌ [red]Deployment failed: {response['error']}[/red]")
-        else:
+        elif not watch:
             console.print(f"✅ [green]Deployment request sent successfully![/green]")
             console.print(f"💡 Use 'pucp slice show {slice_name}' to check status")
         
@@ -313,31 +425,150 @@ def deploy_slice(slice_name, watch):
     except Exception as e:
         console.print(f"❌ [red]Error: {e}[/red]")
 
+def _watch_slices(client: PUCPAPIClient, targets: List[Dict], timeout: float,
+                  ready_statuses=READY_STATUSES, since_deploy: bool = False) -> bool:
+    """Sigue varios slices hasta un estado final; devuelve True si todos llegaron
+
+    Con `since_deploy`, el estado de `targets` es el previo al deploy y un
+    'error' que no haya cambiado aún no cuenta como fallo.
+    """
+    names = {s['id']: s.get('name', s['id']) for s in targets}
+    previous = {s['id']: s.get('status') for s in targets} if since_deploy else None
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+    ) as progress:
+        task = progress.add_task(f"Waiting for {len(names)} slices...", total=None)
+        
+        def on_update(statuses, elapsed):
+            done = sum(1 for st in statuses.values() if st in ready_statuses or st in FAILED_STATUSES)
+            progress.update(task, description=f"🔄 {done}/{len(statuses)} finished ({elapsed:.0f}s)")
+        
+        result = wait_for_slices(client, names, timeout=timeout, ready_statuses=ready_statuses,
+                                 on_update=on_update, previous=previous)
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Slice", style="cyan", width=20)
+    table.add_column("Status", width=12)
+    table.add_column("Result", width=12)
+    
+    for slice_id, name in names.items():
+        status = result.statuses.get(slice_id, 'unknown')
+        if slice_id in result.ready:
+            outcome = "[green]✅ ready[/green]"
+        elif slice_id in result.failed:
+            outcome = "[red]❌ failed[/red]"
+        else:
+            outcome = "[yellow]⏱️ timeout[/yellow]"
+        table.add_row(name, status, outcome)
+    
+    console.print(table)
+    console.print(f"📊 [dim]{len(result.ready)} ready | {len(result.failed)} failed | "
+                  f"{len(result.pending)} pending after {result.elapsed:.0f}s[/dim]")
+    return result.ok
+
+@slice.command("wait")
+@click.argument('slice_names', nargs=-1, shell_complete=complete_slices)
+@click.option('--status', help='Esperar todos los slices con este estado actual')
+@click.option('--for', 'target', default='active', help='Estado a esperar (por defecto active)')
+@click.option('--timeout', default=300.0, type=float, help='Plazo máximo en segundos')
+@click.pass_context
+def wait_slices(ctx, slice_names, status, target, timeout):
+    """Espera a que uno o varios slices alcancen un estado"""
+    
+    if not slice_names and not status:
+        raise click.UsageError("Specify at least one slice name, pattern or --status")
+    
+    config = Config()
+    client = PUCPAPIClient(config)
+    
+    try:
+        if _is_bulk(slice_names, status):
+            targets = _resolve_targets(config, client, slice_names, status)
+        else:
+            slice_id = resolve_slice_id(client, SliceIndex(config), slice_names[0])
+            targets = [{'id': slice_id, 'name': slice_names[0]}] if slice_id else []
+            if not slice_id:
+                console.print(f"❌ [red]Slice '{slice_names[0]}' not found[/red]")
+        
+        if not targets:
+            ctx.exit(1)
+        
+        if not _watch_slices(client, targets, timeout, ready_statuses={target}):
+            ctx.exit(1)
+        
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+        ctx.exit(1)
+
 @slice.command("delete")
-@click.argument('slice_name')
+@click.argument('slice_names', nargs=-1, shell_complete=complete_slices)
+@click.option('--status', help='Eliminar todos los slices con este estado')
+@click.option('--parallel', default=4, type=click.IntRange(min=1), help='Operaciones concurrentes (modo masivo)')
 @click.option('--force', is_flag=True, help='Forzar eliminación sin confirmación')
-def delete_slice(slice_name, force):
-    """Elimina un slice"""
+@click.pass_context
+def delete_slice(ctx, slice_names, status, parallel, force):
+    """Elimina uno o varios slices (nombres, IDs o patrones glob)"""
+    
+    if not slice_names and not status:
+        raise click.UsageError("Specify at least one slice name, pattern or --status")
     
     config = Config()
+    config.pool_maxsize = max(config.pool_maxsize, parallel)
     client = PUCPAPIClient(config)
     
+    if not _is_bulk(slice_names, status):
+        _delete_one(config, client, slice_names[0], force)
+        return
+    
     try:
-        # Buscar slice
-        slices = client.list_slices()
-        slice_data = None
+        targets = _resolve_targets(config, client, slice_names, status)
         
-        for s in slices:
-            if s.get('name') == slice_name or s.get('id') == slice_name:
-                slice_data = s
-                break
+        if not targets:
+            console.print("📋 [yellow]No slices matched[/yellow]")
+            return
         
-        if not slice_data:
+        # Confirmación única para todo el lote
+        if not force:
+            console.print(f"⚠️  [yellow]About to delete {len(targets)} slices:[/yellow]")
+            for s in targets:
+                console.print(f"   • {s.get('name')} [dim]({s.get('status')}, {s.get('infrastructure')})[/dim]")
+            
+            if not Confirm.ask("🗑️  Are you sure you want to delete these slices?"):
+                console.print("❌ Deletion cancelled")
+                return
+        
+        console.print(f"🗑️  [bold]Deleting {len(targets)} slices ({parallel} in parallel)...[/bold]")
+        results = run_api_calls(client, 'delete_slice', targets, lambda s: s['id'], parallel)
+        
+        SliceIndex(config).forget(*[r.item['id'] for r in results if r.ok])
+        
+        if _print_bulk_summary("delete", results):
+            ctx.exit(1)
+        
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+
+def _delete_one(config: Config, client: PUCPAPIClient, slice_name: str, force: bool):
+    """Elimina un único slice"""
+    
+    try:
+        index = SliceIndex(config)
+        
+        # Buscar slice (con --force basta el ID; sin él se muestran los detalles)
+        if force:
+            slice_data = None
+            slice_id = resolve_slice_id(client, index, slice_name)
+        else:
+            slice_data = fetch_slice(client, index, slice_name)
+            slice_id = slice_data['id'] if slice_data else None
+        
+        if not slice_id:
             console.print(f"❌ [red]Slice '{slice_name}' not found[/red]")
             return
         
-        slice_id = slice_data['id']
-        
         # Confirmación
         if not force:
             console.print(f"⚠️  [yellow]About to delete slice '{slice_name}'[/yellow]")
@@ -351,7 +582,17 @@ def delete_slice(slice_name, force):
         
         console.print(f"🗑️  [bold]Deleting slice '{slice_name}'...[/bold]")
         
-        response = client._request('DELETE', client.config.slice_service, f'/slices/{slice_id}')
+        try:
+            response = client.delete_slice(slice_id)
+        except APIException as e:
+            # ID del índice obsoleto: revalidar y reintentar una vez
+            if e.status_code != 404 or slice_id == slice_name or not index.refresh(client, force=True):
+                raise
+            slice_id = index.lookup(slice_name)
+            if not slice_id:
+                raise
+            response = client.delete_slice(slice_id)
+        index.forget(slice_name)
         
         console.print(f"✅ [green]Slice '{slice_name}' deleted successfully![/green]")
         
@@ -451,6 +692,7 @@ def create_slice(name, infrastructure, interactive):
         console.print(f"\n🏗️  [bold]Creating slice '{name}'...[/bold]")
         
         response = client._request('POST', client.config.slice_service, '/slices', json=slice_config)
+        SliceIndex(config).add(name, response.get('id'))
         
         console.print(f"✅ [green]Slice '{name}' created successfully![/green]")
         console.print(f"🆔 Slice ID: {response.get('id')}")
@@ -459,4 +701,307 @@ def create_slice(name, infrastructure, interactive):
     except APIException as e:
         console.print(f"❌ [red]API Error: {e}[/red]")
     except Exception as e:
-        console.print(f"❌ [red]Error: {e}[/red]")
\ No newline at end of file
+        console.print(f"❌ [red]Error: {e}[/red]")
+
+@slice.command("plan")
+@click.argument('spec_files', nargs=-1, type=click.Path(exists=True))
+@click.option('--slice', 'slice_names', multiple=True, shell_complete=complete_slices, help='Planificar también un slice existente (repetible)')
+@click.option('--nodes', 'show_nodes', is_flag=True, help='Mostrar el host previsto para cada nodo')
+@click.pass_context
+def plan_slices(ctx, spec_files, slice_names, show_nodes):
+    """Simula si uno o varios slices caben en el cluster actual"""
+    
+    if not spec_files and not slice_names:
+        console.print("❌ [red]Specify spec files/directories or --slice NAME[/red]")
+        ctx.exit(2)
+    
+    # Las definiciones se validan como en 'slice apply' antes de simular nada
+    loaded, errors = load_slice_specs(spec_files) if spec_files else ([], [])
+    if errors:
+        for source, message in errors:
+            console.print(f"❌ [red]{source}: {message}[/red]")
+        ctx.exit(1)
+    
+    config = Config()
+    client = PUCPAPIClient(config)
+    fmt = get_format()
+    
+    try:
+        specs = [spec.payload() for _, spec in loaded]
+        index = SliceIndex(config)
+        for name in slice_names:
+            details = fetch_slice(client, index, name)
+            if not details:
+                console.print(f"❌ [red]Slice '{name}' not found[/red]")
+                ctx.exit(1)
+            specs.append(details)
+        
+        data = client.resource_servers(fields=['servers', 'vm_flavors'])
+        simulator = PlacementSimulator(data.get('servers', []), data.get('vm_flavors', {}))
+        before = simulator.headroom()
+        
+        # Los slices se colocan en orden, consumiendo capacidad como lo harían sus despliegues
+        with trace.span('placement', 'compute', detail=f"{len(specs)} slices"):
+            plans = [simulator.place(spec) for spec in specs]
+        after = simulator.headroom()
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+        ctx.exit(1)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ [red]Error: {e}[/red]")
+        ctx.exit(1)
+    
+    failed = sum(1 for plan in plans if not plan.fits)
+    
+    if fmt != 'table':
+        write_records((dict(p._asdict(), fits=plan.fits) for plan in plans for p in plan.nodes), fmt,
+                      ['slice', 'node', 'flavor', 'vcpus', 'ram', 'host', 'fits', 'reason'])
+        ctx.exit(1 if failed else 0)
+    
+    table = Table(show_header=True, header_style="bold magenta", title="🧮 Placement Plan")
+    table.add_column("Slice", style="cyan")
+    table.add_column("Infra", style="blue")
+    table.add_column("Nodes", justify="right")
+    table.add_column("vCPUs", justify="right")
+    table.add_column("RAM (MB)", justify="right")
+    table.add_column("Result")
+    
+    for plan in plans:
+        result = ("[green]✅ fits[/green]" if plan.fits
+                  else f"[red]❌ {plan.reason}[/red]")
+        table.add_row(plan.name, plan.infrastructure, str(len(plan.nodes)),
+                      str(sum(n.vcpus for n in plan.nodes)), str(sum(n.ram for n in plan.nodes)),
+                      result)
+    console.print(table)
+    
+    if show_nodes or len(plans) == 1:
+        nodes_table = Table(show_header=True, header_style="bold green")
+        nodes_table.add_column("Slice", style="cyan")
+        nodes_table.add_column("Node", style="cyan")
+        nodes_table.add_column("Flavor", style="yellow")
+        nodes_table.add_column("Host", style="magenta")
+        for plan in plans:
+            for node in plan.nodes:
+                nodes_table.add_row(plan.name, node.node, node.flavor,
+                                    node.host or "[red]-[/red]")
+        console.print(nodes_table)
+    
+    headroom = Table(show_header=True, header_style="bold yellow", title="📦 Headroom after plan")
+    headroom.add_column("Infrastructure", style="cyan")
+    headroom.add_column("Servers", justify="right")
+    headroom.add_column("Free vCPUs", justify="right")
+    headroom.add_column("Free RAM (GB)", justify="right")
+    headroom.add_column("Largest host free", justify="right")
+    for infra, stat in sorted(after.items()):
+        prev = before.get(infra, stat)
+        headroom.add_row(
+            infra,
+            str(stat['servers']),
+            f"{prev['free_vcpus']} → {stat['free_vcpus']} / {stat['total_vcpus']}",
+            f"{prev['free_ram'] / 1024:.0f} → {stat['free_ram'] / 1024:.0f} / {stat['total_ram'] / 1024:.0f}",
+            f"{stat['largest_vcpus']} vCPUs, {stat['largest_ram'] / 1024:.1f} GB",
+        )
+    console.print(headroom)
+    
+    if failed:
+        console.print(f"❌ [red]{failed} of {len(plans)} slices do not fit[/red]")
+        ctx.exit(1)
+    console.print(f"✅ [green]All {len(plans)} slices fit[/green]")
+
+@slice.command("apply")
+@click.option('-f', '--filename', 'paths', multiple=True, required=True, type=click.Path(exists=True),
+              help='Archivo YAML/JSON o directorio con definiciones (repetible)')
+@click.option('--parallel', default=8, type=click.IntRange(min=1), help='Operaciones concurrentes')
+@click.option('--prune', is_flag=True, help='Eliminar los slices que no estén en las definiciones')
+@click.option('--force', is_flag=True, help='No pedir confirmación para --prune')
+@click.option('--refresh', is_flag=True, help='Ignorar las huellas en caché y consultar cada slice')
+@click.option('--deploy', is_flag=True, help='Desplegar los slices creados')
+@click.option('--watch', is_flag=True, help='Esperar a que terminen los despliegues (con --deploy)')
+@click.option('--timeout', default=600.0, type=float, help='Plazo máximo de --watch en segundos')
+@click.option('--dry-run', is_flag=True, help='Mostrar el plan sin aplicar cambios')
+@click.pass_context
+def apply_slices(ctx, paths, parallel, prune, force, refresh, deploy, watch, timeout, dry_run):
+    """Reconcilia los slices con las definiciones (solo envía los que cambian)"""
+    
+    # Validar todo antes de enviar nada
+    with trace.span('validate', 'parse'):
+        specs, errors = load_slice_specs(paths)
+    
+    if errors:
+        table = Table(show_header=True, header_style="bold red", title="❌ Invalid definitions")
+        table.add_column("Source", style="cyan")
+        table.add_column("Error")
+        for source, message in errors:
+            table.add_row(source, message)
+        console.print(table)
+        console.print(f"📊 [dim]{len(specs)} valid | {len(errors)} invalid — nothing was applied[/dim]")
+        ctx.exit(1)
+    
+    if not specs:
+        console.print("📋 [yellow]No slice definitions found[/yellow]")
+        return
+    
+    config = Config()
+    config.pool_maxsize = max(config.pool_maxsize, parallel)
+    client = PUCPAPIClient(config)
+    cache = FingerprintCache(config)
+    
+    # Con formatos de máquina el progreso va a stderr para no mezclarse con los registros
+    progress = console if get_format() == 'table' else Console(stderr=True)
+    
+    def fetch(changes):
+        results = run_api_calls(client, 'get_slice', changes, lambda c: c.slice_id, parallel)
+        return {r.item.slice_id: r.value for r in results if r.ok}
+    
+    try:
+        existing = list(client.iter_slices())
+        SliceIndex(config).update(existing)
+        
+        with trace.span('diff', 'compute', detail=f"{len(specs)} desired, {len(existing)} live"):
+            changes = diff(desired_from_specs(specs), existing, prune=prune)
+            changes = resolve(changes, cache, fetch, refresh=refresh)
+        cache.save()
+    except APIException as e:
+        console.print(f"❌ [red]API Error: {e}[/red]")
+        ctx.exit(1)
+    
+    by_action = {action: [c for c in changes if c.action == action] for action in (CREATE, UPDATE, DELETE, NOOP)}
+    # Por ID (o por nombre los que aún no existen): con --prune dos slices vivos con el
+    # mismo nombre pueden dar un update y un delete, y cada uno tiene su resultado
+    report = {_report_key(c): {'name': c.name, 'source': c.desired.source if c.desired else '',
+                               'action': c.action, 'result': 'planned' if c.action != NOOP else '',
+                               'deploy': '', 'detail': ''}
+              for c in changes}
+    progress.print(f"🧮 [bold]Plan:[/bold] {len(by_action[CREATE])} to create, {len(by_action[UPDATE])} to update, "
+                   f"{len(by_action[DELETE])} to delete, {len(by_action[NOOP])} unchanged")
+    
+    if dry_run:
+        _print_apply_report(report, progress)
+        return
+    
+    if by_action[DELETE] and not force:
+        progress.print(f"⚠️  [yellow]--prune will delete {len(by_action[DELETE])} slices:[/yellow]")
+        for c in by_action[DELETE]:
+            progress.print(f"   • {c.name} [dim]({c.live.get('status')}, {c.live.get('infrastructure')})[/dim]")
+        if not Confirm.ask("🗑️  Are you sure you want to delete these slices?"):
+            console.print("❌ Apply cancelled")
+            return
+    
+    def record(results, on_ok=None):
+        for result in results:
+            entry = report[_report_key(result.item)]
+            if result.ok:
+                entry['result'] = 'done'
+                if on_ok:
+                    on_ok(result.item, result.value)
+            else:
+                entry['result'] = 'failed'
+                entry['detail'] = str(result.value)
+    
+    created = []
+    
+    def on_created(change, value):
+        created.append({'name': change.name, 'id': value.get('id'), 'key': _report_key(change)})
+        cache.put(value.get('id'), change.desired.fingerprint, value.get('updated_at'))
+    
+    def on_updated(change, value):
+        cache.put(change.slice_id, change.desired.fingerprint, (value or {}).get('updated_at'))
+    
+    if by_action[CREATE] or by_action[UPDATE] or by_action[DELETE]:
+        progress.print(f"🏗️  [bold]Applying {len(changes) - len(by_action[NOOP])} changes ({parallel} in parallel)...[/bold]")
+    record(run_api_calls(client, 'create_slice', by_action[CREATE], lambda c: c.desired.payload, parallel),
+           on_created)
+    record(run_api_calls(client, 'update_slice', by_action[UPDATE],
+                         lambda c: (c.slice_id, c.desired.payload), parallel), on_updated)
+    record(run_api_calls(client, 'delete_slice', by_action[DELETE], lambda c: c.slice_id, parallel),
+           lambda c, _: cache.forget(c.slice_id))
+    
+    index = SliceIndex(config)
+    index.add_many((s['name'], s['id']) for s in created)
+    deleted = [c.slice_id for c in by_action[DELETE] if report[_report_key(c)]['result'] == 'done']
+    if deleted:
+        index.forget(*deleted)
+    cache.save()
+    
+    if deploy and created:
+        progress.print(f"🚀 [bold]Deploying {len(created)} slices...[/bold]")
+        deployed = []
+        for result in run_api_calls(client, 'deploy_slice', created, lambda s: s['id'], parallel):
+            entry = report[result.item['key']]
+            if result.ok:
+                entry['deploy'] = 'started'
+                deployed.append(result.item)
+            else:
+                entry['deploy'] = 'failed'
+                entry['detail'] = str(result.value)
+        
+        if watch and deployed:
+            with progress.status(f"Waiting for {len(deployed)} slices..."):
+                outcome = wait_for_slices(client, {s['id']: s['name'] for s in deployed}, timeout=timeout)
+            for s in deployed:
+                entry = report[s['key']]
+                if s['id'] in outcome.ready:
+                    entry['deploy'] = 'ready'
+                elif s['id'] in outcome.failed:
+                    entry['deploy'] = 'failed'
+                    entry['detail'] = f"status: {outcome.statuses.get(s['id'])}"
+                else:
+                    entry['deploy'] = 'timeout'
+    
+    failures = _print_apply_report(report, progress)
+    if failures:
+        ctx.exit(1)
+
+def _report_key(change) -> str:
+    """Clave de un cambio en el informe de apply"""
+    return change.slice_id or f"new:{change.name}"
+
+def _print_apply_report(report: Dict[str, Dict], progress: Console) -> int:
+    """Tabla del plan / resultados de apply; devuelve nº de fallos"""
+    actions = {
+        'create': "[green]+ create[/green]",
+        'update': "[yellow]~ update[/yellow]",
+        'delete': "[red]- delete[/red]",
+        'noop': "[dim]= unchanged[/dim]",
+    }
+    labels = {
+        'planned': "[dim]planned[/dim]",
+        'done': "[green]✅ done[/green]",
+        'started': "[cyan]🚀 started[/cyan]",
+        'ready': "[green]✅ ready[/green]",
+        'failed': "[red]❌ failed[/red]",
+        'timeout': "[yellow]⏱️ timeout[/yellow]",
+        '': "",
+    }
+    
+    fmt = get_format()
+    if fmt != 'table':
+        write_records(report.values(), fmt, ['name', 'source', 'action', 'result', 'deploy', 'detail'])
+    else:
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Slice", style="cyan")
+        table.add_column("Source", style="dim")
+        table.add_column("Action")
+        table.add_column("Result")
+        table.add_column("Deploy")
+        table.add_column("Detail", style="dim")
+        # Los que no cambian solo aparecen en el resumen
+        for entry in report.values():
+            if entry['action'] == 'noop':
+                continue
+            table.add_row(entry['name'], entry['source'], actions[entry['action']], labels[entry['result']],
+                          labels[entry['deploy']], entry['detail'])
+        if table.row_count:
+            console.print(table)
+    
+    counts = {}
+    for entry in report.values():
+        action = 'unchanged' if entry['action'] == 'noop' else entry['action']
+        keys = ('failed' if entry['result'] == 'failed' else action, entry['deploy'])
+        for key in keys:
+            if key:
+                counts[key] = counts.get(key, 0) + 1
+    failures = counts.get('failed', 0) + counts.get('timeout', 0)
+    summary = ' | '.join(f"{count} {key}" for key, count in sorted(counts.items()))
+    progress.print(f"📊 [dim]apply: {summary}[/dim]", highlight=False)
+    return failures
@@ -21,8 +21,25 @@ class Config:
         self.network_service = "http://localhost:5004"
         self.image_service = "http://localhost:5005"
         
-        # Cargar configuración existente
+        # Transporte HTTP
+        self.connect_timeout = 5.0       # Segundos para establecer la conexión
+        self.read_timeout = 30.0         # Segundos de espera de respuesta
+        self.max_retries = 3             # Reintentos ante errores transitorios
+        self.retry_backoff = 0.5         # Factor de backoff exponencial (s)
+        self.pool_maxsize = 16           # Conexiones reutilizables por servicio
+        self.compression = True          # Negociar gzip/deflate
+        
+        # Caché de respuestas GET en disco (opt-in)
+        self.cache = False
+        self.cache_max_size = 64 * 1024 * 1024  # Bytes
+        self.cache_ttls = {}             # endpoint → TTL en segundos (sobrescribe los de fábrica)
+        
+        # Sesión
+        self.token_refresh_margin = 120.0  # Renovar el token estos segundos antes de que expire
+        
+        # Cargar configuración existente (archivo y luego entorno)
         self.load_config()
+        self.load_env()
     
     def load_config(self):
         """Carga configuración desde archivo"""
@@ -36,6 +53,30 @@ class Config:
             except Exception:
                 pass  # Usar valores por defecto si hay error
     
+    # Variables de entorno → (atributo, tipo)
+    ENV_VARS = {
+        'PUCP_CONNECT_TIMEOUT': ('connect_timeout', float),
+        'PUCP_READ_TIMEOUT': ('read_timeout', float),
+        'PUCP_MAX_RETRIES': ('max_retries', int),
+        'PUCP_RETRY_BACKOFF': ('retry_backoff', float),
+        'PUCP_POOL_MAXSIZE': ('pool_maxsize', int),
+        'PUCP_COMPRESSION': ('compression', lambda v: v.lower() not in ('0', 'false', 'no', 'off')),
+        'PUCP_TOKEN_REFRESH_MARGIN': ('token_refresh_margin', float),
+        'PUCP_CACHE': ('cache', lambda v: v.lower() not in ('0', 'false', 'no', 'off')),
+        'PUCP_CACHE_MAX_SIZE': ('cache_max_size', int),
+    }
+    
+    def load_env(self):
+        """Aplica overrides desde variables de entorno"""
+        for var, (attr, cast) in self.ENV_VARS.items():
+            value = os.environ.get(var)
+            if value is None or value == '':
+                continue
+            try:
+                setattr(self, attr, cast(value))
+            except ValueError:
+                pass  # Valor inválido: mantener el anterior
+    
     def save_config(self):
         """Guarda configuración actual"""
         self.config_dir.mkdir(exist_ok=True)
@@ -1,30 +1,109 @@
 #!/usr/bin/env python3hola
+import importlib
+import os
 import click
-from rich.console import Console
-from rich.table import Table
-import requests
 
-# Importar comandos
-from .commands.auth import auth
-from .commands.slice import slice
-from .commands.resource import resource
+from . import __version__
+from .ui.output import FORMATS
 
 
-console = Console()
+class LazyGroup(click.Group):
+    """Grupo de comandos que importa cada subcomando solo al invocarlo"""
+    
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # nombre → "modulo:atributo"
+        self.lazy_commands = lazy_commands or {}
+    
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+    
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands:
+            module_name, attr = self.lazy_commands[cmd_name].split(':')
+            module = importlib.import_module(module_name, package=__package__)
+            return getattr(module, attr)
+        return super().get_command(ctx, cmd_name)
+
+
+def _console():
+    """Console de rich (importada bajo demanda)"""
+    from rich.console import Console
+    return Console()
+
 
-@click.group()
-@click.version_option(version="1.0.0")
-def cli():
+@click.group(cls=LazyGroup, lazy_commands={
+    'auth': '.commands.auth:auth',
+    'slice': '.commands.slice:slice',
+    'resource': '.commands.resource:resource',
+    'agent': '.commands.agent:agent',
+    'completion': '.commands.completion:completion',
+    'network': '.commands.network:network',
+})
+@click.version_option(version=__version__)
+@click.option('--format', 'output_format', type=click.Choice(FORMATS), default='table',
+              envvar='PUCP_FORMAT', show_default=True, help='Formato de salida')
+@click.option('--trace', 'trace_enabled', is_flag=True,
+              help='Mostrar tiempos de requests y fases en stderr (o PUCP_TRACE=1)')
+@click.option('--trace-format', type=click.Choice(['table', 'json']),
+              help='Resumen en tabla o un span JSON por línea (PUCP_TRACE=json)')
+@click.option('--profile', 'profile_file', type=click.Path(dir_okay=False),
+              help='Perfilar la invocación con cProfile y guardar en este archivo')
+@click.option('--cache/--no-cache', 'use_cache', default=None,
+              help='Usar la caché de respuestas en disco (por defecto según config / PUCP_CACHE)')
+@click.option('--refresh', 'refresh_cache', is_flag=True,
+              help='Ignorar lo cacheado, descargar de nuevo y actualizar la caché')
+@click.pass_context
+def cli(ctx, output_format, trace_enabled, trace_format, profile_file, use_cache, refresh_cache):
     """🎓 PUCP Cloud Orchestrator CLI
     
     Gestiona slices, recursos y redes del cluster PUCP.
     """
-    pass
+    ctx.ensure_object(dict)
+    ctx.obj['format'] = output_format
+    
+    trace_value = trace_format or ('table' if trace_enabled else os.environ.get('PUCP_TRACE'))
+    if trace_value:
+        _start_trace(ctx, trace_value)
+    if profile_file:
+        _start_profile(ctx, profile_file)
+    if refresh_cache or use_cache is not None:
+        from .utils import http_cache
+        http_cache.set_mode('refresh' if refresh_cache else 'on' if use_cache else 'off')
+
 
-# Agregar grupo de comandos
-cli.add_command(auth)
-cli.add_command(slice)
-cli.add_command(resource)
+def _start_trace(ctx, value):
+    """Activa las trazas y las informa al terminar el comando"""
+    from .utils import trace
+    
+    fmt = trace.parse_trace_option(value)
+    if not fmt:
+        return
+    tracer = trace.enable(fmt)
+    command = trace.span(f"pucp {ctx.invoked_subcommand or ''}".strip(), 'command')
+    command.__enter__()
+    
+    def finish():
+        command.__exit__(None, None, None)
+        trace.disable()
+        tracer.report()
+    
+    ctx.call_on_close(finish)
+
+
+def _start_profile(ctx, path):
+    """Ejecuta el resto de la invocación bajo cProfile"""
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    
+    def finish():
+        profiler.disable()
+        profiler.dump_stats(path)
+        click.echo(f"📈 Profile written to {path} (python -m pstats {path})", err=True)
+    
+    ctx.call_on_close(finish)
+    profiler.enable()
 
 
 @cli.command()
@@ -41,50 +120,82 @@ def logo():
 [/bold red]
 [bold yellow]Cloud Orchestrator CLI v1.0.0[/bold yellow]
 """
-    console.print(logo_text)
+    _console().print(logo_text)
 
 @cli.command()
-def status():
+@click.option('--samples', '-n', default=1, type=click.IntRange(min=1), help='Sondeos por servicio (muestra p50/p95/max)')
+@click.option('--timeout', default=5.0, type=float, help='Timeout por sondeo en segundos')
+def status(samples, timeout):
     """Verifica estado de servicios"""
-    services = {
-        'Auth Service': 'http://localhost:5001/health',
-        'Slice Service': 'http://localhost:5002/health', 
-        'Network Service': 'http://localhost:5004/health',
-        'Image Service': 'http://localhost:5005/health',
-        'Template Service': 'http://localhost:5003/health'
+    from rich.table import Table
+    from .config import Config
+    from .api_client import PUCPAPIClient
+    from .utils import trace
+    from .utils.stats import percentile
+    
+    console = _console()
+    config = Config()
+    client = PUCPAPIClient(config)
+    
+    labels = {
+        'auth': 'Auth Service',
+        'slice': 'Slice Service',
+        'network': 'Network Service',
+        'image': 'Image Service',
+        'template': 'Template Service',
     }
+    services = client.service_urls(include_template=True)
     
     console.print("\n[bold]🔍 Checking PUCP Services...[/bold]\n")
     
+    # Todos los servicios se sondean a la vez
+    with trace.span('probe_health', 'http', detail=f"{len(services)} services x {samples}"):
+        results = client.probe_health(services, samples=samples, timeout=timeout)
+    
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Service", style="cyan", width=20)
     table.add_column("URL", style="blue", width=30)
     table.add_column("Status", width=15)
-    table.add_column("Response", width=20)
-    
-    for name, url in services.items():
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                status = "[green]✅ Online[/green]"
-                resp_text = "OK"
-            else:
-                status = f"[yellow]⚠️ HTTP {response.status_code}[/yellow]"
-                resp_text = f"Error {response.status_code}"
-        except requests.exceptions.ConnectionError:
-            status = "[red]❌ Offline[/red]"
-            resp_text = "Connection refused"
-        except requests.exceptions.Timeout:
-            status = "[red]❌ Timeout[/red]"
-            resp_text = "Timeout (5s)"
-        except Exception as e:
-            status = "[red]❌ Error[/red]"
-            resp_text = str(e)[:20]
+    if samples == 1:
+        table.add_column("Response", width=20)
+    else:
+        table.add_column("OK", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("max", justify="right")
+    
+    for name, result in results.items():
+        state = result['state']
+        if state == 'online':
+            status_display = "[green]✅ Online[/green]"
+        elif state == 'http_error':
+            status_display = f"[yellow]⚠️ HTTP {result['code']}[/yellow]"
+        elif state == 'offline':
+            status_display = "[red]❌ Offline[/red]"
+        elif state == 'timeout':
+            status_display = "[red]❌ Timeout[/red]"
+        else:
+            status_display = "[red]❌ Error[/red]"
         
-        table.add_row(name, url, status, resp_text)
+        url = f"{result['url']}/health"
+        latencies = result['latencies']
+        
+        if samples == 1:
+            resp_text = f"OK ({latencies[0]:.0f} ms)" if latencies else result['detail']
+            table.add_row(labels.get(name, name), url, status_display, resp_text)
+        else:
+            if latencies:
+                p50 = f"{percentile(latencies, 50):.1f} ms"
+                p95 = f"{percentile(latencies, 95):.1f} ms"
+                worst = f"{max(latencies):.1f} ms"
+            else:
+                p50 = p95 = worst = "-"
+            table.add_row(labels.get(name, name), url, status_display,
+                          f"{len(latencies)}/{samples}", p50, p95, worst)
     
-    console.print(table)
-    console.print()
+    with trace.span('table', 'render'):
+        console.print(table)
+        console.print()
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
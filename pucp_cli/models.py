@@ -0,0 +1,65 @@
+"""
+Modelos de definición de slices
+
+Validan los archivos de `pucp slice apply` antes de enviar nada al
+orquestador; `payload()` devuelve el cuerpo que espera POST /slices.
+"""
+import ipaddress
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+NAME_PATTERN = r'^[A-Za-z0-9][A-Za-z0-9._-]{0,62}$'
+
+
+class NodeSpec(BaseModel):
+    """Nodo (VM) de un slice"""
+    model_config = ConfigDict(extra='forbid')
+
+    name: str = Field(pattern=NAME_PATTERN)
+    image: str = 'ubuntu-20.04'
+    flavor: str = 'small'
+
+
+class NetworkSpec(BaseModel):
+    """Red de un slice"""
+    model_config = ConfigDict(extra='forbid')
+
+    name: str = Field(pattern=NAME_PATTERN)
+    cidr: str
+    network_type: str = 'data'
+    vlan_id: Optional[int] = Field(default=None, ge=1, le=4094)
+    internet_access: bool = False
+
+    @field_validator('cidr')
+    @classmethod
+    def _valid_cidr(cls, value: str) -> str:
+        try:
+            return str(ipaddress.ip_network(value, strict=True))
+        except ValueError as e:
+            raise ValueError(f"invalid CIDR: {e}")
+
+
+class SliceSpec(BaseModel):
+    """Definición completa de un slice"""
+    model_config = ConfigDict(extra='forbid')
+
+    name: str = Field(pattern=NAME_PATTERN)
+    description: str = ''
+    infrastructure: Literal['linux', 'openstack'] = 'linux'
+    nodes: List[NodeSpec] = Field(min_length=1)
+    networks: List[NetworkSpec] = Field(default_factory=list)
+
+    @model_validator(mode='after')
+    def _unique_names(self) -> 'SliceSpec':
+        for kind, items in (('node', self.nodes), ('network', self.networks)):
+            seen = set()
+            for item in items:
+                if item.name in seen:
+                    raise ValueError(f"duplicate {kind} name '{item.name}'")
+                seen.add(item.name)
+        return self
+
+    def payload(self) -> Dict:
+        """Cuerpo para create_slice"""
+        return self.model_dump(exclude_none=True)
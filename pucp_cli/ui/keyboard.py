@@ -0,0 +1,57 @@
+"""
+Lectura de teclas sin bloqueo para vistas interactivas
+"""
+import os
+import select
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: sin soporte de teclado, la vista sigue funcionando
+    termios = None
+    tty = None
+
+# Secuencias de escape más comunes → nombre de tecla
+_ESCAPES = {
+    '\x1b[A': 'up',
+    '\x1b[B': 'down',
+    '\x1b[5~': 'pgup',
+    '\x1b[6~': 'pgdown',
+    '\x1b[H': 'home',
+    '\x1b[F': 'end',
+}
+
+
+@contextmanager
+def raw_keys() -> Iterator[Callable[[float], Optional[str]]]:
+    """Pone la terminal en modo cbreak y entrega `read_key(timeout)`
+
+    `read_key` devuelve la tecla pulsada (o su nombre para flechas/paginación)
+    o None si no hubo pulsación antes del timeout.
+    """
+    if termios is None or not sys.stdin.isatty():
+        def read_key(timeout: float) -> Optional[str]:
+            time.sleep(timeout)
+            return None
+        yield read_key
+        return
+
+    fd = sys.stdin.fileno()
+    old_attrs = termios.tcgetattr(fd)
+
+    def read_key(timeout: float) -> Optional[str]:
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            return None
+        data = os.read(fd, 8).decode(errors='ignore')
+        return _ESCAPES.get(data, data[:1] or None)
+
+    try:
+        tty.setcbreak(fd)
+        yield read_key
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
@@ -0,0 +1,78 @@
+"""
+Formatos de salida del CLI
+
+Los formatos de máquina (json, ndjson, csv, tsv) escriben directamente en
+stdout sin pasar por rich: ndjson/csv/tsv emiten un registro a la vez, por
+lo que pueden encadenarse con `jq` o un log shipper mientras se generan.
+"""
+import csv
+import sys
+from typing import Dict, Iterable, List, Optional
+
+import click
+
+from ..utils import jsoncodec
+
+FORMATS = ('table', 'json', 'ndjson', 'csv', 'tsv')
+
+
+def get_format(default: str = 'table') -> str:
+    """Formato elegido con la opción global --format"""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return default
+    obj = ctx.find_root().obj or {}
+    return obj.get('format') or default
+
+
+def _flatten(value):
+    """Valores anidados → texto JSON para formatos tabulares"""
+    if isinstance(value, (dict, list)):
+        return jsoncodec.dumps(value)
+    return value
+
+
+def write_json(data, stream=None):
+    """Documento JSON indentado (no streaming)"""
+    stream = stream or sys.stdout
+    stream.write(jsoncodec.dumps(data, indent=True))
+    stream.write('\n')
+
+
+def write_records(records: Iterable[Dict], fmt: str, fields: Optional[List[str]] = None,
+                  stream=None) -> int:
+    """Escribe registros en el formato indicado; devuelve cuántos escribió
+
+    Para csv/tsv las columnas son `fields` o, si no se indican, las claves
+    del primer registro.
+    """
+    stream = stream or sys.stdout
+    count = 0
+
+    if fmt == 'json':
+        records = list(records)
+        write_json(records, stream)
+        return len(records)
+
+    if fmt == 'ndjson':
+        for record in records:
+            stream.write(jsoncodec.dumps(record))
+            stream.write('\n')
+            count += 1
+        return count
+
+    if fmt in ('csv', 'tsv'):
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=fields or list(record),
+                                        extrasaction='ignore', lineterminator='\n',
+                                        delimiter='\t' if fmt == 'tsv' else ',')
+                writer.writeheader()
+            writer.writerow({k: _flatten(record.get(k)) for k in writer.fieldnames})
+            count += 1
+        if writer is None and fields:
+            stream.write(('\t' if fmt == 'tsv' else ',').join(fields) + '\n')
+        return count
+
+    raise ValueError(f"Unsupported output format: {fmt}")
@@ -0,0 +1,186 @@
+"""
+Tablas grandes en streaming
+
+`StreamTable` escribe las filas por páginas en lugar de construir un
+rich.Table con todas: los anchos de columna se miden sobre una muestra de
+las primeras filas, las celdas llegan ya preparadas (texto y estilo, sin
+markup que parsear), los códigos ANSI de cada estilo se calculan una sola
+vez y cada página se escribe en cuanto está completa, así que la memoria
+no depende del número de filas. Si la salida no es una terminal se escribe
+texto alineado sin estilos.
+
+    table = StreamTable([Column("Name", style="cyan"), Column("Nodes", justify="right")], console)
+    shown = table.write(paginate(rows, page=2, limit=100))
+"""
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from rich.cells import cell_len, set_cell_size
+from rich.console import COLOR_SYSTEMS, Console
+from rich.style import Style
+
+# Una celda es texto (con el estilo de la columna) o una tupla de (texto, estilo)
+Cell = Union[str, Tuple[Tuple[str, str], ...]]
+
+PAGE_SIZE = 500    # Filas por escritura
+SAMPLE_SIZE = 200  # Filas usadas para medir los anchos
+GAP = '  '
+
+
+class Column(NamedTuple):
+    """Definición de una columna"""
+    header: str
+    style: str = ''
+    justify: str = 'left'  # left, right, center
+    min_width: int = 0
+    max_width: int = 40
+
+
+def paginate(items: Iterable, page: int = 1, limit: Optional[int] = None) -> Iterator:
+    """Elementos de la página `page` (desde 1) de `limit` elementos; todos si no hay límite"""
+    if not limit:
+        return iter(items)
+    start = (page - 1) * limit
+    return islice(items, start, start + limit)
+
+
+def page_summary(page: int, limit: Optional[int], shown: int, total: int, noun: str) -> Optional[str]:
+    """Texto "Showing a-b of N" si la paginación dejó filas fuera"""
+    if not limit or shown >= total:
+        return None
+    if not shown:
+        return f"📄 Page {page} is empty ({total} {noun}, --limit {limit})"
+    first = (page - 1) * limit + 1
+    return f"📄 Showing {first}-{first + shown - 1} of {total} {noun} (page {page}, --limit {limit})"
+
+
+def _crop(segments: Tuple[Tuple[str, str], ...], width: int) -> Tuple[Tuple[str, str], ...]:
+    """Recorta los segmentos a `width` celdas terminando en '…', conservando sus estilos"""
+    cropped = []
+    room = width - 1
+    for text, style in segments:
+        size = cell_len(text)
+        if size >= room:
+            cropped.append((set_cell_size(text, room) + '…', style))
+            break
+        cropped.append((text, style))
+        room -= size
+    return tuple(cropped)
+
+
+def _plain(cell: Cell) -> str:
+    if isinstance(cell, str):
+        return cell
+    return ''.join(text for text, _ in cell)
+
+
+class StreamTable:
+    """Tabla que se escribe página a página"""
+
+    def __init__(self, columns: Sequence[Column], console: Console, header_style: str = 'bold magenta',
+                 page_size: int = PAGE_SIZE, sample_size: int = SAMPLE_SIZE):
+        self.columns = list(columns)
+        self.console = console
+        self.header_style = header_style
+        self.page_size = page_size
+        self.sample_size = sample_size
+        # Sin terminal (o en consolas Windows antiguas, que no entienden ANSI) no hay estilos
+        self.plain = not console.is_terminal or console.legacy_windows
+        self.color_system = None if self.plain or not console.color_system else COLOR_SYSTEMS[console.color_system]
+        self.widths: List[int] = []
+        self._codes: Dict[str, Tuple[str, str]] = {}
+
+    def measure(self, sample: Sequence[Sequence[Cell]]) -> List[int]:
+        """Anchos a partir de la cabecera y una muestra de filas
+
+        En una terminal se estrechan las columnas más anchas hasta caber en
+        la pantalla, sin bajar de min_width ni del ancho de la cabecera.
+        """
+        widths, floors = [], []
+        for i, column in enumerate(self.columns):
+            floor = max(column.min_width, cell_len(column.header))
+            width = max([cell_len(_plain(row[i])) for row in sample] or [0])
+            widths.append(max(min(width, column.max_width), floor))
+            floors.append(floor)
+
+        if not self.plain:
+            excess = sum(widths) + len(GAP) * (len(widths) - 1) - self.console.width
+            while excess > 0:
+                shrinkable = [k for k in range(len(widths)) if widths[k] > floors[k]]
+                if not shrinkable:
+                    break
+                i = max(shrinkable, key=lambda k: widths[k])
+                widths[i] -= 1
+                excess -= 1
+        return widths
+
+    def write(self, rows: Iterable[Sequence[Cell]]) -> int:
+        """Escribe las filas; devuelve cuántas"""
+        rows = iter(rows)
+        page = list(islice(rows, self.sample_size))
+        if not page:
+            return 0
+        self.widths = self.measure(page)
+        self._write_header()
+
+        count = 0
+        while page:
+            if len(page) < self.page_size:
+                page.extend(islice(rows, self.page_size - len(page)))
+            self._write(page)
+            count += len(page)
+            page = list(islice(rows, self.page_size))
+        return count
+
+    # === SALIDA ===
+
+    def _style(self, style: str) -> Tuple[str, str]:
+        """Códigos ANSI de apertura y cierre de un estilo (calculados una vez)"""
+        codes = self._codes.get(style)
+        if codes is None:
+            codes = ('', '')
+            if style and self.color_system is not None:
+                start, _, end = Style.parse(style).render('\x00', color_system=self.color_system).partition('\x00')
+                codes = (start, end)
+            self._codes[style] = codes
+        return codes
+
+    def _cell(self, cell: Cell, column: Column, width: int, last: bool) -> str:
+        """Celda con estilos, recortada o rellenada hasta el ancho de la columna"""
+        segments = ((cell, column.style),) if isinstance(cell, str) else cell
+        used = sum(cell_len(text) for text, _ in segments)
+        if used > width:
+            segments, used = _crop(segments, width), width
+        parts = []
+        for text, style in segments:
+            if text:
+                start, end = self._style(style)
+                parts.append(f"{start}{text}{end}")
+        body = ''.join(parts)
+
+        pad = width - used
+        if not pad:
+            return body
+        if column.justify == 'right':
+            return ' ' * pad + body
+        if column.justify == 'center':
+            left = pad // 2
+            return ' ' * left + body + ('' if last else ' ' * (pad - left))
+        return body if last else body + ' ' * pad
+
+    def _write(self, page: Sequence[Sequence[Cell]]):
+        last = len(self.columns) - 1
+        lines = [GAP.join(self._cell(cell, column, width, i == last)
+                          for i, (cell, column, width) in enumerate(zip(row, self.columns, self.widths)))
+                 for row in page]
+        self.console.file.write('\n'.join(lines) + '\n')
+        self.console.file.flush()
+
+    def _write_header(self):
+        self._write([[((column.header, self.header_style),) for column in self.columns]])
+        if self.plain:
+            self._write([['-' * width for width in self.widths]])
+        else:
+            start, end = self._style('dim')
+            rule = '─' * (sum(self.widths) + len(GAP) * (len(self.widths) - 1))
+            self.console.file.write(f"{start}{rule}{end}\n")
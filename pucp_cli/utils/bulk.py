@@ -0,0 +1,69 @@
+"""
+Ejecución concurrente acotada para operaciones masivas
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, NamedTuple
+
+
+class BulkResult(NamedTuple):
+    """Resultado de una operación sobre un elemento"""
+    item: Any
+    ok: bool
+    value: Any  # Respuesta si ok, excepción si falló
+
+
+def run_parallel(items: Iterable, fn: Callable, parallel: int = 4) -> List[BulkResult]:
+    """Aplica `fn` a cada elemento con a lo sumo `parallel` workers
+
+    Los resultados se devuelven en el mismo orden que `items`; los errores
+    se capturan por elemento para que un fallo no cancele el resto.
+    """
+    items = list(items)
+
+    def call(item):
+        try:
+            return BulkResult(item, True, fn(item))
+        except Exception as e:
+            return BulkResult(item, False, e)
+
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(items)))) as pool:
+        return list(pool.map(call, items))
+
+
+def _args(value) -> tuple:
+    return value if isinstance(value, tuple) else (value,)
+
+
+def run_api_calls(client, method: str, items: Iterable, arg: Callable,
+                  parallel: int = 4) -> List[BulkResult]:
+    """Invoca `client.<method>(arg(item))` para cada elemento con concurrencia acotada
+
+    Si httpx está instalado y no hay agente activo, las llamadas se hacen con
+    AsyncPUCPAPIClient sobre un único pool; si no, con hilos y el cliente
+    síncrono. El resultado es el mismo en ambos casos. Si `arg(item)` devuelve
+    una tupla, se pasa como argumentos posicionales (p. ej. update_slice).
+    """
+    from ..async_client import AsyncPUCPAPIClient, async_available
+
+    items = list(items)
+    if not items:
+        return []
+
+    if getattr(client, 'agent', None) is not None or not async_available():
+        return run_parallel(items, lambda item: getattr(client, method)(*_args(arg(item))), parallel)
+
+    async def call(async_client, item):
+        try:
+            return BulkResult(item, True, await getattr(async_client, method)(*_args(arg(item))))
+        except Exception as e:
+            return BulkResult(item, False, e)
+
+    async def main():
+        async with AsyncPUCPAPIClient(client.config, max_concurrency=parallel) as async_client:
+            return await asyncio.gather(*(call(async_client, item) for item in items))
+
+    return list(asyncio.run(main()))
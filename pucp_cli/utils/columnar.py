@@ -0,0 +1,290 @@
+"""
+Vista columnar de los servidores de /resources
+
+Los servidores se cargan una sola vez en columnas (arrays de NumPy si está
+instalado, `array('d')` y listas si no) para filtrar, ordenar y agregar
+sin recorrer diccionarios fila a fila:
+
+    frame = ServerFrame.from_records(data['servers'])
+    busy = frame.filter([parse_where('cpu>80')]).sort('cpu', descending=True).head(10)
+    stats = frame.aggregate('zone_name')
+
+NumPy es opcional:  pip install "pucp-cli[analytics]"
+"""
+import fnmatch
+import operator
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from .stats import percentile
+
+NUMERIC_FIELDS = ('total_vcpus', 'used_vcpus', 'total_ram', 'used_ram', 'active_vms')
+TEXT_FIELDS = ('hostname', 'infrastructure', 'zone_name', 'status')
+DERIVED_FIELDS = ('cpu_pct', 'ram_pct')
+
+# Nombres cortos aceptados en --sort y --where
+ALIASES = {
+    'cpu': 'cpu_pct',
+    'ram': 'ram_pct',
+    'vms': 'active_vms',
+    'zone': 'zone_name',
+    'infra': 'infrastructure',
+    'host': 'hostname',
+    'name': 'hostname',
+}
+
+GROUP_FIELDS = ('infrastructure', 'zone_name')
+
+_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '==': operator.eq,
+    '=': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+def _numpy():
+    """Módulo numpy, o None si no está instalado"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def resolve_field(name: str) -> str:
+    """Nombre de columna para un campo o alias; ValueError si no existe"""
+    field = ALIASES.get(name, name)
+    if field not in NUMERIC_FIELDS + TEXT_FIELDS + DERIVED_FIELDS:
+        raise ValueError(f"Unknown field '{name}'")
+    return field
+
+
+class Condition(NamedTuple):
+    """Filtro `campo op valor` de --where"""
+    field: str
+    op: str
+    value: object
+
+
+def parse_where(expr: str) -> Condition:
+    """Parsea 'cpu>80', 'zone=zone-1', 'hostname!=gpu-*'"""
+    for op in _OPERATORS:  # Los operadores de dos caracteres van primero
+        if op in expr:
+            name, _, raw = expr.partition(op)
+            field = resolve_field(name.strip())
+            raw = raw.strip()
+            if field in TEXT_FIELDS:
+                if op not in ('=', '==', '!='):
+                    raise ValueError(f"Operator '{op}' is not valid for text field '{name.strip()}'")
+                return Condition(field, op, raw)
+            try:
+                return Condition(field, op, float(raw))
+            except ValueError:
+                raise ValueError(f"'{raw}' is not a number (in '{expr}')")
+    raise ValueError(f"Invalid filter '{expr}' (expected FIELD OP VALUE, e.g. cpu>80)")
+
+
+class ServerFrame:
+    """Servidores en columnas, con filtros, orden y agregados vectorizados"""
+
+    def __init__(self, columns: Dict[str, Sequence], size: int, np=None):
+        self.columns = columns
+        self.size = size
+        self.np = np
+
+    @classmethod
+    def from_records(cls, servers: List[Dict], use_numpy: Optional[bool] = None) -> 'ServerFrame':
+        """Construye las columnas en una pasada por campo"""
+        np = _numpy() if use_numpy is not False else None
+
+        columns = {}
+        for field in TEXT_FIELDS:
+            values = [s.get(field) or '' for s in servers]
+            columns[field] = np.array(values, dtype=object) if np is not None else values
+        for field in NUMERIC_FIELDS:
+            values = (s.get(field) or 0 for s in servers)
+            columns[field] = (np.fromiter(values, dtype=float, count=len(servers)) if np is not None
+                              else array('d', values))
+
+        # Posición de cada fila en `servers`, para recuperar el registro original
+        columns['_row'] = np.arange(len(servers)) if np is not None else array('l', range(len(servers)))
+
+        frame = cls(columns, len(servers), np)
+        frame.columns['cpu_pct'] = frame._ratio('used_vcpus', 'total_vcpus')
+        frame.columns['ram_pct'] = frame._ratio('used_ram', 'total_ram')
+        return frame
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, field: str) -> Sequence:
+        return self.columns[resolve_field(field)]
+
+    def _ratio(self, used: str, total: str):
+        """Porcentaje used/total (0 donde total es 0)"""
+        used, total = self.columns[used], self.columns[total]
+        np = self.np
+        if np is not None:
+            out = np.zeros(self.size)
+            np.divide(used, total, out=out, where=total > 0)
+            return out * 100
+        return array('d', (u / t * 100 if t > 0 else 0.0 for u, t in zip(used, total)))
+
+    def _take(self, indices) -> 'ServerFrame':
+        """Nuevo frame con las filas indicadas (en ese orden)"""
+        if self.np is not None:
+            columns = {name: col[indices] for name, col in self.columns.items()}
+            return ServerFrame(columns, len(indices), self.np)
+        columns = {}
+        for name, col in self.columns.items():
+            values = [col[i] for i in indices]
+            columns[name] = array(col.typecode, values) if isinstance(col, array) else values
+        return ServerFrame(columns, len(indices))
+
+    # === CONSULTAS ===
+
+    def _mask(self, condition: Condition):
+        column = self.columns[condition.field]
+        op, value = _OPERATORS[condition.op], condition.value
+        np = self.np
+
+        if condition.field in TEXT_FIELDS and any(c in value for c in '*?['):
+            matched = [fnmatch.fnmatchcase(v, value) for v in column]
+            if op is operator.ne:
+                matched = [not m for m in matched]
+            return np.array(matched, dtype=bool) if np is not None else matched
+
+        if np is not None:
+            return op(column, value)
+        return [op(v, value) for v in column]
+
+    def filter(self, conditions: List[Condition]) -> 'ServerFrame':
+        """Filas que cumplen todas las condiciones"""
+        if not conditions:
+            return self
+        np = self.np
+        if np is not None:
+            mask = np.ones(self.size, dtype=bool)
+            for condition in conditions:
+                mask &= self._mask(condition)
+            return self._take(np.flatnonzero(mask))
+
+        mask = [True] * self.size
+        for condition in conditions:
+            mask = [a and b for a, b in zip(mask, self._mask(condition))]
+        return self._take([i for i, keep in enumerate(mask) if keep])
+
+    def sort(self, field: str, descending: bool = False) -> 'ServerFrame':
+        """Orden estable por un campo"""
+        column = self[field]
+        np = self.np
+        if np is not None:
+            if descending and column.dtype != object:
+                order = np.argsort(-column, kind='stable')
+            else:
+                order = np.argsort(column, kind='stable')
+                if descending:
+                    order = order[::-1]
+            return self._take(order)
+        order = sorted(range(self.size), key=column.__getitem__, reverse=descending)
+        return self._take(order)
+
+    def head(self, n: int) -> 'ServerFrame':
+        """Primeras n filas"""
+        if n >= self.size:
+            return self
+        if self.np is not None:
+            return self._take(self.np.arange(n))
+        return self._take(range(n))
+
+    def originals(self, records: List[Dict]) -> Iterator[Dict]:
+        """Registros de `records` (la lista usada en from_records) en el orden del frame"""
+        rows = self.columns['_row']
+        return (records[i] for i in (rows.tolist() if self.np is not None else rows))
+
+    def rows(self, fields: Sequence[str]) -> Iterator[tuple]:
+        """Tuplas con los campos pedidos, fila a fila"""
+        columns = [self[field] for field in fields]
+        if self.np is not None:
+            columns = [col.tolist() for col in columns]
+        return zip(*columns)
+
+    # === AGREGADOS ===
+
+    def aggregate(self, by: str) -> List[Dict]:
+        """Totales y utilización (suma, media y p95) por infraestructura o zona"""
+        by = resolve_field(by)
+        if by not in GROUP_FIELDS:
+            raise ValueError(f"Cannot group by '{by}' (use {' or '.join(GROUP_FIELDS)})")
+        if self.np is not None:
+            return self._aggregate_numpy(by)
+
+        groups: Dict[str, List[int]] = {}
+        for i, key in enumerate(self.columns[by]):
+            groups.setdefault(key, []).append(i)
+
+        c = self.columns
+        result = []
+        for key in sorted(groups):
+            idx = groups[key]
+            sums = {f: sum(c[f][i] for i in idx) for f in NUMERIC_FIELDS}
+            cpu = [c['cpu_pct'][i] for i in idx]
+            ram = [c['ram_pct'][i] for i in idx]
+            active = sum(1 for i in idx if c['status'][i] == 'active')
+            result.append(_group_record(by, key, len(idx), active, sums,
+                                        sum(cpu) / len(idx), percentile(cpu, 95),
+                                        sum(ram) / len(idx), percentile(ram, 95)))
+        return result
+
+    def _aggregate_numpy(self, by: str) -> List[Dict]:
+        np = self.np
+        c = self.columns
+        keys, inverse, counts = np.unique(c[by].astype(str), return_inverse=True, return_counts=True)
+        n = len(keys)
+
+        sums = {f: np.bincount(inverse, weights=c[f], minlength=n) for f in NUMERIC_FIELDS}
+        active = np.bincount(inverse, weights=(c['status'] == 'active'), minlength=n)
+        cpu_mean = np.bincount(inverse, weights=c['cpu_pct'], minlength=n) / counts
+        ram_mean = np.bincount(inverse, weights=c['ram_pct'], minlength=n) / counts
+
+        # p95 por grupo: ordenar por grupo y partir en bloques contiguos
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.cumsum(counts)[:-1]
+        cpu_groups = np.split(c['cpu_pct'][order], bounds)
+        ram_groups = np.split(c['ram_pct'][order], bounds)
+
+        return [
+            _group_record(by, str(keys[g]), int(counts[g]), int(active[g]),
+                          {f: float(sums[f][g]) for f in NUMERIC_FIELDS},
+                          float(cpu_mean[g]), float(np.percentile(cpu_groups[g], 95)),
+                          float(ram_mean[g]), float(np.percentile(ram_groups[g], 95)))
+            for g in range(n)
+        ]
+
+
+def _group_record(by: str, key: str, servers: int, active: int, sums: Dict[str, float],
+                  cpu_mean: float, cpu_p95: float, ram_mean: float, ram_p95: float) -> Dict:
+    """Registro de agregados de un grupo"""
+    def pct(used, total):
+        return sums[used] / sums[total] * 100 if sums[total] else 0.0
+
+    return {
+        by: key,
+        'servers': servers,
+        'active_servers': active,
+        'used_vcpus': int(sums['used_vcpus']),
+        'total_vcpus': int(sums['total_vcpus']),
+        'used_ram': int(sums['used_ram']),
+        'total_ram': int(sums['total_ram']),
+        'active_vms': int(sums['active_vms']),
+        'cpu_utilization': round(pct('used_vcpus', 'total_vcpus'), 2),
+        'cpu_mean': round(cpu_mean, 2),
+        'cpu_p95': round(cpu_p95, 2),
+        'ram_utilization': round(pct('used_ram', 'total_ram'), 2),
+        'ram_mean': round(ram_mean, 2),
+        'ram_p95': round(ram_p95, 2),
+    }
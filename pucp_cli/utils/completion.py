@@ -0,0 +1,322 @@
+"""
+Completado de shell (bash, zsh, fish) sin red
+
+Los nombres e IDs de slices salen del índice local de slices
+(~/.pucp-cli/slice_index.json) y los hostnames, zonas e infraestructuras
+de un índice de hosts en texto (~/.pucp-cli/hosts_index). Los dos se
+escriben en segundo plano al terminar los comandos que ya descargan esos
+listados (slice list, resource servers). Completar nunca
+hace una request: si los índices son viejos se lanza `pucp completion
+refresh` como proceso aparte y se responde con lo que haya.
+
+Los casos más frecuentes (argumento de slice, --infrastructure, --zone,
+--host, --slice) se resuelven en `fast_complete` antes de importar click y
+los módulos de comandos; el resto pasa por el completado de click, que usa
+los mismos callbacks (`complete_slices`, `complete_hosts`, ...).
+
+    eval "$(pucp completion script bash)"
+"""
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config import Config
+from . import jsoncodec
+
+HOSTS_INDEX = "hosts_index"
+SLICE_INDEX = "slice_index.json"  # Lo escribe SliceIndex
+
+# Antigüedad a partir de la cual completar lanza un refresco en segundo plano
+REFRESH_AFTER = 600.0
+# Un refresco lanzado hace menos de esto se considera en curso
+REFRESH_COOLDOWN = 60.0
+
+DEFAULT_INFRASTRUCTURES = ('linux', 'openstack')
+
+# Comandos `slice <cmd> NOMBRE...`: máximo de nombres y flags sin valor.
+# Debe coincidir con los argumentos que llevan shell_complete=complete_slices
+SLICE_ARGUMENT_COMMANDS = {
+    'show': (1, ('--json',)),
+    'deploy': (None, ('--watch',)),
+    'wait': (None, ()),
+    'delete': (None, ('--force',)),
+}
+
+# Opciones globales que consumen un valor (para saltarlas al buscar el comando)
+_GLOBAL_VALUE_OPTIONS = ('--format', '--trace-format', '--profile')
+
+
+# === ÍNDICES ===
+
+class HostIndex:
+    """Hostnames con su infraestructura y zona, una línea por host"""
+
+    def __init__(self, config: Config):
+        self.path = config.config_dir / HOSTS_INDEX
+        self.hosts: Dict[str, Tuple[str, str]] = {}  # hostname → (infraestructura, zona)
+        self.load()
+
+    def load(self):
+        """Carga el índice desde disco"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    hostname, _, rest = line.rstrip('\n').partition('\t')
+                    infrastructure, _, zone = rest.partition('\t')
+                    if hostname:
+                        self.hosts[hostname] = (infrastructure, zone)
+        except OSError:
+            self.hosts = {}
+
+    def save(self):
+        """Guarda el índice ordenado (escritura atómica)"""
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for hostname in sorted(self.hosts):
+                infrastructure, zone = self.hosts[hostname]
+                f.write(f"{hostname}\t{infrastructure}\t{zone}\n")
+        os.replace(tmp, self.path)
+
+    def update(self, servers: Iterable[Dict], complete: bool = True):
+        """Registra los servidores de un listado (completo: reemplaza el índice)"""
+        hosts = {} if complete else self.hosts
+        for server in servers:
+            hostname = server.get('hostname')
+            if hostname:
+                hosts[_clean(hostname)] = (_clean(server.get('infrastructure') or ''),
+                                           _clean(server.get('zone_name') or ''))
+        self.hosts = hosts
+        self.save()
+
+
+def _clean(value: str) -> str:
+    """Sin tabuladores ni saltos de línea (separadores del archivo)"""
+    return str(value).replace('\t', ' ').replace('\n', ' ')
+
+
+def load_slice_names(config: Config) -> Dict[str, str]:
+    """Nombre → ID del índice de slices, sin importar el cliente HTTP"""
+    try:
+        with open(config.config_dir / SLICE_INDEX, 'rb') as f:
+            return jsoncodec.loads(f.read()).get('names', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _age(path: Path) -> Optional[float]:
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def in_background(func, *args, **kwargs) -> threading.Thread:
+    """Ejecuta `func` en un hilo (no daemon: el proceso espera a que termine
+    al salir, pero la salida del comando no espera a la escritura)"""
+    def run():
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            pass  # Un índice de completado que no se pudo escribir no es un error del comando
+    thread = threading.Thread(target=run, name='pucp-index')
+    thread.start()
+    return thread
+
+
+def spawn_refresh(config: Config) -> bool:
+    """Lanza `pucp completion refresh` desacoplado si los índices están viejos
+
+    No espera a nada: completar sigue con los datos que haya.
+    """
+    if config.get_token() is None:
+        return False
+    ages = [_age(config.config_dir / name) for name in (SLICE_INDEX, HOSTS_INDEX)]
+    if all(age is not None and age < REFRESH_AFTER for age in ages):
+        return False
+
+    marker = config.config_dir / "completion_refresh"
+    marker_age = _age(marker)
+    if marker_age is not None and marker_age < REFRESH_COOLDOWN:
+        return False
+    # Sin las variables del completado: si no, el hijo respondería otra vez a la shell
+    env = {k: v for k, v in os.environ.items()
+           if k not in ('_PUCP_COMPLETE', 'COMP_WORDS', 'COMP_CWORD')}
+    try:
+        config.config_dir.mkdir(exist_ok=True)
+        marker.touch()
+        subprocess.Popen([sys.executable, '-m', 'pucp_cli', 'completion', 'refresh', '--quiet'],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, env=env, start_new_session=True)
+    except OSError:
+        return False
+    return True
+
+
+# === CANDIDATOS ===
+
+def slice_candidates(config: Config, incomplete: str,
+                     exclude: Sequence[str] = ()) -> List[Tuple[str, str]]:
+    """(valor, ayuda) de slices por nombre y, si el prefijo lo pide, por ID"""
+    names = load_slice_names(config)
+    spawn_refresh(config)
+    skip = set(exclude)
+    result = [(name, slice_id[:8]) for name, slice_id in sorted(names.items())
+              if name.startswith(incomplete) and name not in skip]
+    if incomplete:
+        result.extend((slice_id, name) for name, slice_id in sorted(names.items())
+                      if slice_id.startswith(incomplete) and slice_id not in skip)
+    return result
+
+
+def host_candidates(config: Config, incomplete: str) -> List[Tuple[str, str]]:
+    """(hostname, infraestructura y zona)"""
+    hosts = HostIndex(config).hosts
+    spawn_refresh(config)
+    return [(hostname, f"{infrastructure} {zone}".strip()) for hostname, (infrastructure, zone)
+            in sorted(hosts.items()) if hostname.startswith(incomplete)]
+
+
+def zone_candidates(config: Config, incomplete: str) -> List[Tuple[str, str]]:
+    """Zonas vistas en el índice de hosts"""
+    zones = {zone for _, zone in HostIndex(config).hosts.values() if zone}
+    return [(zone, '') for zone in sorted(zones) if zone.startswith(incomplete)]
+
+
+def infrastructure_candidates(config: Config, incomplete: str) -> List[Tuple[str, str]]:
+    """Infraestructuras conocidas más las vistas en el índice de hosts"""
+    known = set(DEFAULT_INFRASTRUCTURES)
+    known.update(infrastructure for infrastructure, _ in HostIndex(config).hosts.values() if infrastructure)
+    return [(name, '') for name in sorted(known) if name.startswith(incomplete)]
+
+
+# Opción → candidatos (las mismas opciones llevan el callback equivalente)
+_OPTION_CANDIDATES = {
+    '--infrastructure': infrastructure_candidates,
+    '--zone': zone_candidates,
+    '--host': host_candidates,
+    '--slice': slice_candidates,
+}
+
+
+# === CALLBACKS DE CLICK ===
+
+def _items(candidates: List[Tuple[str, str]]) -> List:
+    from click.shell_completion import CompletionItem
+    return [CompletionItem(value, help=help or None) for value, help in candidates]
+
+
+def complete_slices(ctx, param, incomplete: str) -> List:
+    """Nombres e IDs de slices del índice local"""
+    already = ctx.params.get(param.name) or ()
+    if isinstance(already, str):
+        already = (already,)
+    return _items(slice_candidates(Config(), incomplete, already))
+
+
+def complete_hosts(ctx, param, incomplete: str) -> List:
+    """Hostnames del índice local"""
+    return _items(host_candidates(Config(), incomplete))
+
+
+def complete_zones(ctx, param, incomplete: str) -> List:
+    """Zonas del índice local"""
+    return _items(zone_candidates(Config(), incomplete))
+
+
+def complete_infrastructures(ctx, param, incomplete: str) -> List:
+    """Infraestructuras conocidas"""
+    return _items(infrastructure_candidates(Config(), incomplete))
+
+
+# === CAMINO RÁPIDO (sin click) ===
+
+def _split(value: str) -> List[str]:
+    """Como click.shell_completion.split_arg_string: tolera comillas sin cerrar"""
+    lex = shlex.shlex(value, posix=True)
+    lex.whitespace_split = True
+    lex.commenters = ''
+    out = []
+    try:
+        out.extend(lex)
+    except ValueError:
+        out.append(lex.token)
+    return out
+
+
+def _completion_args(shell: str, environ) -> Tuple[List[str], str]:
+    """(argumentos anteriores, palabra incompleta) como los calcula click"""
+    words = _split(environ['COMP_WORDS'])
+    if shell == 'fish':
+        incomplete = environ['COMP_CWORD']
+        if incomplete:
+            incomplete = _split(incomplete)[0]
+        args = words[1:]
+        if incomplete and args and args[-1] == incomplete:
+            args.pop()
+        return args, incomplete
+    cword = int(environ['COMP_CWORD'])
+    return words[1:cword], words[cword] if cword < len(words) else ''
+
+
+def _fast_candidates(config: Config, args: List[str],
+                     incomplete: str) -> Optional[List[Tuple[str, str]]]:
+    """Candidatos de los casos conocidos; None si debe decidir click"""
+    if incomplete.startswith('-'):
+        return None  # Nombres de opciones: los conoce click
+    if args and args[-1] in _OPTION_CANDIDATES:
+        return _OPTION_CANDIDATES[args[-1]](config, incomplete)
+
+    i = 0
+    while i < len(args) and args[i].startswith('-'):
+        i += 2 if args[i] in _GLOBAL_VALUE_OPTIONS else 1
+    if args[i:i + 1] != ['slice'] or len(args) < i + 2 or args[i + 1] not in SLICE_ARGUMENT_COMMANDS:
+        return None
+
+    max_names, flags = SLICE_ARGUMENT_COMMANDS[args[i + 1]]
+    names = []
+    for word in args[i + 2:]:
+        if word == '--' or (word.startswith('-') and word not in flags):
+            return None  # Opción con valor u otra cosa: click sabe cómo leerla
+        if not word.startswith('-'):
+            names.append(word)
+    if max_names is not None and len(names) >= max_names:
+        return []
+    return slice_candidates(config, incomplete, names)
+
+
+def _format(shell: str, value: str, help: str) -> str:
+    """Una línea del protocolo de completado de click"""
+    if shell == 'zsh':
+        if not help:
+            return f"plain\n{value}\n_"
+        return f"plain\n{value.replace(':', chr(92) + ':')}\n{help}"
+    if shell == 'fish' and help:
+        return f"plain,{value}\t{help}"
+    return f"plain,{value}"
+
+
+def fast_complete(prog_name: str = 'pucp', environ=None) -> bool:
+    """Responde una petición de completado sin importar click; False si no puede"""
+    environ = os.environ if environ is None else environ
+    instruction = environ.get(f"_{prog_name.upper().replace('-', '_')}_COMPLETE", '')
+    shell, _, action = instruction.partition('_')
+    if action != 'complete' or shell not in ('bash', 'zsh', 'fish'):
+        return False
+    try:
+        args, incomplete = _completion_args(shell, environ)
+    except (KeyError, ValueError):
+        return False
+
+    candidates = _fast_candidates(Config(), args, incomplete)
+    if candidates is None:
+        return False
+    lines = [_format(shell, value, help) for value, help in candidates]
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+    return True
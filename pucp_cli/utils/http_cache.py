@@ -0,0 +1,149 @@
+"""
+Caché en disco de respuestas GET (~/.pucp-cli/cache)
+
+Opt-in (`cache: true` en config.json, PUCP_CACHE=1 o `pucp --cache`). Solo
+se cachean los endpoints de ENDPOINT_POLICIES, que cambian poco; cada uno
+tiene un TTL y una ventana "stale" en la que se devuelve la copia guardada
+al instante y se revalida en segundo plano con GET condicional. El tamaño
+total está acotado: al superarlo se eliminan las entradas usadas hace más
+tiempo (el mtime de cada archivo se actualiza en cada acierto).
+
+    pucp --no-cache resource servers   # Ignorar la caché
+    pucp --refresh resource servers    # Descargar de nuevo y actualizar la caché
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from ..config import Config
+from . import jsoncodec
+
+# endpoint → (TTL, ventana stale adicional) en segundos
+ENDPOINT_POLICIES = {
+    '/resources': (30.0, 600.0),
+    '/api/vlans': (120.0, 3600.0),
+}
+
+_mode = None  # Forzado con las opciones globales; None = según la configuración
+
+
+def set_mode(mode: Optional[str]):
+    """Fija el modo para el resto del proceso (off, on, refresh)"""
+    global _mode
+    _mode = mode
+
+
+class CachePolicy(NamedTuple):
+    ttl: float
+    stale: float
+
+
+class CacheEntry(NamedTuple):
+    """Respuesta guardada"""
+    url: str
+    data: object
+    stored_at: float
+    validators: Dict
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.stored_at
+
+
+class ResponseCache:
+    """Respuestas JSON en archivos, con expulsión LRU por tamaño"""
+
+    def __init__(self, directory: Path, max_bytes: int, ttls: Optional[Dict] = None,
+                 refresh: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.refresh = refresh  # Escribir pero no leer (--refresh)
+        self.policies = {endpoint: CachePolicy(*policy) for endpoint, policy in ENDPOINT_POLICIES.items()}
+        for endpoint, ttl in (ttls or {}).items():
+            # config.json: {"cache_ttls": {"/resources": 60}}; la ventana stale se mantiene
+            stale = self.policies[endpoint].stale if endpoint in self.policies else 0.0
+            self.policies[endpoint] = CachePolicy(float(ttl), stale)
+
+    def policy(self, endpoint: str) -> Optional[CachePolicy]:
+        """Política del endpoint, o None si no se cachea"""
+        policy = self.policies.get(endpoint)
+        return policy if policy and policy.ttl > 0 else None
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict], identity: str) -> str:
+        """Clave por URL, parámetros y usuario"""
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{identity}\n{url}\n{query}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Entrada guardada (fresca o no); None si no existe o está dañada"""
+        if self.refresh:
+            return None
+        return self.peek(key)
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Como get, también con --refresh (para pintar algo mientras se descarga)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                raw = jsoncodec.loads(f.read())
+            os.utime(path)  # Acceso reciente para la expulsión LRU
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(raw['url'], raw['data'], raw['stored_at'], raw.get('validators') or {})
+
+    def put(self, key: str, url: str, data, validators: Optional[Dict] = None,
+            stored_at: Optional[float] = None):
+        """Guarda una respuesta (escritura atómica) y expulsa si se supera el tamaño"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(jsoncodec.dumpb({'url': url, 'stored_at': stored_at or time.time(),
+                                     'validators': validators or {}, 'data': data}))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+        self.evict()
+
+    def touch(self, key: str, entry: CacheEntry):
+        """Marca como fresca una entrada revalidada (304)"""
+        self.put(key, entry.url, entry.data, entry.validators)
+
+    def evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes"""
+        try:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                     for e in os.scandir(self.directory) if e.name.endswith('.json')]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Vacía la caché"""
+        if self.directory.exists():
+            for entry in os.scandir(self.directory):
+                os.unlink(entry.path)
+
+
+def open_cache(config: Config) -> Optional[ResponseCache]:
+    """Caché según la configuración y el modo del proceso; None si está desactivada"""
+    mode = _mode or ('on' if config.cache else 'off')
+    if mode == 'off':
+        return None
+    return ResponseCache(config.config_dir / "cache", int(config.cache_max_size),
+                         config.cache_ttls, refresh=(mode == 'refresh'))
@@ -0,0 +1,75 @@
+"""
+Codificación y decodificación JSON con backend rápido opcional
+
+Usa orjson si está instalado (pip install "pucp-cli[fast]") y la librería
+estándar si no. La salida es byte a byte la de `json.dumps(...,
+ensure_ascii=False)` con separadores compactos o `indent=2`: los pocos
+casos en que orjson escribe distinto (floats en notación exponencial,
+enteros de más de 64 bits, claves no serializables) se detectan y se
+codifican con la librería estándar. Quedan fuera NaN/Infinity, que orjson
+escribe como null (la API nunca los envía: no son JSON válido).
+
+    from pucp_cli.utils import jsoncodec
+    data = jsoncodec.loads(response.content)
+    stream.write(jsoncodec.dumps(records, indent=True))
+"""
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Floats que orjson y repr() formatean distinto: con exponente y |x| < 1e-4
+# (orjson escribe 0.0000…). Puede coincidir dentro de una cadena: en ese caso
+# solo se pierde velocidad. Empieza por un literal para que la búsqueda sea rápida
+_EXPONENT = re.compile(rb'e(?<=\de)[-+]?\d')
+_SMALL_FLOAT = b'0.0000'
+
+_COMPACT = (',', ':')
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decodifica un documento JSON"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity o enteros enormes: lo que acepte json lo decide
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+def dumpb(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Codifica a bytes UTF-8 (compacto, o con indent=2)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            out = orjson.dumps(obj, option=option)
+        except TypeError:
+            out = None
+        if out is not None and _SMALL_FLOAT not in out and not _EXPONENT.search(out):
+            return out
+    return _stdlib_dumps(obj, indent, sort_keys).encode('utf-8')
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Codifica a texto (compacto, o con indent=2)"""
+    if orjson is None:
+        return _stdlib_dumps(obj, indent, sort_keys)
+    return dumpb(obj, indent, sort_keys).decode('utf-8')
+
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool) -> str:
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    return json.dumps(obj, separators=_COMPACT, ensure_ascii=False, sort_keys=sort_keys)
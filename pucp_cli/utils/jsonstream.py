@@ -0,0 +1,171 @@
+"""
+Extracción incremental de campos de un documento JSON
+
+`select_fields` lee el cuerpo de una respuesta por bloques y decodifica
+solo los valores de primer nivel pedidos; el resto se salta con
+expresiones regulares sobre los bytes (un objeto plano por búsqueda) sin
+construir objetos, con memoria constante en lugar de proporcional al
+documento. En cuanto aparecen todos los campos deja de leer, así que el
+resto del cuerpo ni siquiera se descarga.
+
+    data = select_fields(response.iter_content(65536), ['vm_flavors'])
+
+Si el documento no es un objeto se devuelve completo.
+"""
+import re
+from typing import Dict, Iterable, Optional, Sequence
+
+from . import jsoncodec
+
+CHUNK_SIZE = 64 * 1024
+
+_WS = re.compile(rb'[ \t\r\n]*')
+_STRING_RE = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_RE)
+_SCALAR = re.compile(rb'[^,}\] \t\r\n]+')
+# Texto sin corchetes (cadenas completas incluidas) y contenedor sin hijos
+# contenedores: un objeto plano de un listado se salta con una sola búsqueda
+_RUN_RE = rb'[^"{}\[\]]*(?:' + _STRING_RE + rb'[^"{}\[\]]*)*'
+_RUN = re.compile(_RUN_RE)
+_FLAT = re.compile(rb'[{\[]' + _RUN_RE + rb'[}\]]')
+
+_QUOTE, _COLON, _COMMA = ord('"'), ord(':'), ord(',')
+_OPEN = (ord('{'), ord('['))
+_CLOSE_OBJECT = ord('}')
+
+
+class _Reader:
+    """Buffer sobre un iterable de bloques de bytes"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.buf = bytearray()
+        self.pos = 0
+        self.mark: Optional[int] = None  # Inicio del valor que se está capturando
+
+    def fill(self) -> bool:
+        """Añade un bloque descartando lo ya consumido; False al final del cuerpo"""
+        keep = self.pos if self.mark is None else self.mark
+        if keep:
+            del self.buf[:keep]
+            self.pos -= keep
+            if self.mark is not None:
+                self.mark -= keep
+        for chunk in self.chunks:
+            if chunk:
+                self.buf += chunk
+                return True
+        return False
+
+    def peek(self) -> int:
+        """Siguiente byte que no sea espacio"""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, byte: int):
+        if self.peek() != byte:
+            raise ValueError(f"Expected '{chr(byte)}' at offset {self.pos}")
+        self.pos += 1
+
+    def skip_string(self):
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return
+            if not self.fill():
+                raise ValueError("Unterminated string in JSON document")
+
+    def skip_container(self):
+        depth = 0
+        while True:
+            if depth:
+                # Hasta el siguiente corchete; si el bloque se acaba (o corta una cadena), leer más
+                self.pos = _RUN.match(self.buf, self.pos).end()
+                if self.pos == len(self.buf) or self.buf[self.pos] == _QUOTE:
+                    if not self.fill():
+                        raise ValueError("Unexpected end of JSON document")
+                    continue
+            match = _FLAT.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+            else:
+                depth += 1 if self.buf[self.pos] in _OPEN else -1
+                self.pos += 1
+                if depth < 0:
+                    raise ValueError(f"Unbalanced bracket at offset {self.pos - 1}")
+            if depth == 0:
+                return
+
+    def skip_value(self):
+        byte = self.peek()
+        if byte == _QUOTE:
+            self.skip_string()
+        elif byte in _OPEN:
+            self.skip_container()
+        else:
+            while True:
+                match = _SCALAR.match(self.buf, self.pos)
+                if match is None:
+                    raise ValueError(f"Expected a JSON value at offset {self.pos}")
+                end = match.end()
+                if end < len(self.buf) or not self.fill():
+                    self.pos = end
+                    return
+
+    def read_value(self):
+        """Decodifica el siguiente valor"""
+        self.peek()
+        self.mark = self.pos
+        self.skip_value()
+        raw = bytes(self.buf[self.mark:self.pos])
+        self.mark = None
+        return jsoncodec.loads(raw)
+
+    def rest(self) -> bytes:
+        """Lo que queda del cuerpo desde la posición actual"""
+        self.mark = self.pos
+        while self.fill():
+            pass
+        self.mark = None
+        return bytes(self.buf[self.pos:])
+
+
+def select_fields(chunks: Iterable[bytes], fields: Sequence[str]) -> Dict:
+    """Campos de primer nivel `fields` del objeto JSON que llega en `chunks`"""
+    reader = _Reader(chunks)
+    if reader.peek() != ord('{'):
+        return jsoncodec.loads(reader.rest())
+
+    wanted = set(fields)
+    result = {}
+    reader.pos += 1
+    if reader.peek() == _CLOSE_OBJECT:
+        return result
+
+    while wanted:
+        key = reader.read_value()
+        reader.expect(_COLON)
+        if key in wanted:
+            result[key] = reader.read_value()
+            wanted.discard(key)
+        else:
+            reader.skip_value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == _CLOSE_OBJECT:
+            break
+        if separator != _COMMA:
+            raise ValueError(f"Expected ',' or '}}' at offset {reader.pos - 1}")
+    return result
+
+
+def project(data, fields: Optional[Sequence[str]]):
+    """Aplica la proyección a un documento ya decodificado"""
+    if not fields or not isinstance(data, dict):
+        return data
+    return {key: data[key] for key in fields if key in data}
@@ -0,0 +1,156 @@
+"""
+Simulador de colocación de slices
+
+Reproduce en el cliente la pregunta "¿cabe este slice?" antes de mandarlo
+al orquestador: cada nodo se coloca con best-fit (el servidor activo de la
+misma infraestructura que menos vCPUs libres deja tras colocarlo, y que
+además tenga RAM suficiente). Los nodos de un slice se colocan de mayor a
+menor y, si alguno no cabe, el slice entero se descarta sin consumir
+capacidad, igual que un despliegue fallido.
+
+Por infraestructura, los servidores se mantienen ordenados por vCPUs libres
+para encontrar el candidato con búsqueda binaria en lugar de recorrer toda
+la flota por cada nodo.
+"""
+import bisect
+from typing import Dict, List, NamedTuple, Optional
+
+
+class NodePlacement(NamedTuple):
+    """Resultado de colocar un nodo"""
+    slice: str
+    node: str
+    flavor: str
+    vcpus: int
+    ram: int
+    host: Optional[str]
+    reason: Optional[str] = None
+
+
+class SlicePlan(NamedTuple):
+    """Resultado de planificar un slice"""
+    name: str
+    infrastructure: str
+    fits: bool
+    nodes: List[NodePlacement]
+    reason: Optional[str] = None
+
+
+class _Host:
+    __slots__ = ('hostname', 'infrastructure', 'free_vcpus', 'free_ram', 'total_vcpus', 'total_ram')
+
+    def __init__(self, server: Dict):
+        self.hostname = server.get('hostname') or 'unknown'
+        self.infrastructure = server.get('infrastructure')
+        self.total_vcpus = int(server.get('total_vcpus') or 0)
+        self.total_ram = int(server.get('total_ram') or 0)
+        self.free_vcpus = max(0, self.total_vcpus - int(server.get('used_vcpus') or 0))
+        self.free_ram = max(0, self.total_ram - int(server.get('used_ram') or 0))
+
+
+class PlacementSimulator:
+    """Capacidad libre de la flota y colocación best-fit de slices
+
+    Uso:
+        sim = PlacementSimulator(data['servers'], data['vm_flavors'])
+        for spec in specs:
+            plan = sim.place(spec)
+    """
+
+    def __init__(self, servers: List[Dict], flavors: Dict[str, Dict]):
+        self.flavors = flavors
+        self.hosts = [_Host(s) for s in servers if s.get('status', 'active') == 'active']
+
+        # infraestructura → lista ordenada de (vCPUs libres, RAM libre, índice)
+        self._free: Dict[str, List[tuple]] = {}
+        for i, host in enumerate(self.hosts):
+            self._free.setdefault(host.infrastructure, []).append((host.free_vcpus, host.free_ram, i))
+        for entries in self._free.values():
+            entries.sort()
+
+    def _take(self, infrastructure: str, vcpus: int, ram: int) -> Optional[int]:
+        """Reserva vcpus/ram en el servidor best-fit; devuelve su índice"""
+        entries = self._free.get(infrastructure)
+        if not entries:
+            return None
+
+        # Primer servidor con vCPUs suficientes; de ahí en adelante, el primero con RAM
+        pos = bisect.bisect_left(entries, (vcpus, -1, -1))
+        while pos < len(entries) and entries[pos][1] < ram:
+            pos += 1
+        if pos == len(entries):
+            return None
+
+        free_vcpus, free_ram, index = entries.pop(pos)
+        host = self.hosts[index]
+        host.free_vcpus, host.free_ram = free_vcpus - vcpus, free_ram - ram
+        bisect.insort(entries, (host.free_vcpus, host.free_ram, index))
+        return index
+
+    def _release(self, index: int, vcpus: int, ram: int):
+        """Devuelve la capacidad reservada por _take"""
+        host = self.hosts[index]
+        entries = self._free[host.infrastructure]
+        entries.pop(bisect.bisect_left(entries, (host.free_vcpus, host.free_ram, index)))
+        host.free_vcpus += vcpus
+        host.free_ram += ram
+        bisect.insort(entries, (host.free_vcpus, host.free_ram, index))
+
+    def place(self, spec: Dict) -> SlicePlan:
+        """Coloca los nodos de un slice (forma del payload de create_slice)"""
+        name = spec.get('name') or 'unnamed'
+        infrastructure = spec.get('infrastructure') or 'linux'
+        nodes = spec.get('nodes') or []
+
+        # Nodos de mayor a menor: los grandes son los que más cuesta encajar
+        demands = []
+        for node in nodes:
+            flavor_name = node.get('flavor') or 'small'
+            flavor = self.flavors.get(flavor_name)
+            if flavor is None:
+                placement = NodePlacement(name, node.get('name', '?'), flavor_name, 0, 0, None,
+                                          f"unknown flavor '{flavor_name}'")
+                return SlicePlan(name, infrastructure, False, [placement], placement.reason)
+            demands.append((int(flavor.get('vcpus') or 0), int(flavor.get('ram') or 0),
+                            node.get('name', '?'), flavor_name))
+        demands.sort(key=lambda d: (d[0], d[1]), reverse=True)
+
+        taken = []
+        placements = []
+        failure = None
+        for vcpus, ram, node_name, flavor_name in demands:
+            index = self._take(infrastructure, vcpus, ram) if failure is None else None
+            if index is None:
+                if failure is None:
+                    failure = f"no {infrastructure} server with {vcpus} vCPUs and {ram} MB RAM free"
+                placements.append(NodePlacement(name, node_name, flavor_name, vcpus, ram, None, failure))
+                continue
+            taken.append((index, vcpus, ram))
+            placements.append(NodePlacement(name, node_name, flavor_name, vcpus, ram,
+                                            self.hosts[index].hostname))
+
+        if failure is not None:
+            # Todo o nada: el slice no se despliega a medias
+            for index, vcpus, ram in reversed(taken):
+                self._release(index, vcpus, ram)
+            placements = [p._replace(host=None, reason=p.reason or 'slice does not fit')
+                          for p in placements]
+            return SlicePlan(name, infrastructure, False, placements, failure)
+
+        return SlicePlan(name, infrastructure, True, placements)
+
+    def headroom(self) -> Dict[str, Dict]:
+        """Capacidad libre restante por infraestructura"""
+        result: Dict[str, Dict] = {}
+        for host in self.hosts:
+            stat = result.setdefault(host.infrastructure, {
+                'servers': 0, 'free_vcpus': 0, 'total_vcpus': 0, 'free_ram': 0, 'total_ram': 0,
+                'largest_vcpus': 0, 'largest_ram': 0})
+            stat['servers'] += 1
+            stat['free_vcpus'] += host.free_vcpus
+            stat['total_vcpus'] += host.total_vcpus
+            stat['free_ram'] += host.free_ram
+            stat['total_ram'] += host.total_ram
+            stat['largest_vcpus'] = max(stat['largest_vcpus'], host.free_vcpus)
+            stat['largest_ram'] = max(stat['largest_ram'], host.free_ram)
+        return result
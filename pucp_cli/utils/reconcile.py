@@ -0,0 +1,221 @@
+"""
+Reconciliación de slices declarados contra los existentes
+
+Cada definición se normaliza (valores por defecto, nodos y redes ordenados
+por nombre, sin campos que asigna el orquestador) y se resume en una huella
+SHA-256. El plan sale de un único recorrido en paralelo de las dos listas
+ordenadas por nombre:
+
+    solo en la definición  → create
+    solo en el orquestador → delete (si se pide --prune)
+    en ambas               → update o no-op según la huella
+
+La huella del slice existente se calcula con lo que traiga el listado, con
+la caché local (~/.pucp-cli/slice_fingerprints.json) o, en último caso, con
+GET /slices/<id>.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..config import Config
+
+CREATE, UPDATE, DELETE, NOOP = 'create', 'update', 'delete', 'noop'
+
+_NODE_FIELDS = ('name', 'image', 'flavor')
+_NETWORK_FIELDS = ('name', 'cidr', 'network_type', 'vlan_id', 'internet_access')
+
+
+def normalize(data: Dict, pinned_vlans: Optional[Iterable[str]] = None) -> Dict:
+    """Forma canónica de un slice (definición o respuesta del orquestador)
+
+    `vlan_id` solo cuenta en las redes de `pinned_vlans` (las que lo fijan en
+    la definición); en el resto lo asigna el orquestador.
+    """
+    from ..models import NetworkSpec, NodeSpec
+
+    node_defaults = NodeSpec.model_fields
+    network_defaults = NetworkSpec.model_fields
+    pinned = set(pinned_vlans or ())
+
+    nodes = []
+    for node in data.get('nodes') or []:
+        nodes.append({f: node.get(f) if node.get(f) is not None else node_defaults[f].default
+                      for f in _NODE_FIELDS})
+
+    networks = []
+    for net in data.get('networks') or []:
+        entry = {f: net.get(f) if net.get(f) is not None else network_defaults[f].default
+                 for f in _NETWORK_FIELDS}
+        if entry['name'] not in pinned:
+            entry.pop('vlan_id')
+        networks.append(entry)
+
+    return {
+        'name': data.get('name'),
+        'description': data.get('description') or '',
+        'infrastructure': data.get('infrastructure') or 'linux',
+        'nodes': sorted(nodes, key=lambda n: n['name'] or ''),
+        'networks': sorted(networks, key=lambda n: n['name'] or ''),
+    }
+
+
+def fingerprint(normalized: Dict) -> str:
+    """Huella estable de una forma canónica"""
+    raw = json.dumps(normalized, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def pinned_vlans(payload: Dict) -> List[str]:
+    """Redes de una definición que fijan su VLAN"""
+    return [n['name'] for n in payload.get('networks') or [] if n.get('vlan_id') is not None]
+
+
+class Desired(NamedTuple):
+    """Slice declarado, ya validado"""
+    name: str
+    source: str
+    payload: Dict
+    fingerprint: str
+    pinned: List[str]
+
+
+def desired_from_specs(specs: Iterable[Tuple[str, object]]) -> List[Desired]:
+    """(origen, SliceSpec) → Desired con su huella"""
+    result = []
+    for source, spec in specs:
+        payload = spec.payload()
+        pinned = pinned_vlans(payload)
+        result.append(Desired(spec.name, source, payload, fingerprint(normalize(payload, pinned)), pinned))
+    return result
+
+
+class Change(NamedTuple):
+    """Acción del plan sobre un slice"""
+    action: str
+    name: str
+    desired: Optional[Desired] = None
+    live: Optional[Dict] = None
+
+    @property
+    def slice_id(self) -> Optional[str]:
+        return self.live.get('id') if self.live else None
+
+
+def diff(desired: List[Desired], live: List[Dict], prune: bool = False) -> List[Change]:
+    """Plan create/delete/candidatos en un solo recorrido de ambas listas
+
+    Los slices presentes en los dos lados salen como UPDATE provisional;
+    `resolve` decide después si en realidad son NOOP.
+    """
+    want = sorted(desired, key=lambda d: d.name)
+    have = sorted((s for s in live if s.get('name')), key=lambda s: s['name'])
+
+    changes = []
+    i = j = 0
+    while i < len(want) or j < len(have):
+        if j == len(have) or (i < len(want) and want[i].name < have[j]['name']):
+            changes.append(Change(CREATE, want[i].name, desired=want[i]))
+            i += 1
+        elif i == len(want) or have[j]['name'] < want[i].name:
+            if prune:
+                changes.append(Change(DELETE, have[j]['name'], live=have[j]))
+            j += 1
+        else:
+            changes.append(Change(UPDATE, want[i].name, desired=want[i], live=have[j]))
+            i += 1
+            j += 1
+    return changes
+
+
+class FingerprintCache:
+    """Última huella conocida de cada slice, por ID"""
+
+    def __init__(self, config: Config):
+        self.path = config.config_dir / "slice_fingerprints.json"
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """Carga la caché desde disco"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f).get('slices', {})
+        except Exception:
+            self.entries = {}  # Caché corrupta: se reconstruye
+
+    def save(self):
+        """Guarda la caché (escritura atómica)"""
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'slices': self.entries}, f)
+        os.replace(tmp, self.path)
+
+    def get(self, live: Dict) -> Optional[str]:
+        """Huella en caché si el slice no cambió desde que se guardó"""
+        entry = self.entries.get(live.get('id'))
+        if entry is None:
+            return None
+        # Si el listado trae marca de modificación, la entrada debe coincidir
+        if live.get('updated_at') and live.get('updated_at') != entry.get('updated_at'):
+            return None
+        return entry['fingerprint']
+
+    def put(self, slice_id: str, value: str, updated_at: Optional[str] = None):
+        self.entries[slice_id] = {'fingerprint': value, 'updated_at': updated_at}
+
+    def forget(self, *slice_ids: str):
+        for slice_id in slice_ids:
+            self.entries.pop(slice_id, None)
+
+
+def _has_spec(live: Dict) -> bool:
+    """El registro del listado ya trae nodos y redes"""
+    return 'nodes' in live and 'networks' in live
+
+
+def resolve(changes: List[Change], cache: FingerprintCache, fetch=None,
+            refresh: bool = False) -> List[Change]:
+    """Convierte los UPDATE provisionales en UPDATE o NOOP
+
+    El orden de preferencia para la huella del slice existente es: listado
+    con nodos y redes, caché y, para los que queden, `fetch(changes)`, que
+    devuelve {id: detalle} (normalmente GET /slices/<id> en paralelo). Con
+    `refresh` se ignora la caché.
+    """
+    live_fp: Dict[str, str] = {}
+    missing = []
+    for change in changes:
+        if change.action != UPDATE:
+            continue
+        live = change.live
+        if _has_spec(live):
+            live_fp[live['id']] = fingerprint(normalize(live, change.desired.pinned))
+            continue
+        cached = None if refresh else cache.get(live)
+        if cached is not None:
+            live_fp[live['id']] = cached
+        else:
+            missing.append(change)
+
+    if missing and fetch is not None:
+        details = fetch(missing)
+        for change in missing:
+            detail = details.get(change.slice_id)
+            if detail is not None:
+                live_fp[change.slice_id] = fingerprint(normalize(detail, change.desired.pinned))
+
+    result = []
+    for change in changes:
+        if change.action == UPDATE:
+            current = live_fp.get(change.slice_id)
+            if current is not None:
+                cache.put(change.slice_id, current, change.live.get('updated_at'))
+                if current == change.desired.fingerprint:
+                    change = change._replace(action=NOOP)
+        result.append(change)
+    return result
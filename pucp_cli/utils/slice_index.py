@@ -0,0 +1,134 @@
+"""
+Índice local nombre → ID de slices
+
+Evita descargar la lista completa de slices solo para traducir un nombre
+a su ID. El índice vive en ~/.pucp-cli/slice_index.json y se revalida con
+ETag / Last-Modified cuando hay un fallo de búsqueda.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..api_client import APIException, PUCPAPIClient
+from ..config import Config
+
+UUID_RE = re.compile(
+    r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+)
+
+
+def is_uuid(value: str) -> bool:
+    """Indica si el valor tiene forma de UUID"""
+    return bool(UUID_RE.match(value or ''))
+
+
+class SliceIndex:
+    """Índice persistente nombre → ID"""
+
+    def __init__(self, config: Config):
+        self.path = config.config_dir / "slice_index.json"
+        self.names: Dict[str, str] = {}
+        self.validators: Dict = {}
+        self.load()
+
+    def load(self):
+        """Carga el índice desde disco"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.names = data.get('names', {})
+            self.validators = data.get('validators', {})
+        except Exception:
+            self.names, self.validators = {}, {}  # Índice corrupto: se reconstruye
+
+    def save(self):
+        """Guarda el índice (escritura atómica)"""
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'names': self.names, 'validators': self.validators}, f)
+        os.replace(tmp, self.path)
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Busca el ID de un slice por nombre o ID"""
+        if name in self.names:
+            return self.names[name]
+        if name in self.names.values():
+            return name
+        return None
+
+    def update(self, slices: Iterable[Dict], validators: Optional[Dict] = None):
+        """Reconstruye el índice a partir de una lista completa de slices"""
+        self.names = {s['name']: s['id'] for s in slices if s.get('name') and s.get('id')}
+        self.validators = validators or {}
+        self.save()
+
+    def add(self, name: str, slice_id: str):
+        """Registra un slice recién creado"""
+        self.add_many([(name, slice_id)])
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]):
+        """Registra varios slices recién creados con una sola escritura"""
+        pairs = [(name, slice_id) for name, slice_id in pairs if name and slice_id]
+        if pairs:
+            self.names.update(pairs)
+            self.validators = {}  # El listado remoto ya no coincide con el índice
+            self.save()
+
+    def forget(self, *names: str):
+        """Elimina uno o varios slices (por nombre o ID) del índice"""
+        targets = set(names)
+        self.names = {k: v for k, v in self.names.items() if k not in targets and v not in targets}
+        self.validators = {}
+        self.save()
+
+    def refresh(self, client: PUCPAPIClient, force: bool = False) -> bool:
+        """Revalida el índice contra el servidor; devuelve True si cambió"""
+        slices, validators = client.list_slices_if_changed(None if force else self.validators)
+        if slices is None:
+            return False
+        self.update(slices, validators)
+        return True
+
+
+def resolve_slice_id(client: PUCPAPIClient, index: SliceIndex, name: str) -> Optional[str]:
+    """Traduce nombre → ID; solo consulta el servidor si el índice no lo conoce"""
+    if is_uuid(name):
+        return name
+
+    slice_id = index.lookup(name)
+    if slice_id:
+        return slice_id
+
+    index.refresh(client)
+    return index.lookup(name)
+
+
+def fetch_slice(client: PUCPAPIClient, index: SliceIndex, name: str) -> Optional[Dict]:
+    """Obtiene el detalle de un slice por nombre o ID (una sola request si hay acierto)"""
+    slice_id = resolve_slice_id(client, index, name)
+    if not slice_id:
+        return None
+
+    cached = not is_uuid(name)
+    try:
+        details = client.get_slice(slice_id)
+    except APIException as e:
+        if e.status_code != 404:
+            raise
+        if not cached:
+            return None
+        details = None
+
+    # Entrada obsoleta (slice eliminado o renombrado): reconstruir y reintentar una vez
+    if cached and (details is None or name not in (details.get('name'), details.get('id'))):
+        index.refresh(client, force=True)
+        slice_id = index.lookup(name)
+        if not slice_id:
+            return None
+        details = client.get_slice(slice_id)
+
+    return details
@@ -0,0 +1,23 @@
+"""
+Utilidades estadísticas ligeras (sin dependencias externas)
+"""
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentil por interpolación lineal (pct entre 0 y 100)"""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+
+    rank = (len(ordered) - 1) * (pct / 100.0)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return float(ordered[int(rank)])
+
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
@@ -0,0 +1,333 @@
+"""
+Histórico compacto de utilización del cluster
+
+Un archivo de registros de ancho fijo usado como buffer circular y mapeado
+en memoria (mmap): cada muestra de un servidor ocupa RECORD.size bytes y,
+al llenarse, las más antiguas se sobrescriben, así que el tamaño en disco
+está acotado. Los hostnames (con su infraestructura y zona) se guardan
+aparte, en un archivo JSON lines, y los registros solo llevan su ID.
+
+Las muestras se escriben en orden de tiempo, de modo que una consulta por
+rango localiza sus extremos con búsqueda binaria y lee solo ese tramo.
+"""
+import fnmatch
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .stats import percentile
+
+MAGIC = b'PUCPTS1\0'
+VERSION = 1
+
+# magic, versión, tamaño de registro, capacidad, próxima posición, registros válidos
+HEADER = struct.Struct('<8sIIQQQ')
+HEADER_SIZE = 64
+
+# timestamp (s), host_id, vCPUs usadas/totales, RAM usada/total (MB)
+RECORD = struct.Struct('<IIHHII')
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_DURATION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$')
+_DURATION_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*$', re.IGNORECASE)
+
+
+def parse_duration(value: str) -> float:
+    """'90s', '30m', '6h', '2d' → segundos"""
+    match = _DURATION_RE.match(value.lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{value}' (e.g. 30m, 6h, 2d)")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def parse_size(value: str) -> int:
+    """'64M', '512k', '1G' → bytes"""
+    match = _SIZE_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size '{value}' (e.g. 64M, 1G)")
+    return int(float(match.group(1)) * 1024 ** ' kmg'.index(match.group(2).lower() or ' '))
+
+
+def capacity_for(max_bytes: int) -> int:
+    """Muestras que caben en un archivo de max_bytes"""
+    return (max_bytes - HEADER_SIZE) // RECORD.size
+
+
+class Sample(NamedTuple):
+    """Muestra de un servidor"""
+    ts: int
+    host_id: int
+    used_vcpus: int
+    total_vcpus: int
+    used_ram: int
+    total_ram: int
+
+
+def _clamp(value, limit: int) -> int:
+    return max(0, min(int(value or 0), limit))
+
+
+class UtilisationLog:
+    """Buffer circular de muestras por servidor sobre un archivo mapeado
+
+    Uso:
+        with UtilisationLog.open(path) as log:
+            log.append(servers)
+            for sample in log.samples(since=time.time() - 3600):
+                ...
+    """
+
+    def __init__(self, path: Path, writable: bool):
+        self.path = Path(path)
+        self.hosts_path = self.path.with_suffix('.hosts')
+        self.writable = writable
+        self._file = open(self.path, 'r+b' if writable else 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a utilisation history file (truncated header)")
+        self._mm = mmap.mmap(self._file.fileno(), 0,
+                             access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        magic, version, record_size, self.capacity, self.head, self.count = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a utilisation history file")
+        if (self.capacity < 1 or self.head >= self.capacity or self.count > self.capacity
+                or size < HEADER_SIZE + self.capacity * RECORD.size):
+            self.close()
+            raise ValueError(f"{self.path} is truncated or corrupt (use --reset to start over)")
+
+        self.hosts: Dict[int, Dict] = {}
+        self._host_ids: Dict[str, int] = {}
+        self._load_hosts()
+
+    @classmethod
+    def create(cls, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> 'UtilisationLog':
+        """Crea (o reinicia) el archivo con capacidad para max_bytes"""
+        capacity = capacity_for(max_bytes)
+        if capacity < 1:
+            raise ValueError(f"max size must be larger than {HEADER_SIZE + RECORD.size} bytes")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, 0, 0).ljust(HEADER_SIZE, b'\0'))
+            f.truncate(HEADER_SIZE + capacity * RECORD.size)  # Archivo disperso: no ocupa hasta escribirse
+        hosts_path = path.with_suffix('.hosts')
+        if hosts_path.exists():
+            hosts_path.unlink()
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path: Path, writable: bool = False,
+             max_bytes: int = DEFAULT_MAX_BYTES) -> 'UtilisationLog':
+        """Abre el archivo; si no existe y writable, lo crea"""
+        if not Path(path).exists():
+            if not writable:
+                raise FileNotFoundError(f"No history recorded yet ({path})")
+            return cls.create(path, max_bytes)
+        return cls(path, writable)
+
+    def __enter__(self) -> 'UtilisationLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # === HOSTS ===
+
+    def _load_hosts(self):
+        if not self.hosts_path.exists():
+            return
+        with open(self.hosts_path) as f:
+            for line in f:
+                try:
+                    host = json.loads(line)
+                except ValueError:
+                    continue  # Línea a medio escribir
+                self.hosts[host['id']] = host
+                self._host_ids[host['hostname']] = host['id']
+
+    def _host_id(self, server: Dict, new_hosts: List[Dict]) -> int:
+        hostname = server.get('hostname') or 'unknown'
+        host_id = self._host_ids.get(hostname)
+        if host_id is None:
+            host_id = len(self._host_ids)
+            host = {'id': host_id, 'hostname': hostname,
+                    'infrastructure': server.get('infrastructure'),
+                    'zone': server.get('zone_name')}
+            self.hosts[host_id] = host
+            self._host_ids[hostname] = host_id
+            new_hosts.append(host)
+        return host_id
+
+    # === ESCRITURA ===
+
+    def append(self, servers: Sequence[Dict], ts: Optional[float] = None) -> int:
+        """Añade una muestra por servidor con el mismo timestamp; devuelve cuántas"""
+        if not self.writable:
+            raise ValueError("history file opened read-only")
+
+        # Timestamps no decrecientes: la búsqueda binaria depende de ello
+        ts = int(ts if ts is not None else time.time())
+        last = self.last_ts()
+        if last is not None and ts < last:
+            ts = last
+
+        new_hosts: List[Dict] = []
+        mm, capacity = self._mm, self.capacity
+        for server in servers:
+            offset = HEADER_SIZE + self.head * RECORD.size
+            RECORD.pack_into(mm, offset, ts, self._host_id(server, new_hosts),
+                             _clamp(server.get('used_vcpus'), 0xFFFF),
+                             _clamp(server.get('total_vcpus'), 0xFFFF),
+                             _clamp(server.get('used_ram'), 0xFFFFFFFF),
+                             _clamp(server.get('total_ram'), 0xFFFFFFFF))
+            self.head = (self.head + 1) % capacity
+            self.count = min(self.count + 1, capacity)
+
+        if new_hosts:
+            with open(self.hosts_path, 'a') as f:
+                for host in new_hosts:
+                    f.write(json.dumps(host) + '\n')
+
+        # La cabecera se actualiza al final: un lector no ve registros nuevos a medio escribir
+        HEADER.pack_into(mm, 0, MAGIC, VERSION, RECORD.size, capacity, self.head, self.count)
+        return len(servers)
+
+    def flush(self):
+        self._mm.flush()
+
+    # === LECTURA ===
+
+    def _offset(self, index: int) -> int:
+        """Offset en el archivo del registro lógico `index` (0 = el más antiguo)"""
+        start = (self.head - self.count) % self.capacity
+        return HEADER_SIZE + ((start + index) % self.capacity) * RECORD.size
+
+    def _ts_at(self, index: int) -> int:
+        return struct.unpack_from('<I', self._mm, self._offset(index))[0]
+
+    def first_ts(self) -> Optional[int]:
+        return self._ts_at(0) if self.count else None
+
+    def last_ts(self) -> Optional[int]:
+        return self._ts_at(self.count - 1) if self.count else None
+
+    def _bisect(self, ts: float) -> int:
+        """Primer índice lógico con timestamp >= ts"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts_at(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _segments(self, lo: int, hi: int) -> Iterator[Tuple[int, int]]:
+        """Tramos contiguos (offset, bytes) que cubren los índices [lo, hi)"""
+        while lo < hi:
+            offset = self._offset(lo)
+            physical = (offset - HEADER_SIZE) // RECORD.size
+            run = min(hi - lo, self.capacity - physical)
+            yield offset, run * RECORD.size
+            lo += run
+
+    def samples(self, since: Optional[float] = None, until: Optional[float] = None,
+                host_ids: Optional[set] = None) -> Iterator[Sample]:
+        """Muestras con since <= ts < until (opcionalmente de ciertos hosts), en orden de tiempo"""
+        lo = self._bisect(since) if since is not None else 0
+        hi = self._bisect(until) if until is not None else self.count
+        for offset, size in self._segments(lo, hi):
+            for record in RECORD.iter_unpack(self._mm[offset:offset + size]):
+                if host_ids is None or record[1] in host_ids:
+                    yield Sample(*record)
+
+    def select_hosts(self, hostname: str = None, zone: str = None,
+                     infrastructure: str = None) -> Optional[set]:
+        """IDs de los hosts que cumplen los filtros (None = sin filtro)"""
+        if not (hostname or zone or infrastructure):
+            return None
+        return {host_id for host_id, host in self.hosts.items()
+                if (not hostname or fnmatch.fnmatchcase(host['hostname'], hostname))
+                and (not zone or host.get('zone') == zone)
+                and (not infrastructure or host.get('infrastructure') == infrastructure)}
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def downsample(samples: Iterator[Sample], bucket: float,
+               percentiles: Sequence[float] = (50, 95)) -> List[Dict]:
+    """Agrupa muestras en intervalos de `bucket` segundos
+
+    Por intervalo: utilización agregada (suma usada / suma total), los
+    percentiles pedidos y el máximo de la utilización por servidor.
+    """
+    buckets: Dict[int, Dict] = {}
+
+    for sample in samples:
+        key = int(sample.ts // bucket)
+        data = buckets.get(key)
+        if data is None:
+            data = buckets[key] = {'hosts': set(), 'samples': 0, 'used_vcpus': 0, 'total_vcpus': 0,
+                                   'used_ram': 0, 'total_ram': 0, 'cpu': [], 'ram': []}
+        data['hosts'].add(sample.host_id)
+        data['samples'] += 1
+        data['used_vcpus'] += sample.used_vcpus
+        data['total_vcpus'] += sample.total_vcpus
+        data['used_ram'] += sample.used_ram
+        data['total_ram'] += sample.total_ram
+        if sample.total_vcpus:
+            data['cpu'].append(sample.used_vcpus / sample.total_vcpus * 100)
+        if sample.total_ram:
+            data['ram'].append(sample.used_ram / sample.total_ram * 100)
+
+    rows = []
+    for key in sorted(buckets):
+        data = buckets[key]
+        row = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(key * bucket)),
+            'samples': data['samples'],
+            'servers': len(data['hosts']),
+        }
+        for metric, used, total in (('cpu', 'used_vcpus', 'total_vcpus'), ('ram', 'used_ram', 'total_ram')):
+            values = data[metric]
+            row[f'{metric}_utilization'] = round(data[used] / data[total] * 100, 2) if data[total] else 0.0
+            for pct in percentiles:
+                row[f'{metric}_p{pct:g}'] = round(percentile(values, pct), 2)
+            row[f'{metric}_max'] = round(max(values), 2) if values else 0.0
+        rows.append(row)
+    return rows
+
+
+def auto_bucket(span: float, points: int = 60) -> float:
+    """Intervalo "redondo" para ~points filas en un rango de `span` segundos"""
+    steps = (60, 300, 900, 1800, 3600, 3 * 3600, 6 * 3600, 86400)
+    target = span / max(points, 1)
+    for step in steps:
+        if step >= target:
+            return step
+    return math.ceil(target / 86400) * 86400
+
+
+def default_history_path(config) -> Path:
+    """Archivo de histórico dentro del directorio de configuración"""
+    return config.config_dir / 'history' / 'utilisation.ring'
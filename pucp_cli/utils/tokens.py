@@ -0,0 +1,130 @@
+"""
+Token de sesión: claims locales, caché de validación y renovación
+
+El JWT guardado se decodifica en local (sin verificar la firma, eso lo hace
+el servidor) para conocer usuario, rol y expiración sin ir a /validate. Los
+clientes renuevan el token `token_refresh_margin` segundos antes de que
+expire con POST /refresh o, si el servidor no lo ofrece, volviendo a hacer
+login con PUCP_USERNAME / PUCP_PASSWORD; así un trabajo largo nunca recibe
+un 401 por expiración.
+"""
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from ..config import Config
+
+# Endpoints que no deben disparar una renovación (evita recursión)
+AUTH_ENDPOINTS = ('/login', '/refresh')
+
+# Tras un intento fallido no se vuelve a intentar hasta pasado este tiempo
+RETRY_AFTER = 30.0
+
+# Validez de la caché de /validate para tokens sin claim `exp`
+VALIDATION_TTL = 300.0
+
+
+def decode_claims(token: Optional[str]) -> Optional[Dict]:
+    """Claims del payload de un JWT, o None si no tiene esa forma"""
+    if not token or token.count('.') != 2:
+        return None
+    payload = token.split('.')[1]
+    try:
+        raw = base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))
+        claims = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return claims if isinstance(claims, dict) else None
+
+
+def env_credentials() -> Optional[Tuple[str, str]]:
+    """Credenciales para renovar por login (PUCP_USERNAME / PUCP_PASSWORD)"""
+    username = os.environ.get('PUCP_USERNAME')
+    password = os.environ.get('PUCP_PASSWORD')
+    if username and password:
+        return username, password
+    return None
+
+
+class TokenManager:
+    """Token actual, su expiración y si toca renovarlo"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._failed_until = 0.0
+        self.set(config.get_token())
+
+    def set(self, token: Optional[str]):
+        self.token = token
+        self.claims = decode_claims(token) or {}
+        exp = self.claims.get('exp')
+        self.expires_at = float(exp) if isinstance(exp, (int, float)) else None
+
+    @property
+    def username(self) -> Optional[str]:
+        return self.claims.get('username') or self.claims.get('sub')
+
+    @property
+    def role(self) -> Optional[str]:
+        return self.claims.get('role')
+
+    def expires_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Segundos hasta la expiración (negativo si ya expiró)"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - (now or time.time())
+
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        """El token expira dentro del margen y no hay un fallo reciente"""
+        if self.expires_at is None:
+            return False
+        now = now or time.time()
+        return now + self.config.token_refresh_margin >= self.expires_at and now >= self._failed_until
+
+    def accept(self, token: str):
+        """Guarda un token renovado"""
+        self.config.save_token(token)
+        self.set(token)
+        self._failed_until = 0.0
+
+    def failed(self):
+        """Registra una renovación fallida (se sigue con el token actual)"""
+        self._failed_until = time.time() + RETRY_AFTER
+
+
+class ValidationCache:
+    """Resultado de /validate guardado hasta que el token expira"""
+
+    def __init__(self, config: Config):
+        self.path = config.config_dir / "token_validation.json"
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Respuesta de /validate en caché para este token, si sigue vigente"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('token') != self._key(token) or (now or time.time()) >= data.get('valid_until', 0):
+            return None
+        return data.get('response')
+
+    def put(self, token: str, response: Dict, expires_at: Optional[float] = None):
+        valid_until = expires_at if expires_at is not None else time.time() + VALIDATION_TTL
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'token': self._key(token), 'valid_until': valid_until, 'response': response}, f)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,250 @@
+"""
+Trazas ligeras de ejecución (--trace / PUCP_TRACE)
+
+Cada span registra nombre, tipo (command, http, parse, render) y duración;
+los de HTTP añaden método, URL, estado, bytes y tiempos de conexión y de
+primer byte. Con las trazas desactivadas `span()` devuelve un objeto nulo
+compartido, sin reservar memoria ni tomar tiempos.
+"""
+import json
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+TRACE_FORMATS = ('table', 'json')
+
+_tracer = None  # Tracer activo; None = trazas desactivadas
+_local = threading.local()
+
+
+class _NullSpan:
+    """Span vacío usado cuando las trazas están desactivadas"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Intervalo medido con atributos"""
+
+    def __init__(self, tracer: 'Tracer', name: str, kind: str, attrs: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.depth = 0
+        self.children = 0.0  # Tiempo dentro de spans hijos
+        self.start = self.end = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += self.end - self.start
+        if exc_type is not None:
+            self.attrs.setdefault('error', exc_type.__name__)
+        self.tracer.record(self)
+        return False
+
+    def __bool__(self):
+        return True
+
+    def set(self, **attrs):
+        """Añade atributos (estado, bytes, ...)"""
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def self_time(self) -> float:
+        """Duración sin contar los spans hijos"""
+        return self.duration - self.children
+
+    def to_dict(self) -> Dict:
+        data = {'name': self.name, 'kind': self.kind, 'depth': self.depth,
+                'start_ms': round((self.start - self.tracer.started) * 1000, 3),
+                'duration_ms': round(self.duration * 1000, 3),
+                'self_ms': round(self.self_time * 1000, 3)}
+        data.update(self.attrs)
+        return data
+
+
+def _stack() -> List[Span]:
+    """Spans abiertos en el hilo actual (para anidarlos)"""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Tracer:
+    """Acumula los spans de una invocación"""
+
+    def __init__(self, fmt: str = 'table'):
+        self.format = fmt
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def report(self, stream=None):
+        """Escribe las trazas en `stream` (stderr por defecto)"""
+        stream = stream or sys.stderr
+        spans = sorted(self.spans, key=lambda s: s.start)
+        if self.format == 'json':
+            for span in spans:
+                stream.write(json.dumps(span.to_dict()) + '\n')
+        else:
+            _print_table(spans, stream)
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return '-' if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def _print_table(spans: List[Span], stream):
+    """Resumen de spans y totales por tipo (tiempo propio, sin hijos)"""
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="bold magenta", title="⏱️  Trace")
+    table.add_column("Span", style="cyan")
+    table.add_column("Detail", style="white")
+    table.add_column("Status", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Connect", justify="right")
+    table.add_column("TTFB", justify="right")
+    table.add_column("Total ms", justify="right", style="bold")
+
+    totals: Dict[str, List[float]] = {}
+    for span in spans:
+        attrs = span.attrs
+        detail = f"{attrs['method']} {attrs['url']}" if 'method' in attrs else attrs.get('detail', '')
+        if 'error' in attrs:
+            detail = f"{detail} [red]({attrs['error']})[/red]".strip()
+        table.add_row(
+            '  ' * span.depth + span.name,
+            detail,
+            str(attrs.get('status', '')),
+            str(attrs.get('bytes', '')),
+            _ms(attrs.get('connect')) if 'connect' in attrs else '',
+            _ms(attrs.get('ttfb')) if 'ttfb' in attrs else '',
+            _ms(span.duration),
+        )
+        totals.setdefault(span.kind, []).append(span.self_time)
+
+    console = Console(file=stream)
+    console.print(table)
+    summary = '  '.join(f"{kind}: {sum(values) * 1000:.1f} ms ({len(values)})"
+                        for kind, values in sorted(totals.items()))
+    console.print(f"[dim]{summary}[/dim]")
+
+
+# === API ===
+
+def enable(fmt: str = 'table') -> Tracer:
+    """Activa las trazas para el resto del proceso"""
+    global _tracer
+    _tracer = Tracer(fmt)
+    return _tracer
+
+
+def disable():
+    """Desactiva las trazas"""
+    global _tracer
+    _tracer = None
+
+
+def current() -> Optional[Tracer]:
+    """Tracer activo, o None"""
+    return _tracer
+
+
+def span(name: str, kind: str = 'span', **attrs):
+    """Context manager que mide un bloque (nulo si las trazas están desactivadas)"""
+    if _tracer is None:
+        return NULL_SPAN
+    return Span(_tracer, name, kind, attrs)
+
+
+def http_span(method: str, url: str):
+    """Span de una request HTTP; registra el tiempo de conexión si la hubo"""
+    if _tracer is None:
+        return NULL_SPAN
+    _install_connect_hook()
+    _local.connect = None
+    return Span(_tracer, 'http', 'http', {'method': method, 'url': url})
+
+
+def take_connect_time() -> Optional[float]:
+    """Tiempo de conexión (DNS + TCP + TLS) de la última request del hilo"""
+    value = getattr(_local, 'connect', None)
+    _local.connect = None
+    return value
+
+
+_hook_installed = False
+
+
+def _install_connect_hook():
+    """Mide las conexiones nuevas de urllib3 (solo con trazas activas)"""
+    global _hook_installed
+    if _hook_installed:
+        return
+    _hook_installed = True
+
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+
+    for cls in (HTTPConnection, HTTPSConnection):
+        original = cls.__dict__.get('connect')
+        if original is None:
+            continue
+
+        def connect(self, _original=original):
+            start = time.perf_counter()
+            try:
+                return _original(self)
+            finally:
+                _local.connect = (getattr(_local, 'connect', None) or 0) + time.perf_counter() - start
+
+        cls.connect = connect
+
+
+def parse_trace_option(value: Optional[str]) -> Optional[str]:
+    """Normaliza --trace / PUCP_TRACE a un formato, o None si está desactivado"""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return None
+    if value in TRACE_FORMATS:
+        return value
+    if value == 'jsonl':
+        return 'json'
+    return 'table'
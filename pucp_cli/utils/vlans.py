@@ -0,0 +1,159 @@
+"""
+Mapa de ocupación de VLANs por infraestructura (802.1Q: IDs 1-4094)
+
+Cada infraestructura se representa con un entero de 4096 bits (bit i =
+VLAN i asignada) y una tabla VLAN → titulares, construidos en una sola
+pasada sobre GET /api/vlans. Las consultas no vuelven a recorrer las
+asignaciones:
+
+    siguientes N libres     → aislar el bit bajo de las libres (x & -x), N veces
+    mayor rango libre       → tramos libres calculados una vez y cacheados
+    quién tiene la VLAN X   → acceso directo a la tabla
+    ocupación por bloques   → conteo de bits sobre una máscara por bloque
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+VLAN_MIN = 1      # 0 y 4095 están reservados por 802.1Q
+VLAN_MAX = 4094
+VLAN_SPACE = 4096
+BLOCK_SIZE = 256
+
+
+class VlanRange(NamedTuple):
+    """Tramo [start, end] de VLANs"""
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    def __str__(self) -> str:
+        return str(self.start) if self.start == self.end else f"{self.start}-{self.end}"
+
+
+def parse_range(value: str) -> VlanRange:
+    """'100-3999' (o un único ID) → VlanRange dentro de 1-4094"""
+    low, _, high = value.partition('-')
+    try:
+        start = int(low)
+        end = int(high) if high else start
+    except ValueError:
+        raise ValueError(f"Invalid VLAN range '{value}' (expected LOW-HIGH)")
+    if not VLAN_MIN <= start <= end <= VLAN_MAX:
+        raise ValueError(f"VLAN range must be within {VLAN_MIN}-{VLAN_MAX}: '{value}'")
+    return VlanRange(start, end)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+def _mask(start: int, end: int) -> int:
+    """Bits start..end a 1"""
+    return ((1 << (end + 1)) - 1) ^ ((1 << start) - 1)
+
+
+class VlanMap:
+    """VLANs asignadas de una infraestructura"""
+
+    def __init__(self, infrastructure: str, window: VlanRange = VlanRange(VLAN_MIN, VLAN_MAX)):
+        self.infrastructure = infrastructure
+        self.window = window          # Rango asignable en el que se buscan libres
+        self.bits = 0
+        self.owners: List[Optional[List[Dict]]] = [None] * VLAN_SPACE
+        self._ranges: Optional[List[VlanRange]] = None
+        self._largest: Optional[VlanRange] = None
+
+    def add(self, vlan_id: int, owner: Dict):
+        """Registra una asignación (una VLAN puede tener varios titulares: conflicto)"""
+        if not 0 <= vlan_id < VLAN_SPACE:
+            return
+        self.bits |= 1 << vlan_id
+        holders = self.owners[vlan_id]
+        if holders is None:
+            self.owners[vlan_id] = [owner]
+        else:
+            holders.append(owner)
+        self._ranges = None
+
+    # === CONSULTAS ===
+
+    def free_mask(self) -> int:
+        return ~self.bits & _mask(*self.window)
+
+    @property
+    def allocated(self) -> int:
+        return _popcount(self.bits)
+
+    @property
+    def free(self) -> int:
+        return _popcount(self.free_mask())
+
+    def next_free(self, count: int, start: Optional[int] = None) -> List[int]:
+        """Las `count` VLANs libres más bajas a partir de `start`"""
+        free = self.free_mask()
+        if start is not None:
+            free &= ~((1 << start) - 1)
+        result = []
+        while free and len(result) < count:
+            low = free & -free
+            result.append(low.bit_length() - 1)
+            free ^= low
+        return result
+
+    def free_ranges(self) -> List[VlanRange]:
+        """Tramos libres contiguos en orden (se calculan una vez)"""
+        if self._ranges is None:
+            ranges = []
+            free = self.free_mask()
+            while free:
+                low = free & -free
+                cleared = free & (free + low)  # Sumar el bit bajo apaga el primer tramo de unos
+                ranges.append(VlanRange(low.bit_length() - 1, (free ^ cleared).bit_length() - 1))
+                free = cleared
+            self._ranges = ranges
+            self._largest = max(ranges, key=lambda r: (r.size, -r.start)) if ranges else None
+        return self._ranges
+
+    def largest_free(self) -> Optional[VlanRange]:
+        """Mayor tramo libre (el más bajo si hay empate)"""
+        self.free_ranges()
+        return self._largest
+
+    def holders(self, vlan_id: int) -> List[Dict]:
+        """Titulares de una VLAN"""
+        if not 0 <= vlan_id < VLAN_SPACE:
+            return []
+        return self.owners[vlan_id] or []
+
+    def conflicts(self) -> List[int]:
+        """VLANs asignadas a más de un titular"""
+        return [vlan_id for vlan_id, holders in enumerate(self.owners) if holders and len(holders) > 1]
+
+    def blocks(self, size: int = BLOCK_SIZE) -> List[Tuple[VlanRange, int]]:
+        """(bloque, VLANs asignadas) para bloques de `size` IDs"""
+        result = []
+        for start in range(0, VLAN_SPACE, size):
+            block = VlanRange(start, min(start + size, VLAN_SPACE) - 1)
+            result.append((block, _popcount(self.bits & _mask(*block))))
+        return result
+
+
+def build_maps(records: Iterable[Dict], window: VlanRange = VlanRange(VLAN_MIN, VLAN_MAX),
+               default_infrastructure: str = 'unknown') -> Dict[str, VlanMap]:
+    """Un VlanMap por infraestructura a partir de los registros de /api/vlans"""
+    maps: Dict[str, VlanMap] = {}
+    for record in records:
+        vlan_id = record.get('vlan_id')
+        if not isinstance(vlan_id, int):
+            try:
+                vlan_id = int(vlan_id)
+            except (TypeError, ValueError):
+                continue
+        infrastructure = record.get('infrastructure') or default_infrastructure
+        vlan_map = maps.get(infrastructure)
+        if vlan_map is None:
+            vlan_map = maps[infrastructure] = VlanMap(infrastructure, window)
+        vlan_map.add(vlan_id, record)
+    return maps
@@ -0,0 +1,169 @@
+"""
+Motor de espera para slices
+
+Sustituye el sondeo fijo por intervalos con backoff exponencial y jitter,
+un plazo máximo configurable y, si el servicio lo ofrece, eventos SSE
+(/slices/<id>/events). Varios slices se siguen con un único listado por
+ciclo (GET condicional) en lugar de un GET por slice.
+"""
+import json
+import random
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from ..api_client import APIException, PUCPAPIClient
+
+READY_STATUSES = {'active'}
+FAILED_STATUSES = {'error', 'missing'}  # 'missing': el slice desapareció del listado
+
+# Códigos que indican que el servicio no ofrece streaming de eventos
+_NO_EVENTS_CODES = {404, 405, 406, 501}
+
+
+class Backoff:
+    """Intervalos crecientes con jitter: initial, initial*factor, ... hasta maximum"""
+
+    def __init__(self, initial: float = 0.5, maximum: float = 10.0, factor: float = 2.0,
+                 jitter: float = 0.2):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempt = 0
+
+    def next(self) -> float:
+        """Siguiente intervalo de espera en segundos"""
+        delay = min(self.maximum, self.initial * (self.factor ** self.attempt))
+        self.attempt += 1
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def reset(self):
+        """Vuelve al intervalo inicial (se observó progreso)"""
+        self.attempt = 0
+
+
+class WaitResult:
+    """Estado final de una espera"""
+
+    def __init__(self, statuses: Dict[str, str], ready: Iterable[str], failed: Iterable[str],
+                 elapsed: float):
+        self.statuses = statuses
+        self.ready = set(ready)
+        self.failed = set(failed)
+        self.elapsed = elapsed
+
+    @property
+    def pending(self) -> set:
+        """Slices que no llegaron a un estado final antes del plazo"""
+        return set(self.statuses) - self.ready - self.failed
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.pending
+
+
+def _stream_events(client: PUCPAPIClient, slice_id: str, deadline: float):
+    """Genera estados de un slice vía SSE; APIException si no está soportado"""
+    remaining = max(1.0, deadline - time.monotonic())
+    response = client._send('GET', client.config.slice_service, f'/slices/{slice_id}/events',
+                            headers={'Accept': 'text/event-stream'}, stream=True,
+                            timeout=(5, remaining))
+    if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+        response.close()
+        raise APIException("Event stream not supported", 406)
+
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            try:
+                event = json.loads(line[5:].strip())
+            except ValueError:
+                continue
+            status = event.get('status') if isinstance(event, dict) else None
+            if status:
+                yield status
+    finally:
+        response.close()
+
+
+def wait_for_slices(client: PUCPAPIClient, slice_ids: Iterable[str], timeout: float = 300,
+                    backoff: Optional[Backoff] = None, use_events: bool = True,
+                    ready_statuses: Iterable[str] = READY_STATUSES,
+                    on_update: Optional[Callable[[Dict[str, str], float], None]] = None,
+                    previous: Optional[Dict[str, str]] = None) -> WaitResult:
+    """Espera a que los slices lleguen a un estado final (por defecto active / error)
+
+    `on_update(statuses, elapsed)` se invoca cada vez que cambia algún estado.
+    `previous` son los estados anteriores a la operación (p. ej. un deploy):
+    un estado de fallo igual al anterior se ignora hasta ver otro distinto,
+    porque puede ser el que el servidor aún no ha cambiado.
+    """
+    pending = list(dict.fromkeys(slice_ids))
+    statuses: Dict[str, str] = {sid: 'unknown' for sid in pending}
+    ready, failed = set(), set()
+    stale = {sid: status for sid, status in (previous or {}).items()
+             if sid in statuses and status in FAILED_STATUSES}
+    ready_statuses = set(ready_statuses)
+    backoff = backoff or Backoff()
+    start = time.monotonic()
+    deadline = start + timeout
+
+    def record(sid: str, status: str) -> bool:
+        if sid in stale:
+            if status == stale[sid]:
+                return False
+            del stale[sid]
+        changed = statuses.get(sid) != status
+        statuses[sid] = status
+        if status in ready_statuses:
+            ready.add(sid)
+        elif status in FAILED_STATUSES:
+            failed.add(sid)
+        return changed
+
+    def done() -> bool:
+        return len(ready) + len(failed) == len(statuses)
+
+    # Un solo slice: intentar eventos SSE antes de recurrir al sondeo
+    if use_events and len(pending) == 1:
+        sid = pending[0]
+        try:
+            for status in _stream_events(client, sid, deadline):
+                if record(sid, status) and on_update:
+                    on_update(dict(statuses), time.monotonic() - start)
+                if done() or time.monotonic() >= deadline:
+                    break
+        except APIException as e:
+            if e.status_code not in _NO_EVENTS_CODES:
+                raise
+        except Exception:
+            pass  # Stream cortado: continuar con sondeo
+
+    validators = None
+    while not done() and time.monotonic() < deadline:
+        changed = False
+
+        if len(statuses) == 1:
+            sid = next(iter(statuses))
+            changed = record(sid, client.get_slice(sid).get('status', 'unknown'))
+        else:
+            # Un único listado condicional por ciclo para todos los slices
+            slices, validators = client.list_slices_if_changed(validators)
+            if slices is not None:
+                current = {s.get('id'): s.get('status', 'unknown') for s in slices}
+                for sid in statuses:
+                    if sid in ready or sid in failed:
+                        continue
+                    changed |= record(sid, current.get(sid, 'missing'))
+
+        if changed:
+            backoff.reset()
+            if on_update:
+                on_update(dict(statuses), time.monotonic() - start)
+
+        if done():
+            break
+        time.sleep(max(0.0, min(backoff.next(), deadline - time.monotonic())))
+
+    return WaitResult(statuses, ready, failed, time.monotonic() - start)
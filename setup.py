@@ -17,9 +17,14 @@ setup(
         "python-dotenv>=1.0.0",
         "colorama>=0.4.6",
     ],
+    extras_require={
+        "async": ["httpx>=0.24.0"],
+        "analytics": ["numpy>=1.21"],
+        "fast": ["orjson>=3.6"],
+    },
     entry_points={
         "console_scripts": [
-            "pucp=pucp_cli.main:cli",
+            "pucp=pucp_cli.__main__:main",
         ],
     },
     python_requires=">=3.8",